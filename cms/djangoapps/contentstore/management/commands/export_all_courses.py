@@ -1,44 +1,116 @@
 """
 Script for exporting all courseware from Mongo to a directory
 """
+import os
+import tarfile
+from multiprocessing import Pool
+from optparse import make_option
+
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
-from xmodule.modulestore.xml_exporter import export_to_xml
-from xmodule.modulestore.django import modulestore
-from xmodule.contentstore.django import contentstore
+from django.db import close_connection
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_tar
+from xmodule.modulestore.django import modulestore, clear_existing_modulestores
+from xmodule.contentstore.django import contentstore, _CONTENTSTORE
 from xmodule.course_module import CourseDescriptor
 
 
+def _init_worker():
+    """
+    Set up a freshly forked process to export courses.
+    """
+    # Connections inherited from the parent can't be shared with it, so drop
+    # them and open our own.
+    close_connection()
+    if hasattr(cache, 'close'):
+        cache.close()
+    clear_existing_modulestores()
+    _CONTENTSTORE.clear()
+
+
+def export_course(course_id, output_path, tar=False):
+    """
+    Export a course to `output_path`, as a directory or, with `tar`, as a
+    .tar.gz file.  Returns a (course_id, error message) pair, the message
+    being None if the export succeeded.
+    """
+    try:
+        location = CourseDescriptor.id_to_location(course_id)
+        course_dir = course_id.replace('/', '...')
+        if tar:
+            tar_file = tarfile.open(os.path.join(output_path, course_dir + '.tar.gz'), mode='w:gz')
+            try:
+                export_to_tar(modulestore('direct'), contentstore(), location, tar_file, course_dir, modulestore())
+            finally:
+                tar_file.close()
+        else:
+            export_to_xml(modulestore('direct'), contentstore(), location, output_path, course_dir, modulestore())
+    except Exception as err:  # pylint: disable=broad-except
+        return course_id, unicode(err)
+    return course_id, None
+
+
+def _export_course(args):
+    """
+    export_course, taking its arguments as a tuple for Pool.imap_unordered.
+    """
+    return export_course(*args)
+
+
 class Command(BaseCommand):
     """Export all courses from mongo to the specified data directory"""
-    help = 'Export all courses from mongo to the specified data directory'
+    help = """
+    Export all courses from mongo to the specified data directory.
+
+    With --tar, every course is written as a .tar.gz file, its assets streamed
+    into the archive.  With --workers, courses are exported by that many
+    processes in parallel; each process exports one course and is then
+    replaced, so memory stays bounded by the largest course times the number
+    of workers.
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option('--workers', type='int', default=1,
+                    help='Number of processes exporting courses in parallel'),
+        make_option('--tar', action='store_true', default=False,
+                    help='Write every course as a .tar.gz file instead of a directory'),
+    )
 
     def handle(self, *args, **options):
         "Execute the command"
         if len(args) != 1:
             raise CommandError("export requires one argument: <output path>")
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
 
         output_path = args[0]
 
-        cs = contentstore()
         ms = modulestore('direct')
-        root_dir = output_path
         courses = ms.get_courses()
 
         print("%d courses to export:" % len(courses))
         cids = [x.id for x in courses]
         print(cids)
 
-        for course_id in cids:
-
-            print("-"*77)
-            print("Exporting course id = {0} to {1}".format(course_id, output_path))
+        tasks = [(course_id, output_path, options['tar']) for course_id in cids]
+        pool = None
+        if options['workers'] > 1:
+            # Children must not share the parent's database connection
+            close_connection()
+            pool = Pool(options['workers'], _init_worker, maxtasksperchild=1)
+            results = pool.imap_unordered(_export_course, tasks)
+        else:
+            results = (export_course(*task) for task in tasks)
 
-            if 1:
-                try:
-                    location = CourseDescriptor.id_to_location(course_id)
-                    course_dir = course_id.replace('/', '...')
-                    export_to_xml(ms, cs, location, root_dir, course_dir, modulestore())
-                except Exception as err:
+        try:
+            for course_id, error in results:
+                print("-"*77)
+                if error is None:
+                    print("Exported course id = {0} to {1}".format(course_id, output_path))
+                else:
                     print("="*30 + "> Oops, failed to export %s" % course_id)
                     print("Error:")
-                    print(err)
+                    print(error)
+        finally:
+            if pool is not None:
+                pool.terminate()
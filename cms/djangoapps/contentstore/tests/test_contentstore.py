@@ -3,6 +3,7 @@
 import json
 import mock
 import shutil
+import tarfile
 
 from textwrap import dedent
 
@@ -30,7 +31,7 @@ from xmodule.modulestore.store_utilities import clone_course
 from xmodule.modulestore.store_utilities import delete_course
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore, _CONTENTSTORE
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_tar
 from xmodule.modulestore.xml_importer import import_from_xml, perform_xlint
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.contentstore.content import StaticContent
@@ -1351,6 +1352,46 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         items = module_store.get_items(stub_location)
         self.assertEqual(len(items), 1)
 
+    def test_export_course_to_tar(self):
+        module_store = modulestore('direct')
+        content_store = contentstore()
+
+        import_from_xml(module_store, 'common/test/data/', ['toy'], static_content_store=content_store)
+        location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+
+        root_dir = path(mkdtemp_clean())
+        export_to_xml(module_store, content_store, location, root_dir, 'test_export')
+
+        tar_path = root_dir / 'test_export.tar.gz'
+        tar_file = tarfile.open(tar_path, 'w:gz')
+        export_to_tar(module_store, content_store, location, tar_file, 'test_export')
+        tar_file.close()
+
+        # the archive has the same files, with the same contents, as the directory export
+        tar_dir = path(mkdtemp_clean())
+        with tarfile.open(tar_path) as tar_file:
+            tar_file.extractall(tar_dir)
+        exported = [
+            (root_dir / 'test_export').relpathto(filename)
+            for filename in (root_dir / 'test_export').walkfiles()
+        ]
+        self.assertIn(path('static') / 'sample_static.txt', exported)
+        self.assertItemsEqual(
+            exported,
+            [(tar_dir / 'test_export').relpathto(filename) for filename in (tar_dir / 'test_export').walkfiles()]
+        )
+        for filename in exported:
+            if filename == path('policies') / 'assets.json':
+                self.assertEqual(
+                    json.loads((root_dir / 'test_export' / filename).text()),
+                    json.loads((tar_dir / 'test_export' / filename).text())
+                )
+            else:
+                self.assertEqual(
+                    (root_dir / 'test_export' / filename).bytes(),
+                    (tar_dir / 'test_export' / filename).bytes()
+                )
+
     def _check_verticals(self, items, course_id):
         """ Test getting the editing HTML for each vertical. """
         # Assert is here to make sure that the course being tested actually has verticals (units) to check.
@@ -8,6 +8,7 @@ from contentstore.tests.utils import CourseTestCase
 from xmodule.modulestore.django import loc_mapper
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore import parsers
+from student.roles import CourseStaffRole
 
 class TestCourseIndex(CourseTestCase):
     """
@@ -84,6 +85,17 @@ class TestCourseIndex(CourseTestCase):
         # test access
         self.check_index_and_outline(course_staff_client)
 
+    def test_course_listing_limited_to_role_courses(self):
+        """
+        Test that the course listing of a course staff member only has the courses they are staff of
+        """
+        course_staff_client, course_staff = self.createNonStaffAuthedUserClient()
+        CourseStaffRole(self.odd_course.location).add_users(course_staff)
+
+        response = course_staff_client.get('/course', {}, HTTP_ACCEPT='text/html')
+        self.assertContains(response, 'dotted.course.name-2')
+        self.assertNotContains(response, 'Robot Super Course')
+
     def test_json_responses(self):
         outline_url = self.course_locator.url_reverse('course/')
         chapter = ItemFactory.create(parent_location=self.course.location, category='chapter', display_name="Week 1")
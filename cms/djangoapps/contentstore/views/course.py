@@ -18,7 +18,6 @@ from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from util.json_request import JsonResponse
 from edxmako.shortcuts import render_to_response
 
-from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore, loc_mapper
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.contentstore.content import StaticContent
@@ -51,7 +50,7 @@ from xmodule.html_module import AboutDescriptor
 from xmodule.modulestore.locator import BlockUsageLocator
 from course_creators.views import get_course_creator_status, add_user_with_status_unrequested
 from contentstore import utils
-from student.roles import CourseInstructorRole, CourseStaffRole, CourseCreatorRole
+from student.roles import CourseInstructorRole, CourseStaffRole, CourseCreatorRole, GlobalStaff
 from student import auth
 
 from microsite_configuration.middleware import MicrositeConfiguration
@@ -137,13 +136,29 @@ def _course_json(request, package_id, branch, version_guid, block):
     return _xmodule_json(course, course.location.course_id)
 
 
-def _xmodule_json(xmodule, course_id):
+def _subtree_locations(xmodule):
+    """
+    Returns the locations of xmodule and all of its descendants
+    """
+    locations = [xmodule.location]
+    if xmodule.has_children:
+        for child in xmodule.get_children():
+            locations.extend(_subtree_locations(child))
+    return locations
+
+
+def _xmodule_json(xmodule, course_id, locators=None):
     """
     Returns a JSON overview of an XModule
+
+    locators maps the locations of the subtree to their Locators; it's computed in one
+    batch when not given.
     """
-    locator = loc_mapper().translate_location(
-        course_id, xmodule.location, published=False, add_entry_if_missing=True
-    )
+    if locators is None:
+        locators = loc_mapper().translate_locations(
+            course_id, _subtree_locations(xmodule), published=False, add_entry_if_missing=True
+        )
+    locator = locators[xmodule.location]
     is_container = xmodule.has_children
     result = {
         'display_name': xmodule.display_name,
@@ -153,32 +168,71 @@ def _xmodule_json(xmodule, course_id):
         'is_container': is_container,
     }
     if is_container:
-        result['children'] = [_xmodule_json(child, course_id) for child in xmodule.get_children()]
+        result['children'] = [_xmodule_json(child, course_id, locators) for child in xmodule.get_children()]
     return result
 
 
+def _candidate_course_numbers(user):
+    """
+    Return the course numbers of the courses named by the user's course staff
+    and instructor groups.
+
+    Group names are lowercased and come in three forms: role_org/course/run,
+    role_package_id, and the legacy role_course.  Package ids are generally
+    org.course.run, but as org and course may themselves contain dots, every
+    dotted run of the package id is a candidate.  Candidates are only used to
+    narrow the courses to check access to, so extra ones are harmless.
+    """
+    roles = (CourseStaffRole.ROLE, CourseInstructorRole.ROLE)
+    numbers = set()
+    for name in user.groups.values_list('name', flat=True):
+        role, _, course_ref = name.partition('_')
+        if role not in roles or not course_ref:
+            continue
+        if '/' in course_ref:
+            numbers.add(course_ref.split('/')[1])
+            continue
+        parts = course_ref.split('.')
+        for start in xrange(len(parts)):
+            for end in xrange(start + 1, len(parts) + 1):
+                numbers.add('.'.join(parts[start:end]))
+    return numbers
+
+
+def _accessible_courses(user):
+    """
+    Return the CourseSummaries of the courses the user may edit in Studio.
+
+    Global staff may edit every course; other users only the courses their
+    role groups point to, so the modulestore isn't scanned for every course.
+    """
+    if GlobalStaff().has_user(user):
+        courses = modulestore('direct').get_course_summaries()
+    else:
+        course_numbers = _candidate_course_numbers(user)
+        if not course_numbers:
+            return []
+        courses = modulestore('direct').get_course_summaries(course_numbers)
+
+    return [
+        course for course in courses
+        if (has_course_access(user, course.location)
+            # pylint: disable=fixme
+            # TODO remove this condition when templates purged from db
+            and course.location.course != 'templates'
+            and course.location.org != ''
+            and course.location.course != ''
+            and course.location.name != '')
+    ]
+
+
 @login_required
 @ensure_csrf_cookie
 def course_listing(request):
     """
     List all courses available to the logged in user
     """
-    # there's an index on category which will be used if none of its antecedents are set
-    courses = modulestore('direct').get_items(Location(None, None, None, 'course', None))
-
-    # filter out courses that we don't have access too
-    def course_filter(course):
-        """
-        Get courses to which this user has access
-        """
-        return (has_course_access(request.user, course.location)
-                # pylint: disable=fixme
-                # TODO remove this condition when templates purged from db
-                and course.location.course != 'templates'
-                and course.location.org != ''
-                and course.location.course != ''
-                and course.location.name != '')
-    courses = filter(course_filter, courses)
+    courses = _accessible_courses(request.user)
 
     def format_course_for_view(course):
         """
@@ -199,7 +253,7 @@ def course_listing(request):
         )
 
     return render_to_response('index.html', {
-        'courses': [format_course_for_view(c) for c in courses if not isinstance(c, ErrorDescriptor)],
+        'courses': [format_course_for_view(c) for c in courses],
         'user': request.user,
         'request_course_creator_url': reverse('contentstore.views.request_course_creator'),
         'course_creator_status': _get_course_creator_status(request.user),
@@ -219,6 +273,12 @@ def course_index(request, package_id, branch, version_guid, block):
     )
     lms_link = get_lms_link_for_item(course.location)
     sections = course.get_children()
+    # the template translates the location of every section and subsection: warm the cache in one batch
+    loc_mapper().translate_locations(
+        course.location.course_id,
+        [course.location] + [item.location for section in sections for item in [section] + section.get_children()],
+        published=False, add_entry_if_missing=True
+    )
 
     return render_to_response('overview.html', {
         'context_course': course,
@@ -7,7 +7,6 @@ import os
 import tarfile
 import shutil
 import re
-from tempfile import mkdtemp
 from path import path
 
 from django.conf import settings
@@ -25,7 +24,7 @@ from edxmako.shortcuts import render_to_response
 
 from xmodule.modulestore.xml_importer import import_from_xml
 from xmodule.contentstore.django import contentstore
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_tar
 from xmodule.modulestore.django import modulestore, loc_mapper
 from xmodule.exceptions import SerializationError
 
@@ -319,10 +318,11 @@ def export_handler(request, tag=None, package_id=None, branch=None, version_guid
     if 'application/x-tgz' in requested_format:
         name = old_location.name
         export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-        root_dir = path(mkdtemp())
+        logging.debug('tar file being generated at {0}'.format(export_file.name))
+        tar_file = tarfile.open(name=export_file.name, mode='w:gz')
 
         try:
-            export_to_xml(modulestore('direct'), contentstore(), old_location, root_dir, name, modulestore())
+            export_to_tar(modulestore('direct'), contentstore(), old_location, tar_file, name, modulestore())
 
         except SerializationError, e:
             logging.exception('There was an error exporting course {0}. {1}'.format(course_module.location, unicode(e)))
@@ -364,14 +364,8 @@ def export_handler(request, tag=None, package_id=None, branch=None, version_guid
                 'course_home_url': location.url_reverse("course"),
                 'export_url': export_url
             })
-
-        logging.debug('tar file being generated at {0}'.format(export_file.name))
-        tar_file = tarfile.open(name=export_file.name, mode='w:gz')
-        tar_file.add(root_dir / name, arcname=name)
-        tar_file.close()
-
-        # remove temp dir
-        shutil.rmtree(root_dir / name)
+        finally:
+            tar_file.close()
 
         wrapper = FileWrapper(export_file)
         response = HttpResponse(wrapper, content_type='application/x-tgz')
@@ -256,3 +256,4 @@ PASSWORD_DICTIONARY = ENV_TOKENS.get("PASSWORD_DICTIONARY", [])
 
 ### INACTIVITY SETTINGS ####
 SESSION_INACTIVITY_TIMEOUT_IN_SECONDS = AUTH_TOKENS.get("SESSION_INACTIVITY_TIMEOUT_IN_SECONDS")
+SESSION_ACTIVITY_SAVE_DELAY_SECONDS = ENV_TOKENS.get("SESSION_ACTIVITY_SAVE_DELAY_SECONDS", 60)
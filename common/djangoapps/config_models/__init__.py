@@ -50,6 +50,11 @@ The current ``ConfigurationModel`` will be cached in the ``configuration`` djang
 or in the ``default`` cache if ``configuration`` doesn't exist. You can specify the cache
 timeout in each ``ConfigurationModel`` by setting the ``cache_timeout`` property.
 
+In front of that cache, each process keeps the current ``ConfigurationModel`` in memory
+for ``local_cache_timeout`` seconds (5 by default), so that reading it doesn't reach the
+cache on every request. Saving a new configuration clears both caches in the process that
+saves it; other processes see it once their copy expires.
+
 You can change the name of the cache key used by the ``ConfigurationModel`` by overriding
 the ``cache_key_name`` function.
 
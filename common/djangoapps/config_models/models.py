@@ -1,6 +1,8 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+import time
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
@@ -10,6 +12,17 @@ try:
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+# The configurations read by this process, by cache key, as
+# (expiration time, configuration) pairs
+_local_cache = {}  # pylint: disable=invalid-name
+
+
+def clear_local_cache():
+    """
+    Forget the configurations read by this process.
+    """
+    _local_cache.clear()
+
 
 class ConfigurationModel(models.Model):
     """
@@ -18,6 +31,9 @@ class ConfigurationModel(models.Model):
     Properties:
         cache_timeout (int): The number of seconds that this configuration
             should be cached
+        local_cache_timeout (int): The number of seconds that each process
+            keeps this configuration in memory, in front of the cache; that
+            is, how long processes may take to see a new configuration
     """
 
     class Meta(object):  # pylint: disable=missing-docstring
@@ -25,6 +41,7 @@ class ConfigurationModel(models.Model):
 
     # The number of seconds
     cache_timeout = 600
+    local_cache_timeout = 5
 
     change_date = models.DateTimeField(auto_now_add=True)
     changed_by = models.ForeignKey(User, editable=False, null=True, on_delete=models.PROTECT)
@@ -36,6 +53,7 @@ class ConfigurationModel(models.Model):
         """
         super(ConfigurationModel, self).save(*args, **kwargs)
         cache.delete(self.cache_key_name())
+        _local_cache.pop(self.cache_key_name(), None)
 
     @classmethod
     def cache_key_name(cls):
@@ -45,18 +63,23 @@ class ConfigurationModel(models.Model):
     @classmethod
     def current(cls):
         """
-        Return the active configuration entry, either from cache,
-        from the database, or by creating a new empty entry (which is not
-        persisted).
+        Return the active configuration entry, either from this process's
+        memory, from cache, from the database, or by creating a new empty
+        entry (which is not persisted).
         """
-        cached = cache.get(cls.cache_key_name())
-        if cached is not None:
-            return cached
+        now = time.time()
+        expiration, current = _local_cache.get(cls.cache_key_name(), (0, None))
+        if expiration > now:
+            return current
+
+        current = cache.get(cls.cache_key_name())
+        if current is None:
+            try:
+                current = cls.objects.order_by('-change_date')[0]
+            except IndexError:
+                current = cls()
 
-        try:
-            current = cls.objects.order_by('-change_date')[0]
-        except IndexError:
-            current = cls()
+            cache.set(cls.cache_key_name(), current, cls.cache_timeout)
 
-        cache.set(cls.cache_key_name(), current, cls.cache_timeout)
+        _local_cache[cls.cache_key_name()] = (now + cls.local_cache_timeout, current)
         return current
@@ -9,7 +9,7 @@ from django.test import TestCase
 from freezegun import freeze_time
 
 from mock import patch
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, clear_local_cache
 
 
 class ExampleConfig(ConfigurationModel):
@@ -30,6 +30,8 @@ class ConfigurationModelTests(TestCase):
     def setUp(self):
         self.user = User()
         self.user.save()
+        clear_local_cache()
+        self.addCleanup(clear_local_cache)
 
     def test_cache_deleted_on_save(self, mock_cache):
         ExampleConfig(changed_by=self.user).save()
@@ -74,3 +76,24 @@ class ConfigurationModelTests(TestCase):
         ExampleConfig.current()
 
         mock_cache.set.assert_called_with(ExampleConfig.cache_key_name(), first, 300)
+
+    def test_local_cache(self, mock_cache):
+        with patch('config_models.models.time.time', return_value=1000):
+            current = ExampleConfig.current()
+            self.assertEquals(ExampleConfig.current(), current)
+        self.assertEquals(mock_cache.get.call_count, 1)
+
+        # Once the local copy expires, the cache is read again
+        with patch('config_models.models.time.time', return_value=1000 + ExampleConfig.local_cache_timeout):
+            ExampleConfig.current()
+        self.assertEquals(mock_cache.get.call_count, 2)
+
+    def test_local_cache_cleared_on_save(self, mock_cache):
+        mock_cache.get.return_value = None
+
+        ExampleConfig.current()
+        config = ExampleConfig(changed_by=self.user)
+        config.string_field = 'new'
+        config.save()
+
+        self.assertEquals(ExampleConfig.current().string_field, 'new')
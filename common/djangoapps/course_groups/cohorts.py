@@ -3,16 +3,39 @@ This file contains the logic for cohort groups, as exposed internally to the
 forums, and to the cohort admin views.
 """
 
+from collections import namedtuple
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Q
 from django.http import Http404
 import logging
 import random
 
 from courseware import courses
 from student.models import get_user_by_username_or_email
-from .models import CourseUserGroup
+from xmodule.modulestore.django import modulestore
+from .models import CourseUserGroup, cohort_cache_key
 
 log = logging.getLogger(__name__)
 
+# How long a user's cohort assignment in a course stays cached.  Changes to
+# cohort membership invalidate the cached value, so this only bounds staleness
+# for membership changes made outside of the ORM.
+COHORT_CACHE_TIMEOUT = 60 * 60
+
+# Cached in place of a cohort for users that don't have one, so that
+# a cache hit can be told apart from a miss.
+_NO_COHORT = 'no_cohort'
+
+# Number of users looked up or assigned per query by get_cohorts_for_users
+BULK_BATCH_SIZE = 500
+
+# The cohort settings of a course, as the CourseDescriptor properties of the same names
+CohortSettings = namedtuple('CohortSettings', [
+    'is_cohorted', 'auto_cohort', 'auto_cohort_groups',
+    'top_level_discussion_topic_ids', 'cohorted_discussions'
+])
+
 
 # tl;dr: global state is bad.  capa reseeds random every time a problem is loaded.  Even
 # if and when that's fixed, it's a good idea to have a local generator to avoid any other
@@ -32,6 +55,37 @@ def local_random():
 
     return _local_random
 
+def get_cohort_settings(course_id):
+    """
+    Return the CohortSettings of a course.
+
+    They are cached per course version, so that the course descriptor is only
+    loaded when the course changed.
+
+    Raises:
+       Http404 if the course doesn't exist.
+    """
+    version = modulestore().get_course_version(course_id)
+    key = None
+    if version is not None:
+        key = u"course_groups.settings.{0}.{1}".format(course_id, version)
+        settings = cache.get(key)
+        if settings is not None:
+            return settings
+
+    course = courses.get_course_by_id(course_id)
+    settings = CohortSettings(
+        is_cohorted=course.is_cohorted,
+        auto_cohort=course.auto_cohort,
+        auto_cohort_groups=list(course.auto_cohort_groups),
+        top_level_discussion_topic_ids=list(course.top_level_discussion_topic_ids),
+        cohorted_discussions=set(course.cohorted_discussions),
+    )
+    if key is not None:
+        cache.set(key, settings, COHORT_CACHE_TIMEOUT)
+    return settings
+
+
 def is_course_cohorted(course_id):
     """
     Given a course id, return a boolean for whether or not the course is
@@ -40,7 +94,7 @@ def is_course_cohorted(course_id):
     Raises:
        Http404 if the course doesn't exist.
     """
-    return courses.get_course_by_id(course_id).is_cohorted
+    return get_cohort_settings(course_id).is_cohorted
 
 
 def get_cohort_id(user, course_id):
@@ -64,7 +118,7 @@ def is_commentable_cohorted(course_id, commentable_id):
     Raises:
         Http404 if the course doesn't exist.
     """
-    course = courses.get_course_by_id(course_id)
+    course = get_cohort_settings(course_id)
 
     if not course.is_cohorted:
         # this is the easy case :)
@@ -88,7 +142,7 @@ def get_cohorted_commentables(course_id):
     Given a course_id return a list of strings representing cohorted commentables
     """
 
-    course = courses.get_course_by_id(course_id)
+    course = get_cohort_settings(course_id)
 
     if not course.is_cohorted:
         # this is the easy case :)
@@ -118,22 +172,30 @@ def get_cohort(user, course_id):
     # First check whether the course is cohorted (users shouldn't be in a cohort
     # in non-cohorted courses, but settings can change after course starts)
     try:
-        course = courses.get_course_by_id(course_id)
+        course = get_cohort_settings(course_id)
     except Http404:
         raise ValueError("Invalid course_id")
 
     if not course.is_cohorted:
         return None
 
-    try:
-        return CourseUserGroup.objects.get(course_id=course_id,
-                                            group_type=CourseUserGroup.COHORT,
-                                            users__id=user.id)
-    except CourseUserGroup.DoesNotExist:
-        # Didn't find the group.  We'll go on to create one if needed.
-        pass
+    cached = cache.get(cohort_cache_key(course_id, user.id))
+    if cached is not None and cached != _NO_COHORT:
+        return cached
+
+    if cached is None:
+        try:
+            cohort = CourseUserGroup.objects.get(course_id=course_id,
+                                                 group_type=CourseUserGroup.COHORT,
+                                                 users__id=user.id)
+            _cache_cohort(course_id, user.id, cohort)
+            return cohort
+        except CourseUserGroup.DoesNotExist:
+            # Didn't find the group.  We'll go on to create one if needed.
+            pass
 
     if not course.auto_cohort:
+        _cache_cohort(course_id, user.id, None)
         return None
 
     choices = course.auto_cohort_groups
@@ -143,6 +205,7 @@ def get_cohort(user, course_id):
         log.warning("Course %s is auto-cohorted, but there are no"
                     " auto_cohort_groups specified",
                     course_id)
+        _cache_cohort(course_id, user.id, None)
         return None
 
     # Put user in a random group, creating it if needed
@@ -154,9 +217,105 @@ def get_cohort(user, course_id):
         name=group_name)
 
     user.course_groups.add(group)
+    _cache_cohort(course_id, user.id, group)
     return group
 
 
+def get_cohorts_for_users(users, course_id, assign=True):
+    """
+    Bulk version of get_cohort: return the cohorts of many users in a course.
+
+    Cached assignments are used where available and the rest are loaded with
+    one query per BULK_BATCH_SIZE users.  If `assign` is true and the course is
+    auto-cohorted, users without a cohort are put in a random auto cohort, again
+    in batches.
+
+    Arguments:
+        users: an iterable of Django User objects.
+        course_id: string in the format 'org/course/run'
+        assign: whether to auto-cohort users that don't have a cohort yet.
+
+    Returns:
+        A dict mapping user id to a CourseUserGroup object, or to None for users
+        without a cohort.  Empty if the course isn't cohorted.
+
+    Raises:
+       ValueError if the course_id doesn't exist.
+    """
+    try:
+        course = get_cohort_settings(course_id)
+    except Http404:
+        raise ValueError("Invalid course_id")
+
+    if not course.is_cohorted:
+        return {}
+
+    user_ids = [user.id for user in users]
+    keys = dict((cohort_cache_key(course_id, user_id), user_id) for user_id in user_ids)
+    cohorts = {}
+    for key, cached in cache.get_many(keys.keys()).iteritems():
+        if cached != _NO_COHORT:
+            cohorts[keys[key]] = cached
+
+    missing = [user_id for user_id in user_ids if user_id not in cohorts]
+    cohorts.update(_cohort_memberships(course_id, missing))
+
+    unassigned = [user_id for user_id in user_ids if user_id not in cohorts]
+    choices = course.auto_cohort_groups if course.auto_cohort else []
+    if assign and unassigned and choices:
+        groups = [
+            CourseUserGroup.objects.get_or_create(course_id=course_id,
+                                                  group_type=CourseUserGroup.COHORT,
+                                                  name=group_name)[0]
+            for group_name in choices
+        ]
+        for batch in _batches(unassigned):
+            assigned = dict((user_id, local_random().choice(groups)) for user_id in batch)
+            CourseUserGroup.users.through.objects.bulk_create([
+                CourseUserGroup.users.through(user_id=user_id, courseusergroup_id=group.id)
+                for user_id, group in assigned.iteritems()
+            ])
+            cohorts.update(assigned)
+
+    cache.set_many(
+        dict((cohort_cache_key(course_id, user_id), cohorts.get(user_id) or _NO_COHORT)
+             for user_id in missing),
+        COHORT_CACHE_TIMEOUT
+    )
+    for user_id in user_ids:
+        cohorts.setdefault(user_id, None)
+    return cohorts
+
+
+def _cohort_memberships(course_id, user_ids):
+    """
+    Return a dict mapping the ids of those of user_ids who are in a cohort of
+    the course to that CourseUserGroup, whether or not the course is cohorted.
+    """
+    cohorts = {}
+    memberships = CourseUserGroup.users.through.objects.select_related('courseusergroup')
+    for batch in _batches(user_ids):
+        for membership in memberships.filter(courseusergroup__course_id=course_id,
+                                             courseusergroup__group_type=CourseUserGroup.COHORT,
+                                             user__id__in=batch):
+            cohorts[membership.user_id] = membership.courseusergroup
+    return cohorts
+
+
+def _batches(items):
+    """
+    Split a list into lists of at most BULK_BATCH_SIZE items.
+    """
+    return [items[i:i + BULK_BATCH_SIZE] for i in xrange(0, len(items), BULK_BATCH_SIZE)]
+
+
+def _cache_cohort(course_id, user_id, cohort):
+    """
+    Remember a user's cohort (or lack of one) in a course.
+    """
+    cache.set(cohort_cache_key(course_id, user_id), cohort or _NO_COHORT, COHORT_CACHE_TIMEOUT)
+
+
 def get_course_cohorts(course_id):
     """
     Get a list of all the cohorts in the given course.
@@ -256,6 +415,59 @@ def add_user_to_cohort(cohort, username_or_email):
     return user
 
 
+def add_users_to_cohort(cohort, usernames_or_emails):
+    """
+    Bulk version of add_user_to_cohort: look up the given users and add the
+    ones that aren't in a cohort of the course yet to the specified cohort,
+    with a fixed number of queries.
+
+    Like add_user_to_cohort, existing cohorts are found whether or not the
+    course is cohorted yet, so nobody ends up in two cohorts.
+
+    Arguments:
+        cohort: CourseUserGroup
+        usernames_or_emails: list of strings.  Treated as emails if they have '@'
+
+    Returns:
+        A dict of:
+        'added': list of the User objects added,
+        'present': list of the strings for users already in this cohort,
+        'conflict': list of (string, CohortConflict) pairs for users already
+            in another cohort,
+        'unknown': list of the strings not matching any user.
+    """
+    emails = [name for name in usernames_or_emails if '@' in name]
+    usernames = [name for name in usernames_or_emails if '@' not in name]
+    users = list(User.objects.filter(Q(email__in=emails) | Q(username__in=usernames)))
+    users_by_email = dict((user.email, user) for user in users)
+    users_by_username = dict((user.username, user) for user in users)
+
+    current = _cohort_memberships(cohort.course_id, [user.id for user in users])
+    result = {'added': [], 'present': [], 'conflict': [], 'unknown': []}
+    for username_or_email in usernames_or_emails:
+        users_by = users_by_email if '@' in username_or_email else users_by_username
+        user = users_by.get(username_or_email)
+        if user is None:
+            result['unknown'].append(username_or_email)
+            continue
+
+        user_cohort = current.get(user.id)
+        if user_cohort is None:
+            result['added'].append(user)
+            current[user.id] = cohort
+        elif user_cohort.id == cohort.id:
+            result['present'].append(username_or_email)
+        else:
+            result['conflict'].append((
+                username_or_email,
+                CohortConflict("User {0} is in another cohort {1} in course".format(user.username, user_cohort.name))
+            ))
+
+    if result['added']:
+        cohort.users.add(*result['added'])
+    return result
+
+
 def get_course_cohort_names(course_id):
     """
     Return a list of the cohort names in a course.
@@ -1,7 +1,10 @@
 import logging
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 
 log = logging.getLogger(__name__)
 
@@ -31,3 +34,36 @@ class CourseUserGroup(models.Model):
     COHORT = 'cohort'
     GROUP_TYPE_CHOICES = ((COHORT, 'Cohort'),)
     group_type = models.CharField(max_length=20, choices=GROUP_TYPE_CHOICES)
+
+
+def cohort_cache_key(course_id, user_id):
+    """
+    Return the cache key for a user's cohort in a course.
+    """
+    return u"course_groups.cohort.{0}.{1}".format(course_id, user_id)
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+def invalidate_cohort_cache(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached cohorts of users whose group membership changed.
+
+    Handles changes made from either side of the relation, i.e. both
+    `cohort.users.add(user)` and `user.course_groups.add(cohort)`.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        # instance is a User, pk_set holds CourseUserGroup ids
+        if action == 'pre_clear':
+            groups = instance.course_groups.all()
+        else:
+            groups = CourseUserGroup.objects.filter(id__in=pk_set)
+        keys = [cohort_cache_key(group.course_id, instance.id) for group in groups]
+    else:
+        # instance is a CourseUserGroup, pk_set holds User ids
+        if action == 'pre_clear':
+            pk_set = instance.users.values_list('id', flat=True)
+        keys = [cohort_cache_key(instance.course_id, user_id) for user_id in pk_set]
+    cache.delete_many(keys)
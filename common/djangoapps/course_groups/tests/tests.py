@@ -1,12 +1,15 @@
 import django.test
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.cache import cache
+from mock import patch
 
 from django.test.utils import override_settings
 
 from course_groups.models import CourseUserGroup
-from course_groups.cohorts import (get_cohort, get_course_cohorts,
-                                   is_commentable_cohorted, get_cohort_by_name)
+from course_groups.cohorts import (get_cohort, get_course_cohorts, get_cohorts_for_users,
+                                   is_commentable_cohorted, get_cohort_by_name, add_users_to_cohort,
+                                   is_course_cohorted)
 
 from xmodule.modulestore.django import modulestore, clear_existing_modulestores
 
@@ -82,8 +85,10 @@ class TestCohorts(django.test.TestCase):
     def setUp(self):
         """
         Make sure that course is reloaded every time--clear out the modulestore.
+        Cached cohort assignments are dropped too.
         """
         clear_existing_modulestores()
+        cache.clear()
 
     def test_get_cohort(self):
         """
@@ -193,6 +198,131 @@ class TestCohorts(django.test.TestCase):
             self.assertGreater(num_users, 1)
             self.assertLess(num_users, 50)
 
+    def test_cohort_cache_invalidation(self):
+        """
+        Make sure changes to cohort membership are seen by get_cohort()
+        """
+        course = modulestore().get_course("edX/toy/2012_Fall")
+        self.config_course_cohorts(course, [], cohorted=True)
+
+        user = User.objects.create(username="test", email="a@b.com")
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+
+        self.assertIsNone(get_cohort(user, course.id))
+
+        cohort.users.add(user)
+        self.assertEquals(get_cohort(user, course.id).id, cohort.id)
+
+        with self.assertNumQueries(0):
+            self.assertEquals(get_cohort(user, course.id).id, cohort.id)
+
+        user.course_groups.remove(cohort)
+        self.assertIsNone(get_cohort(user, course.id))
+
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure get_cohorts_for_users() finds existing cohorts and
+        auto-cohorts the remaining users
+        """
+        course = modulestore().get_course("edX/toy/2012_Fall")
+        users = [
+            User.objects.create(username="test_{0}".format(i), email="a@b{0}.com".format(i))
+            for i in range(10)
+        ]
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        cohort.users.add(users[0])
+
+        self.assertEquals(get_cohorts_for_users(users, course.id), {},
+                          "Course isn't cohorted, so nobody has a cohort")
+
+        self.config_course_cohorts(course, [], cohorted=True)
+        cohorts = get_cohorts_for_users(users, course.id)
+        self.assertEquals(cohorts[users[0].id].id, cohort.id)
+        self.assertEquals([cohorts[user.id] for user in users[1:]], [None] * 9)
+
+        self.config_course_cohorts(course, [], cohorted=True,
+                                   auto_cohort=True,
+                                   auto_cohort_groups=["AutoGroup"])
+        cohorts = get_cohorts_for_users(users, course.id)
+        self.assertEquals(cohorts[users[0].id].id, cohort.id,
+                          "users[0] should stay put")
+        for user in users[1:]:
+            self.assertEquals(cohorts[user.id].name, "AutoGroup")
+            self.assertEquals(get_cohort(user, course.id).name, "AutoGroup")
+        self.assertEquals(get_cohort_by_name(course.id, "AutoGroup").users.count(), 9)
+
+    def test_cohort_settings_cached_per_course_version(self):
+        """
+        Make sure the course is only loaded for cohort settings when it changed
+        """
+        course = modulestore().get_course("edX/toy/2012_Fall")
+        self.config_course_cohorts(course, [], cohorted=True)
+
+        with patch.object(modulestore(), 'get_course_version', return_value='v1'):
+            self.assertTrue(is_course_cohorted(course.id))
+            with patch('course_groups.cohorts.courses.get_course_by_id') as mock_get_course:
+                self.assertTrue(is_course_cohorted(course.id))
+            self.assertFalse(mock_get_course.called)
+
+        self.config_course_cohorts(course, [], cohorted=False)
+        with patch.object(modulestore(), 'get_course_version', return_value='v2'):
+            self.assertFalse(is_course_cohorted(course.id))
+
+    def test_add_users_to_cohort(self):
+        """
+        Make sure add_users_to_cohort() adds only the users without a cohort
+        """
+        course = modulestore().get_course("edX/toy/2012_Fall")
+        self.config_course_cohorts(course, [], cohorted=True)
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        other_cohort = CourseUserGroup.objects.create(name="OtherCohort",
+                                                      course_id=course.id,
+                                                      group_type=CourseUserGroup.COHORT)
+        present = User.objects.create(username="present", email="present@example.com")
+        conflicting = User.objects.create(username="conflicting", email="conflicting@example.com")
+        new = User.objects.create(username="new", email="new@example.com")
+        cohort.users.add(present)
+        other_cohort.users.add(conflicting)
+
+        result = add_users_to_cohort(cohort, ["present", "conflicting", "new@example.com", "unknown", "new"])
+        self.assertEqual(result['added'], [new])
+        self.assertEqual(result['present'], ["present", "new"])
+        self.assertEqual([name for name, _ in result['conflict']], ["conflicting"])
+        self.assertEqual(result['unknown'], ["unknown"])
+        self.assertEqual(get_cohort(new, course.id).id, cohort.id)
+        self.assertEqual(get_cohort(conflicting, course.id).id, other_cohort.id)
+
+    def test_add_users_to_cohort_not_cohorted(self):
+        """
+        Make sure add_users_to_cohort() doesn't put anyone in a second cohort
+        of a course that isn't cohorted yet
+        """
+        course = modulestore().get_course("edX/toy/2012_Fall")
+        self.config_course_cohorts(course, [], cohorted=False)
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        other_cohort = CourseUserGroup.objects.create(name="OtherCohort",
+                                                      course_id=course.id,
+                                                      group_type=CourseUserGroup.COHORT)
+        user = User.objects.create(username="conflicting", email="conflicting@example.com")
+        other_cohort.users.add(user)
+
+        result = add_users_to_cohort(cohort, ["conflicting"])
+        self.assertEqual(result['added'], [])
+        self.assertEqual([name for name, _ in result['conflict']], ["conflicting"])
+        self.assertEqual(list(user.course_groups.filter(course_id=course.id)), [other_cohort])
+
+        # Cohorting the course later leaves the user in their one cohort
+        self.config_course_cohorts(course, [], cohorted=True)
+        self.assertEqual(get_cohort(user, course.id).id, other_cohort.id)
+
     def test_get_course_cohorts(self):
         course1_id = 'a/b/c'
         course2_id = 'e/f/g'
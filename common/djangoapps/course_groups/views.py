@@ -147,31 +147,21 @@ def add_users_to_cohort(request, course_id, cohort_id):
     cohort = cohorts.get_cohort_by_id(course_id, cohort_id)
 
     users = request.POST.get('users', '')
-    added = []
-    present = []
-    conflict = []
-    unknown = []
-    for username_or_email in split_by_comma_and_whitespace(users):
-        try:
-            user = cohorts.add_user_to_cohort(cohort, username_or_email)
-            added.append({'username': user.username,
-                          'name': "{0} {1}".format(user.first_name, user.last_name),
-                          'email': user.email,
-                          })
-        except ValueError:
-            present.append(username_or_email)
-        except User.DoesNotExist:
-            unknown.append(username_or_email)
-        except cohorts.CohortConflict as err:
-            conflict.append({'username_or_email': username_or_email,
-                              'msg': str(err)})
-
+    result = cohorts.add_users_to_cohort(cohort, split_by_comma_and_whitespace(users))
+    added = [{'username': user.username,
+              'name': "{0} {1}".format(user.first_name, user.last_name),
+              'email': user.email,
+              }
+             for user in result['added']]
+    conflict = [{'username_or_email': username_or_email,
+                 'msg': str(err)}
+                for username_or_email, err in result['conflict']]
 
     return json_http_response({'success': True,
                             'added': added,
-                            'present': present,
+                            'present': result['present'],
                             'conflict': conflict,
-                            'unknown': unknown})
+                            'unknown': result['unknown']})
 
 
 @ensure_csrf_cookie
@@ -4,13 +4,26 @@ Add and create new modes for running courses on this particular LMS
 import pytz
 from datetime import datetime
 
+from django.core.cache import get_cache, InvalidCacheBackendError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from collections import namedtuple
 from django.utils.translation import ugettext as _
-from django.db.models import Q
+
+from util.cache import delete_after_commit
+
+try:
+    cache = get_cache('course_modes')  # pylint: disable=invalid-name
+except InvalidCacheBackendError:
+    from django.core.cache import cache
 
 Mode = namedtuple('Mode', ['slug', 'name', 'min_price', 'suggested_prices', 'currency', 'expiration_datetime'])
 
+# The modes of a course are cached until they are edited; the timeout only
+# lets the modes of courses nobody looks at expire.
+COURSE_MODES_CACHE_TIMEOUT = 24 * 60 * 60
+
 class CourseMode(models.Model):
     """
     We would like to offer a course in a variety of modes.
@@ -54,20 +67,56 @@ class CourseMode(models.Model):
 
         If no modes have been set in the table, returns the default mode
         """
+        return cls.modes_for_courses([course_id])[course_id]
+
+    @classmethod
+    def modes_for_courses(cls, course_ids):
+        """
+        Returns a dict mapping each of `course_ids` to the list of its
+        non-expired modes, like modes_for_course, with at most one query.
+        """
         now = datetime.now(pytz.UTC)
-        found_course_modes = cls.objects.filter(Q(course_id=course_id) &
-                                                (Q(expiration_datetime__isnull=True) |
-                                                Q(expiration_datetime__gte=now)))
-        modes = ([Mode(
-            mode.mode_slug,
-            mode.mode_display_name,
-            mode.min_price,
-            mode.suggested_prices,
-            mode.currency,
-            mode.expiration_datetime
-        ) for mode in found_course_modes])
-        if not modes:
-            modes = [cls.DEFAULT_MODE]
+        modes = {}
+        for course_id, course_modes in cls._all_modes_for_courses(course_ids).iteritems():
+            modes[course_id] = [
+                mode for mode in course_modes
+                if mode.expiration_datetime is None or mode.expiration_datetime >= now
+            ]
+            if not modes[course_id]:
+                modes[course_id] = [cls.DEFAULT_MODE]
+        return modes
+
+    @staticmethod
+    def cache_key_name(course_id):
+        """Return the name of the key to use to cache the modes of course_id"""
+        return u'course_modes/{}'.format(course_id)
+
+    @classmethod
+    def _all_modes_for_courses(cls, course_ids):
+        """
+        Returns a dict mapping each of `course_ids` to the list of all its
+        modes, expired ones included, from the cache when possible.  The
+        courses missing from the cache are looked up with one query.
+        """
+        keys = dict((cls.cache_key_name(course_id), course_id) for course_id in course_ids)
+        modes = dict((keys[key], course_modes) for key, course_modes in cache.get_many(keys.keys()).iteritems())
+
+        missing = dict((course_id, []) for course_id in course_ids if course_id not in modes)
+        if missing:
+            for mode in cls.objects.filter(course_id__in=missing.keys()).order_by('id'):
+                missing[mode.course_id].append(Mode(
+                    mode.mode_slug,
+                    mode.mode_display_name,
+                    mode.min_price,
+                    mode.suggested_prices,
+                    mode.currency,
+                    mode.expiration_datetime
+                ))
+            cache.set_many(
+                dict((cls.cache_key_name(course_id), course_modes) for course_id, course_modes in missing.iteritems()),
+                COURSE_MODES_CACHE_TIMEOUT
+            )
+            modes.update(missing)
         return modes
 
     @classmethod
@@ -112,6 +161,21 @@ class CourseMode(models.Model):
                 return mode.min_price
         return 0
 
+    @classmethod
+    def min_course_prices_for_verified_for_currency(cls, course_ids, currency):
+        """
+        Returns a dict mapping each of `course_ids` to its minimum verified price in
+        `currency`, as min_course_price_for_verified_for_currency, with one query.
+        """
+        prices = {}
+        for course_id, modes in cls.modes_for_courses(course_ids).iteritems():
+            prices[course_id] = 0
+            for mode in modes:
+                if (mode.currency == currency) and (mode.slug == 'verified'):
+                    prices[course_id] = mode.min_price
+                    break
+        return prices
+
     @classmethod
     def min_course_price_for_currency(cls, course_id, currency):
         """
@@ -126,3 +190,13 @@ class CourseMode(models.Model):
         return u"{} : {}, min={}, prices={}".format(
             self.course_id, self.mode_slug, self.min_price, self.suggested_prices
         )
+
+
+@receiver(post_save, sender=CourseMode)
+@receiver(post_delete, sender=CourseMode)
+def clear_course_modes_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached modes of a course whose modes were edited, including
+    any cached before the edit was committed.
+    """
+    delete_after_commit(cache, CourseMode.cache_key_name(instance.course_id))
@@ -8,7 +8,10 @@ Replace this with more appropriate tests for your application.
 from datetime import datetime, timedelta
 import pytz
 
+from django.core.cache import get_cache
 from django.test import TestCase
+from mock import patch
+
 from course_modes.models import CourseMode, Mode
 
 
@@ -18,6 +21,7 @@ class CourseModeModelTest(TestCase):
     """
 
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.course_id = 'TestCourse'
         CourseMode.objects.all().delete()
 
@@ -112,3 +116,42 @@ class CourseModeModelTest(TestCase):
 
         modes = CourseMode.modes_for_course('second_test_course')
         self.assertEqual([CourseMode.DEFAULT_MODE], modes)
+
+    def test_modes_for_courses(self):
+        mode1 = Mode(u'honor', u'Honor Code Certificate', 0, '', 'usd', None)
+        mode2 = Mode(u'verified', u'Verified Certificate', 10, '10,20', 'usd', None)
+        for mode in (mode1, mode2):
+            self.create_mode(mode.slug, mode.name, mode.min_price, mode.suggested_prices)
+        expired_mode, _status = self.create_mode('audit', 'Audit')
+        expired_mode.expiration_datetime = datetime.now(pytz.UTC) + timedelta(days=-1)
+        expired_mode.save()
+
+        with self.assertNumQueries(1):
+            modes = CourseMode.modes_for_courses([self.course_id, 'second_test_course'])
+        self.assertEqual(sorted(modes[self.course_id]), sorted(CourseMode.modes_for_course(self.course_id)))
+        self.assertEqual(sorted(modes[self.course_id]), sorted([mode1, mode2]))
+        self.assertEqual(modes['second_test_course'], [CourseMode.DEFAULT_MODE])
+
+    def test_modes_cached_until_edited(self):
+        cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='course_modes_test')
+        self.addCleanup(cache.clear)
+        mode1 = Mode(u'honor', u'Honor Code Certificate', 0, '', 'usd', None)
+        mode2 = Mode(u'verified', u'Verified Certificate', 10, '10,20', 'usd', None)
+
+        with patch('course_modes.models.cache', cache):
+            self.create_mode(mode1.slug, mode1.name, mode1.min_price, mode1.suggested_prices)
+            self.assertEqual(CourseMode.modes_for_course(self.course_id), [mode1])
+            with self.assertNumQueries(0):
+                self.assertEqual(CourseMode.modes_for_courses([self.course_id])[self.course_id], [mode1])
+                self.assertEqual(CourseMode.mode_for_course(self.course_id, 'honor'), mode1)
+
+            # Only the courses missing from the cache are queried
+            with self.assertNumQueries(1):
+                modes = CourseMode.modes_for_courses([self.course_id, 'second_test_course'])
+            self.assertEqual(modes['second_test_course'], [CourseMode.DEFAULT_MODE])
+
+            verified, _status = self.create_mode(mode2.slug, mode2.name, mode2.min_price, mode2.suggested_prices)
+            self.assertEqual(CourseMode.modes_for_course(self.course_id), [mode1, mode2])
+
+            verified.delete()
+            self.assertEqual(CourseMode.modes_for_course(self.course_id), [mode1])
@@ -6,6 +6,15 @@ To enable this feature, set in a settings.py:
 
   SESSION_INACTIVITY_TIMEOUT_IN_SECS = 300
 
+To avoid writing the session on every request, the time of the last request
+is only stored again once it has moved by more than
+
+  SESSION_ACTIVITY_SAVE_DELAY_SECONDS = 60
+
+seconds (60 by default, and at most a tenth of the timeout).  Sessions then
+expire between the timeout and the timeout plus that delay after their last
+request, never before.
+
 This was taken from StackOverflow (http://stackoverflow.com/questions/14830669/how-to-expire-django-session-in-5minutes)
 """
 from datetime import datetime, timedelta
@@ -14,6 +23,8 @@ from django.contrib import auth
 
 LAST_TOUCH_KEYNAME = 'SessionInactivityTimeout:last_touch'
 
+DEFAULT_ACTIVITY_SAVE_DELAY_SECONDS = 60
+
 
 class SessionInactivityTimeout(object):
     """
@@ -34,6 +45,13 @@ class SessionInactivityTimeout(object):
             # what time is it now?
             utc_now = datetime.utcnow()
 
+            # The stored time of the last request may be behind by up to this
+            # much, as it isn't stored again for every request
+            save_delay = timedelta(seconds=min(
+                getattr(settings, "SESSION_ACTIVITY_SAVE_DELAY_SECONDS", DEFAULT_ACTIVITY_SAVE_DELAY_SECONDS),
+                timeout_in_seconds / 10.0
+            ))
+
             # Get the last time user made a request to server, which is stored in session data
             last_touch = request.session.get(LAST_TOUCH_KEYNAME)
 
@@ -43,11 +61,16 @@ class SessionInactivityTimeout(object):
                 # compute the delta since last time user came to the server
                 time_since_last_activity = utc_now - last_touch
 
-                # did we exceed the timeout limit?
-                if time_since_last_activity > timedelta(seconds=timeout_in_seconds):
+                # did we exceed the timeout limit, even if requests were made
+                # since last_touch was stored?
+                if time_since_last_activity > timedelta(seconds=timeout_in_seconds) + save_delay:
                     # yes? Then log the user out
                     del request.session[LAST_TOUCH_KEYNAME]
                     auth.logout(request)
                     return
 
+                # Only write the session when the stored time is too far behind
+                if time_since_last_activity <= save_delay:
+                    return
+
             request.session[LAST_TOUCH_KEYNAME] = utc_now
@@ -0,0 +1,32 @@
+"""
+Recount the active enrollments of courses and correct the enrollment counts
+kept in CourseEnrollmentCount.
+"""
+from django.core.management.base import BaseCommand
+
+from student.models import CourseEnrollmentCount
+
+
+class Command(BaseCommand):
+    """
+    Correct the enrollment counts of courses.
+    """
+    args = "[course_id ...]"
+    help = """
+    Recount the active enrollments of the given courses, or of all courses,
+    by mode, and overwrite the enrollment counts with them.
+
+    The counts are kept up to date as enrollments are saved, so this is only
+    needed after enrollments were changed in bulk, without saving them one by
+    one.  Enrollments made while the command runs may be miscounted, so run
+    it when few users are enrolling.
+
+    example:
+        manage.py ... reconcile_enrollment_counts edX/Open_DemoX/edx_demo_course
+    """
+
+    def handle(self, *args, **options):
+        wrong = CourseEnrollmentCount.reconcile(list(args) if args else None)
+        for course_id, mode, count, actual_count in wrong:
+            self.stdout.write(u"{0} ({1}): {2} -> {3}\n".format(course_id, mode, count, actual_count))
+        self.stdout.write(u"Corrected {0} enrollment counts\n".format(len(wrong)))
@@ -14,24 +14,20 @@ class UserStandingMiddleware(object):
     """
     def process_request(self, request):
         user = request.user
-        try:
-            user_account = UserStanding.objects.get(user=user.id)
-            # because user is a unique field in UserStanding, there will either be
-            # one or zero user_accounts associated with a UserStanding
-        except UserStanding.DoesNotExist:
-            pass
-        else:
-            if user_account.account_status == UserStanding.ACCOUNT_DISABLED:
-                msg = _(
-                            'Your account has been disabled. If you believe '
-                            'this was done in error, please contact us at '
-                            '{link_start}{support_email}{link_end}'
-                        ).format(
-                            support_email=settings.DEFAULT_FEEDBACK_EMAIL,
-                            link_start=u'<a href="mailto:{address}?subject={subject_line}">'.format(
-                                address=settings.DEFAULT_FEEDBACK_EMAIL,
-                                subject_line=_('Disabled Account'),
-                            ),
-                            link_end=u'</a>'
-                        )
-                return HttpResponseForbidden(msg)
+        # Anonymous users have no account to disable
+        if not user.is_authenticated():
+            return
+        if UserStanding.is_account_disabled(user.id):
+            msg = _(
+                        'Your account has been disabled. If you believe '
+                        'this was done in error, please contact us at '
+                        '{link_start}{support_email}{link_end}'
+                    ).format(
+                        support_email=settings.DEFAULT_FEEDBACK_EMAIL,
+                        link_start=u'<a href="mailto:{address}?subject={subject_line}">'.format(
+                            address=settings.DEFAULT_FEEDBACK_EMAIL,
+                            subject_line=_('Disabled Account'),
+                        ),
+                        link_end=u'</a>'
+                    )
+            return HttpResponseForbidden(msg)
@@ -16,15 +16,17 @@ import hashlib
 import json
 import logging
 from pytz import UTC
+import random
 import uuid
 from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db import models, IntegrityError
-from django.db.models import Count
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver, Signal
 import django.dispatch
 from django.forms import ModelForm, forms
@@ -148,6 +150,37 @@ class UserStanding(models.Model):
     changed_by = models.ForeignKey(User, blank=True)
     standing_last_changed_at = models.DateTimeField(auto_now=True)
 
+    @staticmethod
+    def _disabled_cache_key(user_id):
+        """
+        The cache key of whether the account of user `user_id` is disabled.
+        """
+        return u"student.userstanding.disabled.{0}".format(user_id)
+
+    @classmethod
+    def is_account_disabled(cls, user_id):
+        """
+        Returns whether the account of user `user_id` is disabled.
+
+        Almost no accounts are, so the answer is cached, and the cache is
+        cleared whenever the user's UserStanding is saved or deleted.
+        """
+        key = cls._disabled_cache_key(user_id)
+        disabled = cache.get(key)
+        if disabled is None:
+            disabled = cls.objects.filter(user=user_id, account_status=cls.ACCOUNT_DISABLED).exists()
+            cache.set(key, disabled)
+        return disabled
+
+
+@receiver(post_save, sender=UserStanding)
+@receiver(post_delete, sender=UserStanding)
+def clear_user_standing_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached standing of a user whose UserStanding changed.
+    """
+    cache.delete(UserStanding._disabled_cache_key(instance.user_id))  # pylint: disable=protected-access
+
 
 class UserProfile(models.Model):
     """This is where we store all the user demographic fields. We have a
@@ -380,11 +413,66 @@ class CourseEnrollment(models.Model):
         unique_together = (('user', 'course_id'),)
         ordering = ('user', 'course_id')
 
+    def __init__(self, *args, **kwargs):
+        super(CourseEnrollment, self).__init__(*args, **kwargs)
+        # The mode this enrollment is counted under in CourseEnrollmentCount,
+        # or None if it isn't counted, so that saving can adjust the counts
+        self._counted_mode = self.mode if self.pk is not None and self.is_active else None
+        # The is_active and mode the enrollment had when it was loaded
+        self._loaded_state = (self.is_active, self.mode)
+
     def __unicode__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
         ).format(self.user, self.course_id, self.created, self.is_active)
 
+    def save(self, *args, **kwargs):
+        """
+        Save the enrollment, and move it between the enrollment counts if it
+        was activated, deactivated or changed mode, in the same transaction.
+        """
+        counted_mode = self.mode if self.is_active else None
+        unchanged = self.pk is not None and (self.is_active, self.mode) == self._loaded_state
+        if unchanged or (self.pk is None and counted_mode is None):
+            super(CourseEnrollment, self).save(*args, **kwargs)
+            self._loaded_state = (self.is_active, self.mode)
+            return
+
+        with _enrollment_count_transaction():
+            previous_mode = None if self.pk is None else self._store_counted_fields()
+            super(CourseEnrollment, self).save(*args, **kwargs)
+            if previous_mode != counted_mode:
+                if previous_mode is not None:
+                    CourseEnrollmentCount.increment(self.course_id, previous_mode, -1)
+                if counted_mode is not None:
+                    CourseEnrollmentCount.increment(self.course_id, counted_mode, 1)
+        self._counted_mode = counted_mode
+        self._loaded_state = (self.is_active, self.mode)
+
+    def _store_counted_fields(self):
+        """
+        Store is_active and mode, and return the mode the enrollment was
+        counted under until now, or None.
+
+        The row is only updated from the state it was loaded in, so that when
+        concurrent requests make the same change, e.g. two enroll requests
+        activating the same enrollment, the change is counted once.
+        """
+        enrollments = CourseEnrollment.objects.filter(pk=self.pk)
+        was_active, was_mode = self._loaded_state
+        changed = enrollments.filter(is_active=was_active, mode=was_mode).update(
+            is_active=self.is_active, mode=self.mode
+        )
+        if not changed:
+            # Changed by someone else since it was loaded: lock it to see how
+            try:
+                was_active, was_mode = enrollments.select_for_update().values_list('is_active', 'mode').get()
+            except CourseEnrollment.DoesNotExist:
+                # Deleted, so saving creates it again
+                return None
+            enrollments.update(is_active=self.is_active, mode=self.mode)
+        return was_mode if was_active else None
+
     @classmethod
     def get_or_create_enrollment(cls, user, course_id):
         """
@@ -411,17 +499,13 @@ class CourseEnrollment(models.Model):
         if user.id is None:
             user.save()
 
-        enrollment, created = CourseEnrollment.objects.get_or_create(
+        # If we create a new enrollment, it is created with these defaults
+        enrollment, __ = CourseEnrollment.objects.get_or_create(
             user=user,
             course_id=course_id,
+            defaults={'mode': "honor", 'is_active': False},
         )
 
-        # If we *did* just create a new enrollment, set some defaults
-        if created:
-            enrollment.mode = "honor"
-            enrollment.is_active = False
-            enrollment.save()
-
         return enrollment
 
     @classmethod
@@ -431,9 +515,9 @@ class CourseEnrollment(models.Model):
 
         'course_id' is the course_id to return enrollments
         """
-        enrollment_number = CourseEnrollment.objects.filter(course_id=course_id, is_active=1).count()
-
-        return enrollment_number
+        return CourseEnrollmentCount.objects.filter(course_id=course_id).aggregate(
+            total=Sum('count')
+        )['total'] or 0
 
     @classmethod
     def is_course_full(cls, course):
@@ -675,15 +759,30 @@ class CourseEnrollment(models.Model):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
-        # Unfortunately, Django's "group by"-style queries look super-awkward
-        query = use_read_replica_if_available(cls.objects.filter(course_id=course_id, is_active=True).values('mode').order_by().annotate(Count('mode')))
-        total = 0
-        d = defaultdict(int)
+        return cls.enrollment_counts_for_courses([course_id])[course_id]
+
+    @classmethod
+    def enrollment_counts_for_courses(cls, course_ids):
+        """
+        Returns a dictionary mapping each of `course_ids` to its enrollment counts, as
+        returned by enrollment_counts, with one query.
+        """
+        counts = {}
+        for course_id in course_ids:
+            counts[course_id] = defaultdict(int)
+            counts[course_id]['total'] = 0
+        if not counts:
+            return counts
+        query = use_read_replica_if_available(
+            CourseEnrollmentCount.objects.filter(course_id__in=course_ids)
+            .values('course_id', 'mode').order_by().annotate(Sum('count'))
+        )
         for item in query:
-            d[item['mode']] = item['mode__count']
-            total += item['mode__count']
-        d['total'] = total
-        return d
+            count = item['count__sum']
+            if count > 0:
+                counts[item['course_id']][item['mode']] = count
+                counts[item['course_id']]['total'] += count
+        return counts
 
     def activate(self):
         """Makes this `CourseEnrollment` record active. Saves immediately."""
@@ -699,16 +798,133 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, modes=None):
         """
         For paid/verified certificates, students may receive a refund IFF they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        `modes` are the modes of the course, as returned by CourseMode.modes_for_course,
+        which is called if they aren't given.
         """
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
-        if course_mode is None:
-            return False
-        else:
-            return True
+        if modes is None:
+            modes = CourseMode.modes_for_course(self.course_id)
+        return any(mode.slug == 'verified' for mode in modes)
+
+
+def _enrollment_count_transaction():
+    """
+    The transaction to save an enrollment and its counts in.
+
+    Requests are already wrapped in a transaction by TransactionMiddleware, and
+    committing there would commit the whole request early, so a transaction is
+    only started when none is being managed, e.g. in management commands.
+    """
+    if transaction.is_managed():
+        return _NoTransaction()
+    return transaction.commit_on_success()
+
+
+class _NoTransaction(object):
+    """
+    A context manager that leaves transaction management to its caller.
+    """
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class CourseEnrollmentCount(models.Model):
+    """
+    A share of the number of active enrollments in a course in one mode.
+
+    Each count is the sum of up to SHARDS rows, and changes go to a random one
+    of them.  Their row locks are held until the enrolling request commits, so
+    with a single row every enrollment in a course would wait for the previous
+    one.  A single shard can go negative; only the sum is meaningful.
+
+    The counts are kept up to date when enrollments are saved or deleted, so
+    that they can be read without counting the enrollments.  Enrollments
+    changed without saving them, e.g. by QuerySet.update, aren't counted; the
+    reconcile_enrollment_counts command recounts them from the enrollments.
+    """
+    SHARDS = 16
+
+    course_id = models.CharField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=100)
+    shard = models.PositiveSmallIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'mode', 'shard'),)
+
+    def __unicode__(self):
+        return u"[CourseEnrollmentCount] {}: {} #{} ({})".format(self.course_id, self.mode, self.shard, self.count)
+
+    @classmethod
+    def increment(cls, course_id, mode, delta):
+        """
+        Atomically add `delta` to the count of enrollments in `course_id` in `mode`.
+        """
+        shard = random.randrange(cls.SHARDS)
+        counter = cls.objects.filter(course_id=course_id, mode=mode, shard=shard)
+        if counter.update(count=F('count') + delta):
+            return
+        sid = transaction.savepoint()
+        try:
+            cls.objects.create(course_id=course_id, mode=mode, shard=shard, count=delta)
+            transaction.savepoint_commit(sid)
+        except IntegrityError:
+            # Another request created the counter first, so add to it
+            transaction.savepoint_rollback(sid)
+            counter.update(count=F('count') + delta)
+
+    @classmethod
+    def reconcile(cls, course_ids=None):
+        """
+        Recount the active enrollments of `course_ids`, or of all courses, and
+        overwrite the counts with them.
+
+        Returns the (course_id, mode, count, actual count) of every count that
+        was wrong.
+        """
+        enrollments = CourseEnrollment.objects.filter(is_active=True)
+        counters = cls.objects.all()
+        if course_ids is not None:
+            enrollments = enrollments.filter(course_id__in=course_ids)
+            counters = counters.filter(course_id__in=course_ids)
+
+        actual = dict(
+            ((item['course_id'], item['mode']), item['id__count'])
+            for item in enrollments.values('course_id', 'mode').order_by().annotate(Count('id'))
+        )
+        counted = dict(
+            ((item['course_id'], item['mode']), item['count__sum'])
+            for item in counters.values('course_id', 'mode').order_by().annotate(Sum('count'))
+        )
+
+        wrong = []
+        for (course_id, mode) in sorted(set(actual) | set(counted)):
+            count, actual_count = counted.get((course_id, mode)), actual.get((course_id, mode), 0)
+            if count == actual_count:
+                continue
+            wrong.append((course_id, mode, count, actual_count))
+            # Keep the whole count in the first shard
+            shards = cls.objects.filter(course_id=course_id, mode=mode)
+            shards.exclude(shard=0).update(count=0)
+            if not shards.filter(shard=0).update(count=actual_count):
+                cls.objects.create(course_id=course_id, mode=mode, shard=0, count=actual_count)
+        return wrong
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def uncount_deleted_enrollment(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove a deleted enrollment from the enrollment counts.
+    """
+    if instance._counted_mode is not None:  # pylint: disable=protected-access
+        CourseEnrollmentCount.increment(instance.course_id, instance._counted_mode, -1)  # pylint: disable=protected-access
 
 
 class CourseEnrollmentAllowed(models.Model):
@@ -3,8 +3,12 @@ These are tests for disabling and enabling student accounts, and for making sure
 that students with disabled accounts are unable to access the courseware.
 """
 from student.tests.factories import UserFactory, UserStandingFactory
+from student.middleware import UserStandingMiddleware
 from student.models import UserStanding
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.test import TestCase, Client
+from django.test.client import RequestFactory
 from django.core.urlresolvers import reverse, NoReverseMatch
 from nose.plugins.skip import SkipTest
 
@@ -13,6 +17,9 @@ class UserStandingTest(TestCase):
     """test suite for user standing view for enabling and disabling accounts"""
 
     def setUp(self):
+        # Standings are cached by user id, and ids are reused by later tests
+        self.addCleanup(cache.clear)
+
         # create users
         self.bad_user = UserFactory.create(
             username='bad_user',
@@ -113,3 +120,34 @@ class UserStandingTest(TestCase):
         self.assertEqual(
             UserStanding.objects.filter(user=self.good_user).count(), 0
         )
+
+    def _process_request(self, user):
+        """
+        Run UserStandingMiddleware on a request made by `user`.
+        """
+        request = RequestFactory().get(self.some_url)
+        request.user = user
+        return UserStandingMiddleware().process_request(request)
+
+    def test_anonymous_request_skips_standing(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(self._process_request(AnonymousUser()))
+
+    def test_cached_standing_follows_changes(self):
+        self.assertEqual(self._process_request(self.bad_user).status_code, 403)
+        self.assertIsNone(self._process_request(self.good_user))
+        with self.assertNumQueries(0):
+            self.assertEqual(self._process_request(self.bad_user).status_code, 403)
+            self.assertIsNone(self._process_request(self.good_user))
+
+        standing = UserStanding.objects.get(user=self.bad_user)
+        standing.account_status = UserStanding.ACCOUNT_ENABLED
+        standing.save()
+        self.assertIsNone(self._process_request(self.bad_user))
+
+        UserStandingFactory.create(
+            user=self.good_user,
+            account_status=UserStanding.ACCOUNT_DISABLED,
+            changed_by=self.admin
+        )
+        self.assertEqual(self._process_request(self.good_user).status_code, 403)
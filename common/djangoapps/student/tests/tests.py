@@ -11,6 +11,7 @@ import unittest
 from datetime import datetime, timedelta
 import pytz
 
+from django.core.cache import get_cache
 from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -29,10 +30,11 @@ from courseware.tests.tests import TEST_DATA_MIXED_MODULESTORE
 from mock import Mock, patch, sentinel
 from textwrap import dedent
 
-from student.models import anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user
+from student.models import (anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, CourseEnrollmentCount,
+                            unique_id_for_user)
 from student.views import (process_survey_link, _cert_info, password_reset, password_reset_confirm_wrapper,
                            change_enrollment, complete_course_mode_info, token, course_from_id)
-from student.tests.factories import UserFactory, CourseModeFactory
+from student.tests.factories import UserFactory, CourseModeFactory, CourseEnrollmentFactory
 from student.tests.test_email import mock_render_to_string
 
 import shoppingcart
@@ -243,6 +245,7 @@ class DashboardTest(TestCase):
     COURSE_ORG = "EDX"
 
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.course = CourseFactory.create(org=self.COURSE_ORG, display_name=self.COURSE_NAME, number=self.COURSE_SLUG)
         self.assertIsNotNone(self.course)
         self.user = UserFactory.create(username="jack", email="jack@fake.edx.org")
@@ -496,6 +499,92 @@ class EnrollInCourseTest(TestCase):
         self.assert_enrollment_event_was_emitted(user, course_id)
 
 
+class EnrollmentCountTest(TestCase):
+    """Tests the enrollment counts kept per course and mode."""
+    course_id = "edX/Test101/2013"
+
+    def setUp(self):
+        patcher = patch('student.models.server_track')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_counts(self, total, **modes):
+        """
+        Assert the counts of the course, and that they match the enrollments.
+        """
+        self.assertEqual(CourseEnrollment.num_enrolled_in(self.course_id), total)
+        counts = CourseEnrollment.enrollment_counts(self.course_id)
+        self.assertEqual(counts['total'], total)
+        for mode, count in modes.items():
+            self.assertEqual(counts[mode], count)
+        self.assertEqual(CourseEnrollmentCount.reconcile([self.course_id]), [])
+
+    def test_counts_follow_enrollments(self):
+        first, second = UserFactory.create(), UserFactory.create()
+        self.assert_counts(0)
+
+        CourseEnrollment.enroll(first, self.course_id)
+        CourseEnrollment.enroll(second, self.course_id, mode='verified')
+        self.assert_counts(2, honor=1, verified=1)
+
+        CourseEnrollment.objects.get(user=first, course_id=self.course_id).change_mode('verified')
+        self.assert_counts(2, honor=0, verified=2)
+
+        CourseEnrollment.unenroll(second, self.course_id)
+        self.assert_counts(1, verified=1)
+
+        # Changing the mode of an inactive enrollment doesn't count it
+        CourseEnrollment.objects.get(user=second, course_id=self.course_id).change_mode('honor')
+        self.assert_counts(1, honor=0, verified=1)
+
+        CourseEnrollment.objects.get(user=first, course_id=self.course_id).delete()
+        self.assert_counts(0)
+
+    def test_concurrent_enrolls_counted_once(self):
+        user = UserFactory.create()
+        CourseEnrollment.get_or_create_enrollment(user, self.course_id)
+        # Two requests load the inactive enrollment before either activates it
+        first = CourseEnrollment.objects.get(user=user, course_id=self.course_id)
+        second = CourseEnrollment.objects.get(user=user, course_id=self.course_id)
+        first.activate()
+        second.activate()
+        self.assert_counts(1, honor=1)
+
+    def test_concurrent_changes_counted_from_saved_state(self):
+        enrollment = CourseEnrollmentFactory.create(course_id=self.course_id)
+        stale = CourseEnrollment.objects.get(pk=enrollment.pk)
+        enrollment.change_mode('verified')
+        # Deactivating uncounts the mode it was changed to, not the loaded one
+        stale.deactivate()
+        self.assert_counts(0, honor=0, verified=0)
+
+    def test_unchanged_save_skips_counts(self):
+        CourseEnrollmentFactory.create(course_id=self.course_id)
+        enrollment = CourseEnrollment.objects.get(course_id=self.course_id)
+        with patch.object(CourseEnrollment, '_store_counted_fields') as mock_store:
+            enrollment.save()
+        self.assertFalse(mock_store.called)
+        self.assert_counts(1, honor=1)
+
+    def test_inactive_enrollments_not_counted(self):
+        CourseEnrollment.get_or_create_enrollment(UserFactory.create(), self.course_id)
+        CourseEnrollmentFactory.create(course_id=self.course_id, is_active=False)
+        self.assert_counts(0)
+
+    def test_reconcile(self):
+        enrollment = CourseEnrollmentFactory.create(course_id=self.course_id)
+        CourseEnrollmentFactory.create(course_id=self.course_id, mode='verified')
+        # Bulk updates aren't counted
+        CourseEnrollment.objects.filter(pk=enrollment.pk).update(is_active=False)
+        self.assertEqual(CourseEnrollment.num_enrolled_in(self.course_id), 2)
+
+        self.assertEqual(
+            CourseEnrollmentCount.reconcile(),
+            [(self.course_id, 'honor', 1, 0)]
+        )
+        self.assertEqual(CourseEnrollment.num_enrolled_in(self.course_id), 1)
+
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class PaidRegistrationTest(ModuleStoreTestCase):
     """
@@ -536,6 +625,7 @@ class AnonymousLookupTable(TestCase):
     COURSE_ORG = "EDX"
 
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.course = CourseFactory.create(org=self.COURSE_ORG, display_name=self.COURSE_NAME, number=self.COURSE_SLUG)
         self.assertIsNotNone(self.course)
         self.user = UserFactory()
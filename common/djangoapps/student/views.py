@@ -48,7 +48,9 @@ from student.models import (
 from student.forms import PasswordResetFormNoActive
 
 from verify_student.models import SoftwareSecurePhotoVerification, MidcourseReverificationWindow
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, certificate_status_for_student, certificate_statuses_for_courses
+)
 
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -165,7 +167,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course):
+def cert_info(user, course, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.  Returns a dictionary with keys:
@@ -177,11 +179,16 @@ def cert_info(user, course):
     'show_survey_button': bool
     'survey_url': url, only if show_survey_button is True
     'grade': if status is not 'processing'
+
+    `cert_status` is the student's certificate status in the course, as returned
+    by certificate_status_for_student, which is called if it isn't given.
     """
     if not course.has_ended():
         return {}
 
-    return _cert_info(user, course, certificate_status_for_student(user, course.id))
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course.id)
+    return _cert_info(user, course, cert_status)
 
 
 def reverification_info(course_enrollment_pairs, user, statuses):
@@ -228,10 +235,13 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
         ReverifyInfo: (course_id, course_name, course_number, date, status)
         OR, None: None if there is no re-verification info for this enrollment
     """
-    window = MidcourseReverificationWindow.get_window(course.id, datetime.datetime.now(UTC))
+    # If the user is not verified, we don't get reverification info
+    if enrollment.mode != "verified":
+        return None
 
-    # If there's no window OR the user is not verified, we don't get reverification info
-    if (not window) or (enrollment.mode != "verified"):
+    window = MidcourseReverificationWindow.get_window(course.id, datetime.datetime.now(UTC))
+    # Nor if there's no window
+    if not window:
         return None
     return ReverifyInfo(
         course.id, course.display_name, course.number,
@@ -245,24 +255,28 @@ def get_course_enrollment_pairs(user, course_org_filter, org_filter_out_set):
     """
     Get the relevant set of (Course, CourseEnrollment) pairs to be displayed on
     a student's dashboard.
+
+    The courses are all loaded at once, without their descendants.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
-        try:
-            course = course_from_id(enrollment.course_id)
-
-            # if we are in a Microsite, then filter out anything that is not
-            # attributed (by ORG) to that Microsite
-            if course_org_filter and course_org_filter != course.location.org:
-                continue
-            # Conversely, if we are not in a Microsite, then let's filter out any enrollments
-            # with courses attributed (by ORG) to Microsites
-            elif course.location.org in org_filter_out_set:
-                continue
-
-            yield (course, enrollment)
-        except ItemNotFoundError:
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+    courses = modulestore().get_course_instances([enrollment.course_id for enrollment in enrollments])
+    for enrollment in enrollments:
+        course = courses.get(enrollment.course_id)
+        if course is None:
             log.error("User {0} enrolled in non-existent course {1}"
                       .format(user.username, enrollment.course_id))
+            continue
+
+        # if we are in a Microsite, then filter out anything that is not
+        # attributed (by ORG) to that Microsite
+        if course_org_filter and course_org_filter != course.location.org:
+            continue
+        # Conversely, if we are not in a Microsite, then let's filter out any enrollments
+        # with courses attributed (by ORG) to Microsites
+        elif course.location.org in org_filter_out_set:
+            continue
+
+        yield (course, enrollment)
 
 
 
@@ -378,7 +392,7 @@ def register_user(request, extra_context=None):
     return render_to_response('register.html', context)
 
 
-def complete_course_mode_info(course_id, enrollment):
+def complete_course_mode_info(course_id, enrollment, modes=None):
     """
     We would like to compute some more information from the given course modes
     and the user's current enrollment
@@ -386,8 +400,12 @@ def complete_course_mode_info(course_id, enrollment):
     Returns the given information:
         - whether to show the course upsell information
         - numbers of days until they can't upsell anymore
+
+    `modes` are the course's modes by slug, as returned by
+    CourseMode.modes_for_course_dict, which is called if they aren't given.
     """
-    modes = CourseMode.modes_for_course_dict(course_id)
+    if modes is None:
+        modes = CourseMode.modes_for_course_dict(course_id)
     mode_info = {'show_upsell': False, 'days_for_upsell': None}
     # we want to know if the user is already verified and if verified is an
     # option
@@ -440,17 +458,31 @@ def dashboard(request):
     show_courseware_links_for = frozenset(course.id for course, _enrollment in course_enrollment_pairs
                                           if has_access(request.user, course, 'load'))
 
-    course_modes = {course.id: complete_course_mode_info(course.id, enrollment) for course, enrollment in course_enrollment_pairs}
-    cert_statuses = {course.id: cert_info(request.user, course) for course, _enrollment in course_enrollment_pairs}
+    # Modes, certificates and email authorizations are fetched for all the
+    # courses at once
+    course_ids = [course.id for course, _enrollment in course_enrollment_pairs]
+    modes_by_course = CourseMode.modes_for_courses(course_ids)
+    course_modes = {
+        course.id: complete_course_mode_info(
+            course.id, enrollment, {mode.slug: mode for mode in modes_by_course[course.id]}
+        )
+        for course, enrollment in course_enrollment_pairs
+    }
+    certificate_statuses = certificate_statuses_for_courses(
+        user, [course.id for course, _enrollment in course_enrollment_pairs if course.has_ended()]
+    )
+    cert_statuses = {
+        course.id: cert_info(request.user, course, certificate_statuses.get(course.id))
+        for course, _enrollment in course_enrollment_pairs
+    }
 
     # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        course.id for course, _enrollment in course_enrollment_pairs if (
-            settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL'] and
-            modulestore().get_modulestore_type(course.id) == MONGO_MODULESTORE_TYPE and
-            CourseAuthorization.instructor_email_enabled(course.id)
+    show_email_settings_for = frozenset()
+    if settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL']:
+        show_email_settings_for = frozenset(
+            course_id for course_id in CourseAuthorization.instructor_email_enabled_courses(course_ids)
+            if modulestore().get_modulestore_type(course_id) == MONGO_MODULESTORE_TYPE
         )
-    )
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -461,7 +493,7 @@ def dashboard(request):
     reverifications = reverification_info(course_enrollment_pairs, user, statuses)
 
     show_refund_option_for = frozenset(course.id for course, _enrollment in course_enrollment_pairs
-                                       if _enrollment.refundable())
+                                       if _enrollment.refundable(modes_by_course[course.id]))
 
     # get info w.r.t ExternalAuthMap
     external_auth_map = None
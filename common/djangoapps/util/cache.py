@@ -6,8 +6,12 @@ Note that 'default' is being preserved for user session caching, which we're
 not migrating so as not to inconvenience users by logging them all out.
 """
 from functools import wraps
+import threading
 
 from django.core import cache
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.dispatch import receiver
 
 
 # If we can't find a 'general' CACHE defined in settings.py, we simply fall back
@@ -58,3 +62,64 @@ def cache_if_anonymous(view_func):
             return view_func(request, *args, **kwargs)
 
     return _decorated
+
+
+# Keys to delete again once the current transaction has ended
+_pending_deletes = threading.local()
+
+
+def delete_after_commit(cache_backend, key):
+    """
+    Delete `key` from `cache_backend` now, and again after the current
+    transaction commits.
+
+    Deleting only while the transaction is open would let a concurrent
+    request read the old rows and cache them again before the commit.
+    Outside of a managed transaction, the change is already committed.
+    """
+    cache_backend.delete(key)
+    if transaction.is_managed():
+        if getattr(_pending_deletes, 'keys', None) is None:
+            _pending_deletes.keys = []
+        _pending_deletes.keys.append((cache_backend, key))
+        _delete_pending_keys_with(connections[DEFAULT_DB_ALIAS])
+
+
+def _delete_pending_keys_with(connection):
+    """
+    Make the pending deletes when `connection` next commits or rolls back, in
+    requests, management commands and tasks alike.
+
+    Django has no hook for the end of a transaction, so the connection's
+    commit and rollback are wrapped, once per connection.  Deleting after a
+    rollback too is harmless, and keeps the pending keys from piling up.
+    """
+    for name in ('commit', 'rollback'):
+        method = getattr(connection, name)
+        if not getattr(method, 'deletes_pending_keys', False):
+            setattr(connection, name, _then_delete_pending_keys(method))
+
+
+def _then_delete_pending_keys(method):
+    """
+    Wrap a connection's commit or rollback to make the pending deletes after it.
+    """
+    def _wrapped(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _delete_pending_keys(sender=None)
+    _wrapped.deletes_pending_keys = True
+    return _wrapped
+
+
+@receiver(request_finished)
+def _delete_pending_keys(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Make the deletes delete_after_commit put off.  Also done when a request
+    finishes, in case its transaction was never committed or rolled back.
+    """
+    pending = getattr(_pending_deletes, 'keys', None)
+    _pending_deletes.keys = None
+    for cache_backend, key in pending or ():
+        cache_backend.delete(key)
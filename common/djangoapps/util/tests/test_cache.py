@@ -0,0 +1,69 @@
+"""
+Tests for util.cache
+"""
+from django.core.cache import get_cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase
+from mock import patch
+
+from util.cache import delete_after_commit, _delete_pending_keys  # pylint: disable=protected-access
+
+
+class DeleteAfterCommitTestCase(TestCase):
+    """
+    Tests for delete_after_commit
+    """
+    def setUp(self):
+        self.cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='delete_after_commit')
+        self.addCleanup(self.cache.clear)
+        self.cache.set('key', 'old')
+        # Stand in for the connection's commit and rollback, which would end
+        # the test's transaction
+        self.connection = connections[DEFAULT_DB_ALIAS]
+        for name in ('commit', 'rollback'):
+            patcher = patch.object(self.connection, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def finish_request(self):
+        """
+        Do what finishing the request does, without closing the test's db connection.
+        """
+        _delete_pending_keys(sender=None)
+
+    def test_deletes_again_when_request_finishes(self):
+        delete_after_commit(self.cache, 'key')
+        self.assertIsNone(self.cache.get('key'))
+        # A concurrent request caches what it read before the commit
+        self.cache.set('key', 'old')
+        self.finish_request()
+        self.assertIsNone(self.cache.get('key'))
+        # Later requests aren't affected
+        self.cache.set('key', 'new')
+        self.finish_request()
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_deletes_again_on_commit(self):
+        delete_after_commit(self.cache, 'key')
+        delete_after_commit(self.cache, 'other_key')
+        self.cache.set('key', 'old')
+        self.connection.commit()
+        self.assertIsNone(self.cache.get('key'))
+        # Nothing is left to delete when the request finishes
+        self.cache.set('key', 'new')
+        self.finish_request()
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_deletes_again_on_rollback(self):
+        delete_after_commit(self.cache, 'key')
+        self.cache.set('key', 'old')
+        self.connection.rollback()
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_outside_managed_transaction(self):
+        with patch('util.cache.transaction.is_managed', return_value=False):
+            delete_after_commit(self.cache, 'key')
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', 'new')
+        self.finish_request()
+        self.assertEqual(self.cache.get('key'), 'new')
@@ -13,14 +13,17 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import OrderedDict
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from xml.sax.saxutils import unescape
-from copy import deepcopy
+from copy import deepcopy, Error as CopyError
 
 from capa.correctmap import CorrectMap
 import capa.inputtypes as inputtypes
@@ -59,6 +62,62 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Number of parsed problems kept by ParsedProblemCache
+PARSED_PROBLEM_CACHE_SIZE = 500
+
+
+class ParsedProblemCache(object):
+    """
+    A process-local, least-recently-used cache of parsed problems: the XML tree
+    with its includes processed, and the context computed by its scripts.
+
+    Both only depend on the problem's text and seed, so they're shared by every
+    LoncapaProblem built from the same definition and seed; each problem gets
+    its own copies, so per-student changes stay separate.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return copies of the (tree, context) pair cached for key, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            # reinsert to mark it as the most recently used
+            self._entries[key] = entry
+        tree, context = entry
+        return deepcopy(tree), deepcopy(context)
+
+    def set(self, key, tree, context):
+        """
+        Cache copies of tree and context for key. Contexts which can't be
+        copied, e.g. ones holding modules created by unsandboxed scripts, are
+        not cached.
+        """
+        try:
+            entry = (deepcopy(tree), deepcopy(context))
+        except (TypeError, CopyError):
+            return
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Empty the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+parsed_problems = ParsedProblemCache(PARSED_PROBLEM_CACHE_SIZE)
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -156,14 +215,8 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
-
-        # construct script processor context (eg for customresponse problems)
-        self.context = self._extract_context(self.tree)
+        # sets self.tree and self.context
+        self._load_problem()
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
@@ -444,6 +497,38 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
+    def _load_problem(self):
+        """
+        Parse the problem text into self.tree and compute the script context
+        into self.context, reusing a previous parse of the same problem and
+        seed when there is one.
+        """
+        problem_text = self.problem_text
+        if isinstance(problem_text, unicode):
+            problem_text = problem_text.encode('utf-8')
+        key = (
+            self.problem_id,
+            hashlib.sha1(problem_text).hexdigest(),
+            self.seed,
+            self.capa_system.can_execute_unsafe_code(),
+            getattr(self.capa_system.filestore, 'root_path', None),
+        )
+        cached = parsed_problems.get(key)
+        if cached is not None:
+            self.tree, self.context = cached
+            return
+
+        # parse problem XML file into an element tree
+        self.tree = etree.XML(self.problem_text)
+
+        # handle any <include file="foo"> tags
+        self._process_includes()
+
+        # construct script processor context (eg for customresponse problems)
+        self.context = self._extract_context(self.tree)
+
+        parsed_problems.set(key, self.tree, self.context)
+
     def _process_includes(self):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
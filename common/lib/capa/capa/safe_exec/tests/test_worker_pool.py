@@ -0,0 +1,143 @@
+"""Test worker_pool.py"""
+
+import os.path
+import textwrap
+import threading
+import unittest
+
+from nose.plugins.skip import SkipTest
+
+from capa.safe_exec import safe_exec, configure_worker_pool
+from capa.safe_exec.worker_pool import SandboxWorkerPool, local_launcher, jailed_launcher
+from codejail.jail_code import is_configured
+from codejail.safe_exec import SafeExecException
+
+
+class TestSandboxWorkerPool(unittest.TestCase):
+    """
+    Test running code in a pool of local workers.
+    """
+    def setUp(self):
+        super(TestSandboxWorkerPool, self).setUp()
+        self.pool = SandboxWorkerPool(2, launcher=local_launcher, cpu=0, realtime=5)
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {'b': 3}
+        self.pool.safe_exec("a = b * 2", g)
+        self.assertEqual(g, {'a': 6, 'b': 3})
+
+    def test_warm_imports(self):
+        g = {}
+        self.pool.safe_exec("import sys; a = 'math' in sys.modules", g)
+        self.assertTrue(g['a'])
+
+    def test_printing(self):
+        g = {}
+        self.pool.safe_exec("print 'hello'; a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", cm.exception.message)
+
+    def test_python_lib(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        g = {}
+        self.pool.safe_exec("import constant; a = constant.THE_CONST", g, python_path=[pylib])
+        self.assertEqual(g['a'], 23)
+
+    def test_workers_are_single_use(self):
+        g = {}
+        for _ in xrange(3):
+            self.pool.safe_exec("import math; a = hasattr(math, 'touched'); math.touched = True", g)
+            self.assertFalse(g['a'])
+
+    def test_workers_are_kept_warm(self):
+        self.pool.safe_exec("a = 1", {})
+        self.assertEqual(self.pool._idle.qsize(), 2)  # pylint: disable=protected-access
+
+    def test_realtime_limit(self):
+        pool = SandboxWorkerPool(1, launcher=local_launcher, cpu=0, realtime=0.5)
+        self.addCleanup(pool.close)
+        with self.assertRaises(SafeExecException):
+            pool.safe_exec("while True: pass", {})
+
+    def test_concurrent_fills_dont_overfill(self):
+        threads = [threading.Thread(target=self.pool._fill) for _ in xrange(5)]  # pylint: disable=protected-access
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.pool._idle.qsize(), 2)  # pylint: disable=protected-access
+
+
+class TestJailedWorkers(unittest.TestCase):
+    """
+    Test that jailed workers are as confined as codejail's own processes.
+    """
+    def setUp(self):
+        super(TestJailedWorkers, self).setUp()
+        # Can't test confinement if CodeJail isn't configured for python.
+        if not is_configured("python"):
+            raise SkipTest
+        self.pool = SandboxWorkerPool(1, launcher=jailed_launcher)
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {'b': 3}
+        self.pool.safe_exec("a = b * 2", g)
+        self.assertEqual(g['a'], 6)
+
+    def test_cant_do_something_forbidden(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("import os; files = os.listdir('/')", {})
+        self.assertIn("Permission denied", cm.exception.message)
+
+    def test_cant_fork(self):
+        g = {}
+        self.pool.safe_exec(textwrap.dedent("""\
+            import os
+            try:
+                pid = os.fork()
+            except OSError:
+                forked = False
+            else:
+                if pid == 0:
+                    os._exit(0)
+                forked = True
+            """), g)
+        self.assertFalse(g['forked'])
+
+    def test_cant_write_files(self):
+        with self.assertRaises(SafeExecException):
+            self.pool.safe_exec("f = open('out.txt', 'w'); f.write('x' * 100); f.close()", {})
+
+    def test_realtime_limit(self):
+        pool = SandboxWorkerPool(1, launcher=jailed_launcher, cpu=0, realtime=0.5)
+        self.addCleanup(pool.close)
+        with self.assertRaises(SafeExecException):
+            pool.safe_exec("while True: pass", {})
+
+
+class TestSafeExecWithPool(unittest.TestCase):
+    """
+    Test that safe_exec uses a configured pool.
+    """
+    def setUp(self):
+        super(TestSafeExecWithPool, self).setUp()
+        configure_worker_pool(1, launcher=local_launcher, cpu=0, realtime=5)
+        self.addCleanup(configure_worker_pool, 0)
+
+    def test_assumed_imports(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g)
+        self.assertEqual(g['a'], 3)
+
+    def test_random_seeding(self):
+        g = {}
+        safe_exec("rnums = [random.randint(0, 999) for _ in xrange(10)]", g, random_seed=17)
+        first = g['rnums']
+        safe_exec("rnums = [random.randint(0, 999) for _ in xrange(10)]", g, random_seed=17)
+        self.assertEqual(g['rnums'], first)
@@ -0,0 +1,351 @@
+"""
+A pool of warm sandbox workers for safe_exec.
+
+Starting a sandboxed Python process and importing numpy in it costs more
+than running most problem code.  A SandboxWorkerPool keeps processes that
+have already started and imported the common modules, waiting for code to
+run on their stdin.
+
+Each worker runs exactly one piece of code and is then thrown away, so
+executions are as isolated from each other as with a new process per
+execution: only process start and imports are done ahead of time.  Workers
+are started with the same command and resource limits as codejail uses, and
+the CPU limit only starts counting once the worker is warm.
+
+Without codejail configured, workers are plain local Python processes.  That
+is no less safe than codejail's own fallback of running code in-process, and
+lets the pool be used and tested in development.
+"""
+import atexit
+import json
+import logging
+import os
+import os.path
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import Queue
+
+from codejail.safe_exec import json_safe, SafeExecException
+
+log = logging.getLogger(__name__)
+
+# Modules imported by workers while they wait for code, see LAZY_IMPORTS
+WARM_IMPORTS = ("math", "random", "numpy")
+
+# The script run by every worker.  argv[1] is the CPU seconds allowed for the
+# code, 0 for no limit.  The code, its globals and python path are read as
+# JSON from stdin, and the JSON-able globals written to stdout afterwards.
+WORKER_PY = """\
+import json
+import math
+import resource
+import sys
+from StringIO import StringIO
+
+for name in %(warm_imports)r:
+    try:
+        __import__(name)
+    except Exception:
+        pass
+
+cpu = int(sys.argv[1])
+if cpu:
+    # The code gets its own budget of CPU time, however long warming up took
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = int(math.ceil(usage.ru_utime + usage.ru_stime)) + cpu
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, limit))
+
+code, g_dict, python_path = json.load(sys.stdin)
+sys.path.extend(python_path)
+
+stdout = sys.stdout
+sys.stdout = StringIO()
+exec code in g_dict
+sys.stdout = stdout
+
+ok_types = (type(None), int, long, float, str, unicode, list, tuple, dict)
+bad_keys = ("__builtins__",)
+def jsonable(v):
+    if not isinstance(v, ok_types):
+        return False
+    try:
+        json.dumps(v)
+    except Exception:
+        return False
+    return True
+g_dict = {k: v for k, v in g_dict.iteritems() if jsonable(v) and k not in bad_keys}
+stdout.write(json.dumps(g_dict))
+"""
+
+# Extra CPU seconds a jailed worker may use to start and warm up
+WARMUP_CPU = 5
+
+
+def local_launcher(workdir, script, cpu):
+    """
+    Start a worker as an ordinary local Python process.  It isn't sandboxed,
+    but gets its own process group like a jailed worker.
+    """
+    return subprocess.Popen(
+        [sys.executable, '-E', '-B', script, str(cpu)],
+        cwd=workdir, env={}, close_fds=True, preexec_fn=os.setsid,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+
+
+def jailed_launcher(workdir, script, cpu):
+    """
+    Start a worker the way codejail runs code: with the configured sandbox
+    Python, as the sandbox user, and under codejail's resource limits.
+    """
+    from codejail import jail_code
+    import resource
+
+    def set_process_limits():
+        """
+        Set the limits of the worker process, before it starts.
+
+        This is codejail's jail_code.set_process_limits, except that the CPU
+        limit leaves room for warming up: the worker lowers it to its CPU
+        usage plus `cpu` once it's warm.
+        """
+        # A new session, so that the worker and anything it starts can be
+        # killed together.
+        os.setsid()
+
+        # No subprocesses or files.
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+        fsize = jail_code.LIMITS.get("FSIZE", 0)
+        resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+
+        if cpu:
+            limit = cpu + WARMUP_CPU
+            resource.setrlimit(resource.RLIMIT_CPU, (limit, limit + 1))
+
+        vmem = jail_code.LIMITS.get("VMEM")
+        if vmem:
+            resource.setrlimit(resource.RLIMIT_AS, (vmem, vmem))
+
+    cmd = list(jail_code.COMMANDS["python"]["cmdline_start"]) + [script, str(cpu)]
+    return subprocess.Popen(
+        cmd, cwd=workdir, env={}, close_fds=True, preexec_fn=set_process_limits,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+
+
+def default_launcher(workdir, script, cpu):
+    """
+    Start a jailed worker if codejail is configured, a local one otherwise.
+    """
+    from codejail import jail_code
+    if jail_code.is_configured("python"):
+        return jailed_launcher(workdir, script, cpu)
+    return local_launcher(workdir, script, cpu)
+
+
+class SandboxWorker(object):
+    """
+    A started Python process in its own temporary directory, waiting to run
+    one piece of code.
+    """
+    def __init__(self, launcher, cpu, warm_imports=WARM_IMPORTS):
+        self.workdir = tempfile.mkdtemp(prefix='codejail-')
+        # The sandbox user needs to be able to read the directory.
+        os.chmod(self.workdir, 0775)
+        with open(os.path.join(self.workdir, "worker.py"), "w") as script:
+            script.write(WORKER_PY % {'warm_imports': tuple(warm_imports)})
+        self.process = launcher(self.workdir, "worker.py", cpu)
+
+    def is_alive(self):
+        """
+        Returns whether the worker is still waiting for code.
+        """
+        return self.process.poll() is None
+
+    def run(self, code, globals_dict, python_path=None, realtime=None):
+        """
+        Run `code` with `globals_dict` in the worker, like
+        codejail.safe_exec.safe_exec.
+
+        The directories in `python_path` are copied to the worker's directory
+        and added to its path.  If the code takes more than `realtime`
+        seconds, the worker is killed.
+        """
+        worker_path = []
+        for pydir in python_path or ():
+            pybase = os.path.basename(pydir)
+            shutil.copytree(pydir, os.path.join(self.workdir, pybase))
+            worker_path.append(pybase)
+
+        stdin = json.dumps([code, json_safe(globals_dict), worker_path])
+        killer = None
+        if realtime:
+            killer = threading.Timer(realtime, self._kill)
+            killer.start()
+        try:
+            stdout, stderr = self.process.communicate(stdin)
+        finally:
+            if killer is not None:
+                killer.cancel()
+
+        if self.process.returncode != 0:
+            raise SafeExecException("Couldn't execute jailed code: %s" % stderr)
+        globals_dict.update(json.loads(stdout))
+
+    def _kill(self):
+        """
+        Stop the worker and any processes it started, if it's still running.
+        """
+        if not self.is_alive():
+            return
+        try:
+            pgid = os.getpgid(self.process.pid)
+            if pgid != os.getpgrp():
+                os.killpg(pgid, signal.SIGKILL)
+            else:
+                # Not in a group of its own: don't kill ourselves with it.
+                self.process.kill()
+        except OSError:
+            pass
+
+    def close(self):
+        """
+        Stop the worker and remove its directory.
+        """
+        self._kill()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxWorkerPool(object):
+    """
+    Keeps `size` SandboxWorkers warm, and runs code in them.
+
+    `launcher` is a function(workdir, script, cpu) starting a worker process,
+    see local_launcher and jailed_launcher.  `cpu` and `realtime` are the CPU
+    and real time limits in seconds of a single execution, 0 for none; they
+    default to codejail's.
+    """
+    def __init__(self, size, launcher=default_launcher, cpu=None, realtime=None, warm_imports=WARM_IMPORTS):
+        self.size = size
+        self.launcher = launcher
+        self.cpu = cpu
+        self.realtime = realtime
+        self.warm_imports = warm_imports
+        self._idle = Queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _limits(self):
+        """
+        The CPU and real time limits of an execution.
+        """
+        cpu, realtime = self.cpu, self.realtime
+        if cpu is None or realtime is None:
+            from codejail import jail_code
+            if cpu is None:
+                cpu = jail_code.LIMITS.get("CPU", 0)
+            if realtime is None:
+                realtime = jail_code.LIMITS.get("REALTIME", 0)
+        return cpu or 0, realtime or 0
+
+    def _start_worker(self):
+        """
+        Start a new worker.
+        """
+        return SandboxWorker(self.launcher, self._limits()[0], self.warm_imports)
+
+    def _fill(self):
+        """
+        Start workers until `size` of them are waiting.
+        """
+        if os.getpid() != self._pid:
+            # We were forked: the workers belong to the parent process.
+            self._idle = Queue.Queue()
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        # Concurrent requests would each see the same shortfall otherwise.
+        with self._lock:
+            while self._idle.qsize() < self.size:
+                self._idle.put(self._start_worker())
+
+    def _get_worker(self):
+        """
+        Take a live warm worker, or start one if none are left.
+        """
+        self._fill()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Queue.Empty:
+                return self._start_worker()
+            if worker.is_alive():
+                return worker
+            log.warning("Discarding sandbox worker that died while waiting: %s", worker.process.stderr.read())
+            worker.close()
+
+    def safe_exec(self, code, globals_dict, python_path=None, slug=None):
+        """
+        Execute code in a warm worker, with the same interface and results as
+        codejail.safe_exec.safe_exec.
+        """
+        worker = self._get_worker()
+        # Start the worker's replacement now, so it warms up while this one runs
+        self._fill()
+        if slug:
+            log.debug("Executing jailed code %s in worker %s", slug, worker.process.pid)
+        try:
+            worker.run(code, globals_dict, python_path=python_path, realtime=self._limits()[1])
+        finally:
+            worker.close()
+
+    def close(self):
+        """
+        Stop all the waiting workers.
+        """
+        if os.getpid() != self._pid:
+            # The workers belong to the process we were forked from.
+            return
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Queue.Empty:
+                return
+            worker.close()
+
+
+# The pool used by capa's safe_exec, or None to start a new process per execution
+_POOL = None
+
+
+def configure_worker_pool(size, **kwargs):
+    """
+    Make safe_exec run code in a pool of `size` warm workers.  A size of 0
+    turns the pool off.  Other arguments are passed to SandboxWorkerPool.
+
+    Workers are only started when code is first run, so this can be called
+    before codejail is configured, and before forking server processes.
+    """
+    global _POOL  # pylint: disable=global-statement
+    if _POOL is not None:
+        _POOL.close()
+    _POOL = SandboxWorkerPool(size, **kwargs) if size else None
+
+
+@atexit.register
+def _close_worker_pool():
+    """
+    Don't leave waiting workers behind when the process exits.
+    """
+    if _POOL is not None:
+        _POOL.close()
+
+
+def get_worker_pool():
+    """
+    Returns the configured SandboxWorkerPool, or None.
+    """
+    return _POOL
@@ -0,0 +1,56 @@
+"""
+Tests for the caching of parsed problems in capa_problem.
+"""
+import textwrap
+import unittest
+
+import mock
+
+from capa import capa_problem
+from . import test_capa_system, new_loncapa_problem
+
+
+class ParsedProblemCacheTest(unittest.TestCase):
+    """
+    Test that problems are parsed and their scripts run once per definition and seed.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+        <script type="loncapa/python">
+        answer = 42
+        </script>
+        <p>What is the answer? ($answer)</p>
+        <stringresponse answer="$answer">
+            <textline size="20"/>
+        </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        capa_problem.parsed_problems.clear()
+        self.addCleanup(capa_problem.parsed_problems.clear)
+
+    def test_scripts_run_once(self):
+        with mock.patch('capa.capa_problem.safe_exec', wraps=capa_problem.safe_exec) as mock_safe_exec:
+            first = new_loncapa_problem(self.xml)
+            second = new_loncapa_problem(self.xml)
+        self.assertEqual(mock_safe_exec.call_count, 1)
+        self.assertEqual(first.context['answer'], 42)
+        self.assertEqual(second.context['answer'], 42)
+        self.assertEqual(first.get_html(), second.get_html())
+
+    def test_problems_are_independent(self):
+        first = new_loncapa_problem(self.xml)
+        first.context['answer'] = 0
+        first.tree.set('changed', 'true')
+
+        second = new_loncapa_problem(self.xml)
+        self.assertEqual(second.context['answer'], 42)
+        self.assertIsNone(second.tree.get('changed'))
+
+    def test_seed_is_part_of_key(self):
+        with mock.patch('capa.capa_problem.safe_exec', wraps=capa_problem.safe_exec) as mock_safe_exec:
+            new_loncapa_problem(self.xml)
+            capa_problem.LoncapaProblem(self.xml, id='1', seed=1, capa_system=test_capa_system())
+        self.assertEqual(mock_safe_exec.call_count, 2)
@@ -3,6 +3,9 @@ XASSET_SRCREF_PREFIX = 'xasset:'
 
 XASSET_THUMBNAIL_TAIL_NAME = '.jpg'
 
+# Attributes of stored assets that are not exported to the assets policy
+ASSET_POLICY_EXCLUDED_ATTRIBUTES = ('_id', 'md5', 'uploadDate', 'length', 'chunkSize')
+
 import os
 import logging
 import StringIO
@@ -8,7 +8,7 @@ from xmodule.contentstore.content import XASSET_LOCATION_TAG
 
 import logging
 
-from .content import StaticContent, ContentStore, StaticContentStream
+from .content import StaticContent, ContentStore, StaticContentStream, ASSET_POLICY_EXCLUDED_ATTRIBUTES
 from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
 import os
@@ -134,7 +134,7 @@ class MongoContentStore(ContentStore):
             asset_location = Location(asset['_id'])
             self.export(asset_location, output_directory)
             for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize']:
+                if attr not in ASSET_POLICY_EXCLUDED_ATTRIBUTES:
                     policy.setdefault(asset_location.name, {})[attr] = value
 
         with open(assets_policy_file, 'w') as f:
@@ -10,7 +10,7 @@ from collections import namedtuple
 
 from abc import ABCMeta, abstractmethod
 
-from .exceptions import InvalidLocationError, InsufficientSpecificationError
+from .exceptions import InvalidLocationError, InsufficientSpecificationError, ItemNotFoundError
 from xmodule.errortracker import make_error_tracker
 
 log = logging.getLogger('edx.modulestore')
@@ -282,6 +282,28 @@ class Location(_LocationBase):
         return self._replace(**kwargs)
 
 
+class CourseSummary(object):
+    """
+    The few fields of a course needed to list it, available without loading
+    the course's descriptor.
+    """
+    def __init__(self, location, display_name, display_organization=None, display_coursenumber=None):
+        self.location = Location(location)
+        self.display_name = display_name
+        self.display_org_with_default = display_organization or self.location.org
+        self.display_number_with_default = display_coursenumber or self.location.course
+
+    @property
+    def id(self):  # pylint: disable=invalid-name
+        """
+        The course_id of the course, as on CourseDescriptor
+        """
+        return self.location.course_id
+
+    def __repr__(self):
+        return "CourseSummary({0})".format(self.location.url())
+
+
 class ModuleStoreRead(object):
     """
     An abstract interface for a database backend that stores XModuleDescriptor
@@ -505,6 +527,67 @@ class ModuleStoreReadBase(ModuleStoreRead):
         """
         return {}
 
+    def get_course_version(self, course_id):
+        """
+        Returns an opaque token that changes whenever content in the course changes,
+        or None if this modulestore can't tell when a course changes.
+
+        Data derived from a course (e.g. indexes over its structure) can be keyed
+        on this token instead of being invalidated explicitly.
+        """
+        return None
+
+    def get_catalog_version(self):
+        """
+        Returns an opaque token that changes whenever a course is added to,
+        changed in or removed from this modulestore, or None if this modulestore
+        can't tell when its courses change.
+
+        Only changes to the course items themselves, not to their descendants,
+        need to change the token, so that listings of courses can be keyed on it.
+        """
+        return None
+
+    def get_course_summaries(self, course_numbers=None):
+        """
+        Returns a list of CourseSummaries of the courses in this modulestore.
+
+        course_numbers: if given, only courses whose location.course is one of
+            these are returned.  Numbers are matched case-insensitively, as
+            they are when derived from (lowercased) role group names.
+
+        Default impl--summarizes the descriptors from get_courses; stores that
+        can read the fields directly should override it.
+        """
+        if course_numbers is not None:
+            course_numbers = set(number.lower() for number in course_numbers)
+        return [
+            CourseSummary(
+                course.location, course.display_name,
+                getattr(course, 'display_organization', None),
+                getattr(course, 'display_coursenumber', None),
+            )
+            for course in self.get_courses()
+            if course_numbers is None or course.location.course.lower() in course_numbers
+        ]
+
+    def get_course_instances(self, course_ids, depth=0):
+        """
+        Returns a dict mapping each of `course_ids` that is in this modulestore
+        to its course descriptor.  Ids of courses that don't exist are left out.
+
+        Default impl--loads the courses one at a time; stores that can fetch
+        several courses in one query should override it.
+        """
+        courses = {}
+        for course_id in course_ids:
+            org, course, run = course_id.split('/')
+            try:
+                courses[course_id] = self.get_instance(course_id, Location('i4x', org, course, 'course', run), depth)
+            except ItemNotFoundError:
+                pass
+        return courses
+
     def get_course(self, course_id):
         """Default impl--linear search through course list"""
         for c in self.get_courses():
@@ -1,8 +1,10 @@
 '''
 Method for converting among our differing Location/Locator whatever reprs
 '''
+from collections import OrderedDict
 from random import randint
 import re
+import threading
 import pymongo
 import bson.son
 
@@ -12,6 +14,53 @@ from xmodule.modulestore import Location
 import urllib
 
 
+class LocalCache(object):
+    """
+    A bounded, least-recently-used, process-local cache.
+
+    LocMapperStore keeps one in front of its (typically shared) cache so that
+    the mappings of the courses in use don't cost a round trip per lookup.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """
+        Return a dict of the cached values of keys, omitting the missing ones
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.pop(key, None)
+                if value is not None:
+                    # reinsert to mark it as the most recently used
+                    self._entries[key] = value
+                    found[key] = value
+        return found
+
+    def set_many(self, entries):
+        """
+        Cache all the key, value pairs in entries, evicting the least recently used ones
+        """
+        if self.size <= 0:
+            return
+        with self._lock:
+            for key, value in entries.iteritems():
+                self._entries.pop(key, None)
+                self._entries[key] = value
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Empty the cache
+        """
+        with self._lock:
+            self._entries.clear()
+
+
 class LocMapperStore(object):
     '''
     This store persists mappings among the addressing schemes. At this time, it's between the old i4x Location
@@ -27,12 +76,18 @@ class LocMapperStore(object):
     or dominant store, but that's not a requirement. This store creates its own connection.
     '''
 
+    # number of translations kept in the process-local cache
+    LOCAL_CACHE_SIZE = 20000
+
     def __init__(
         self, cache, host, db, collection, port=27017, user=None, password=None,
-        **kwargs
+        local_cache_size=LOCAL_CACHE_SIZE, **kwargs
     ):
         '''
         Constructor
+
+        :param cache: the django cache shared by the processes using this store
+        :param local_cache_size: the number of cache entries to also keep in this process, 0 to disable
         '''
         self.db = pymongo.database.Database(
             pymongo.MongoClient(
@@ -49,6 +104,7 @@ class LocMapperStore(object):
         self.location_map = self.db[collection + '.location_map']
         self.location_map.write_concern = {'w': 1}
         self.cache = cache
+        self.local_cache = LocalCache(local_cache_size)
 
     # location_map functions
     def create_map_entry(self, course_location, package_id=None, draft_branch='draft', prod_branch='published',
@@ -128,14 +184,85 @@ class LocMapperStore(object):
         NOTE: unlike old mongo, draft branches contain the whole course; so, it applies to all category
         of locations including course.
         """
-        location_id = self._interpret_location_course_id(old_style_course_id, location)
+        return self.translate_locations(
+            old_style_course_id, [location], published, add_entry_if_missing
+        )[location]
+
+    def translate_locations(self, old_style_course_id, locations, published=True, add_entry_if_missing=True):
+        """
+        Translate many module locations of the same course to Locators at once. The course's map entry is read
+        at most once, all new block ids are persisted in one update, and the cache is read and filled with
+        one get_many and one set_many.
+
+        Returns a dict mapping each location to its Locator.
+
+        See translate_location for the parameters and the exceptions raised; all of locations must be in
+        the course identified by old_style_course_id (or by the first location if that's None).
+        """
+        locations = list(locations)
+        if not locations:
+            return {}
+        location_id = self._interpret_location_course_id(old_style_course_id, locations[0])
         if old_style_course_id is None:
             old_style_course_id = self._generate_location_course_id(location_id)
 
-        cached_value = self._get_locator_from_cache(old_style_course_id, location, published)
-        if cached_value:
-            return cached_value
+        cache_keys = dict(
+            (location, self._locator_cache_key(old_style_course_id, location)) for location in locations
+        )
+        cached = self._cache_get_many(cache_keys.values())
+        result = {}
+        missing = []
+        for location in locations:
+            entry = cached.get(cache_keys[location])
+            if entry is not None:
+                result[location] = entry[0] if published else entry[1]
+            else:
+                missing.append(location)
+        if not missing:
+            return result
 
+        entry = self._find_map_entry(location_id, missing[0], add_entry_if_missing)
+        block_map = entry['block_map']
+        block_map_changed = False
+        setmany = {}
+        for location in missing:
+            block_id = block_map.get(self.encode_key_for_mongo(location.name))
+            if block_id is None:
+                if not add_entry_if_missing:
+                    raise ItemNotFoundError(location)
+                block_id = self._assign_block_id(location, block_map)
+                block_map_changed = True
+            elif isinstance(block_id, dict):
+                # name is not unique, look through for the right category
+                if location.category in block_id:
+                    block_id = block_id[location.category]
+                elif add_entry_if_missing:
+                    block_id = self._assign_block_id(location, block_map)
+                    block_map_changed = True
+                else:
+                    raise ItemNotFoundError()
+            else:
+                raise InvalidLocationError()
+
+            published_usage = BlockUsageLocator(
+                package_id=entry['course_id'], branch=entry['prod_branch'], block_id=block_id)
+            draft_usage = BlockUsageLocator(
+                package_id=entry['course_id'], branch=entry['draft_branch'], block_id=block_id)
+            result[location] = published_usage if published else draft_usage
+            setmany.update(
+                self._location_map_cache_entries(old_style_course_id, location, published_usage, draft_usage)
+            )
+
+        if block_map_changed:
+            self.location_map.update(location_id, {'$set': {'block_map': block_map}})
+        self._cache_set_many(setmany)
+        return result
+
+    def _find_map_entry(self, location_id, location, add_entry_if_missing):
+        """
+        Find the map entry for location_id, creating it from location if there's none and
+        add_entry_if_missing. If more than one entry matches, prefers the one w/o a name.
+        """
         maps = self.location_map.find(location_id)
         maps = list(maps)
         if len(maps) == 0:
@@ -143,47 +270,17 @@ class LocMapperStore(object):
                 # create a new map
                 course_location = location.replace(category='course', name=location_id['_id']['name'])
                 self.create_map_entry(course_location)
-                entry = self.location_map.find_one(location_id)
+                return self.location_map.find_one(location_id)
             else:
                 raise ItemNotFoundError()
         elif len(maps) == 1:
-            entry = maps[0]
+            return maps[0]
         else:
             # find entry w/o name, if any; otherwise, pick arbitrary
-            entry = maps[0]
             for item in maps:
                 if 'name' not in item['_id']:
-                    entry = item
-                    break
-
-        block_id = entry['block_map'].get(self.encode_key_for_mongo(location.name))
-        if block_id is None:
-            if add_entry_if_missing:
-                block_id = self._add_to_block_map(location, location_id, entry['block_map'])
-            else:
-                raise ItemNotFoundError(location)
-        elif isinstance(block_id, dict):
-            # name is not unique, look through for the right category
-            if location.category in block_id:
-                block_id = block_id[location.category]
-            elif add_entry_if_missing:
-                block_id = self._add_to_block_map(location, location_id, entry['block_map'])
-            else:
-                raise ItemNotFoundError()
-        else:
-            raise InvalidLocationError()
-
-        published_usage = BlockUsageLocator(
-            package_id=entry['course_id'], branch=entry['prod_branch'], block_id=block_id)
-        draft_usage = BlockUsageLocator(
-            package_id=entry['course_id'], branch=entry['draft_branch'], block_id=block_id)
-        if published:
-            result = published_usage
-        else:
-            result = draft_usage
-
-        self._cache_location_map_entry(old_style_course_id, location, published_usage, draft_usage)
-        return result
+                    return item
+            return maps[0]
 
     def translate_locator_to_location(self, locator, get_course=False):
         """
@@ -218,6 +315,7 @@ class LocMapperStore(object):
             return None
         result = None
         for candidate in maps:
+            setmany = {}
             if get_course and 'name' in candidate['_id']:
                 candidate_id = candidate['_id']
                 return Location(
@@ -243,12 +341,15 @@ class LocMapperStore(object):
                     draft_locator = BlockUsageLocator(
                         candidate['course_id'], branch=candidate['draft_branch'], block_id=block_id
                     )
-                    self._cache_location_map_entry(old_course_id, location, published_locator, draft_locator)
+                    setmany.update(self._location_map_cache_entries(
+                        old_course_id, location, published_locator, draft_locator
+                    ))
 
                     if get_course and category == 'course':
                         result = location
                     elif not get_course and block_id == locator.block_id:
                         result = location
+            self._cache_set_many(setmany)
             if result is not None:
                 return result
         return None
@@ -287,8 +388,8 @@ class LocMapperStore(object):
         else:
             return draft_course_locator
 
-    def _add_to_block_map(self, location, location_id, block_map):
-        '''add the given location to the block_map and persist it'''
+    def _assign_block_id(self, location, block_map):
+        '''add the given location to the block_map w/o persisting it and return its new block_id'''
         if self._block_id_is_guid(location.name):
             # This makes the ids more meaningful with a small probability of name collision.
             # The downside is that if there's more than one course mapped to from the same org/course root
@@ -301,7 +402,6 @@ class LocMapperStore(object):
             block_id = self._verify_uniqueness(location.name, block_map)
         encoded_location_name = self.encode_key_for_mongo(location.name)
         block_map.setdefault(encoded_location_name, {})[location.category] = block_id
-        self.location_map.update(location_id, {'$set': {'block_map': block_map}})
         return block_id
 
     def _interpret_location_course_id(self, course_id, location):
@@ -387,17 +487,39 @@ class LocMapperStore(object):
         """
         return urllib.unquote(fieldname)
 
-    def _get_locator_from_cache(self, old_course_id, location, published):
+    def _cache_get_many(self, keys):
         """
-        See if the location x published pair is in the cache. If so, return the mapped locator.
+        Get the values of keys from the local cache, falling back to the shared cache for the ones it lacks.
+        Returns a dict omitting the keys which are in neither.
         """
-        entry = self.cache.get(u'{}+{}'.format(old_course_id, location.url()))
-        if entry is not None:
-            if published:
-                return entry[0]
-            else:
-                return entry[1]
-        return None
+        found = self.local_cache.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.cache.get_many(missing)
+            self.local_cache.set_many(shared)
+            found.update(shared)
+        return found
+
+    def _cache_get(self, key):
+        """
+        Get the value of key from the local cache or the shared one, or None
+        """
+        return self._cache_get_many([key]).get(key)
+
+    def _cache_set_many(self, entries):
+        """
+        Set entries in both the shared and the local cache
+        """
+        if entries:
+            self.cache.set_many(entries)
+            self.local_cache.set_many(entries)
+
+    @staticmethod
+    def _locator_cache_key(old_course_id, location):
+        """
+        The cache key of the (published, draft) Locators of location
+        """
+        return u'{}+{}'.format(old_course_id, location.url())
 
     def _get_course_locator_from_cache(self, old_course_id, published):
         """
@@ -405,7 +527,7 @@ class LocMapperStore(object):
         """
         if not old_course_id:
             return None
-        entry = self.cache.get(old_course_id)
+        entry = self._cache_get(old_course_id)
         if entry is not None:
             if published:
                 return entry[0].as_course_locator()
@@ -416,14 +538,14 @@ class LocMapperStore(object):
         """
         See if the locator is in the cache. If so, return the mapped location.
         """
-        return self.cache.get(unicode(locator))
+        return self._cache_get(unicode(locator))
 
     def _get_course_location_from_cache(self, locator_package_id):
         """
         See if the package_id is in the cache. If so, return the mapped location to the
         course root.
         """
-        return self.cache.get(u'courseId+{}'.format(locator_package_id))
+        return self._cache_get(u'courseId+{}'.format(locator_package_id))
 
     def _cache_course_locator(self, old_course_id, published_course_locator, draft_course_locator):
         """
@@ -431,12 +553,12 @@ class LocMapperStore(object):
         """
         if not old_course_id:
             return
-        self.cache.set(old_course_id, (published_course_locator, draft_course_locator))
+        self._cache_set_many({old_course_id: (published_course_locator, draft_course_locator)})
 
-    def _cache_location_map_entry(self, old_course_id, location, published_usage, draft_usage):
+    def _location_map_cache_entries(self, old_course_id, location, published_usage, draft_usage):
         """
-        Cache the mapping from location to the draft and published Locators in entry.
-        Also caches the inverse. If the location is category=='course', it caches it for
+        Return the cache entries for the mapping from location to the draft and published Locators.
+        Includes the inverse. If the location is category=='course', includes it for
         the get_course query
         """
         setmany = {}
@@ -444,6 +566,6 @@ class LocMapperStore(object):
             setmany[u'courseId+{}'.format(published_usage.package_id)] = location
         setmany[unicode(published_usage)] = location
         setmany[unicode(draft_usage)] = location
-        setmany[u'{}+{}'.format(old_course_id, location.url())] = (published_usage, draft_usage)
+        setmany[self._locator_cache_key(old_course_id, location)] = (published_usage, draft_usage)
         setmany[old_course_id] = (published_usage, draft_usage)
-        self.cache.set_many(setmany)
+        return setmany
@@ -6,6 +6,8 @@ In this way, courses can be served up both - say - XMLModuleStore or MongoModule
 IMPORTANT: This modulestore only supports READONLY applications, e.g. LMS
 """
 
+from collections import defaultdict
+
 from . import ModuleStoreWriteBase
 from xmodule.modulestore.django import create_modulestore_instance
 import logging
@@ -124,12 +126,56 @@ class MixedModuleStore(ModuleStoreWriteBase):
 
         return courses
 
+    def get_course_summaries(self, course_numbers=None):
+        """
+        Returns a list of CourseSummaries of the courses in this modulestore,
+        surfacing the same courses as get_courses.
+        """
+        summaries = []
+        for key, store in self.modulestores.iteritems():
+            for summary in store.get_course_summaries(course_numbers):
+                if key == 'default' or key == self.mappings.get(summary.location.course_id, 'default'):
+                    summaries.append(summary)
+        return summaries
+
+    def get_course_instances(self, course_ids, depth=0):
+        """
+        Returns a dict mapping each of `course_ids` that exists to its course
+        descriptor, asking each modulestore for all its courses at once.
+        """
+        course_ids_by_store = defaultdict(list)
+        for course_id in course_ids:
+            course_ids_by_store[self.mappings.get(course_id, 'default')].append(course_id)
+        courses = {}
+        for key, store_course_ids in course_ids_by_store.iteritems():
+            courses.update(self.modulestores[key].get_course_instances(store_course_ids, depth))
+        return courses
+
     def get_course(self, course_id):
         """
         returns the course module associated with the course_id
         """
         return self._get_modulestore_for_courseid(course_id).get_course(course_id)
 
+    def get_course_version(self, course_id):
+        """
+        returns the current version token of the course with the given course_id
+        """
+        return self._get_modulestore_for_courseid(course_id).get_course_version(course_id)
+
+    def get_catalog_version(self):
+        """
+        returns a token that changes whenever the courses of any of the modulestores change,
+        or None if one of them can't tell
+        """
+        versions = []
+        for key in sorted(self.modulestores):
+            version = self.modulestores[key].get_catalog_version()
+            if version is None:
+                return None
+            versions.append(version)
+        return u'.'.join(versions)
+
     def get_parent_locations(self, location, course_id):
         """
         returns the parent locations for a given lcoation and course_id
@@ -16,6 +16,8 @@ import pymongo
 import sys
 import logging
 import copy
+import re
+from uuid import uuid4
 
 from bson.son import SON
 from fs.osfs import OSFS
@@ -30,7 +32,7 @@ from xblock.runtime import KvsFieldData
 from xblock.exceptions import InvalidScopeError
 from xblock.fields import Scope, ScopeIds
 
-from xmodule.modulestore import ModuleStoreWriteBase, Location, MONGO_MODULESTORE_TYPE
+from xmodule.modulestore import ModuleStoreWriteBase, Location, MONGO_MODULESTORE_TYPE, CourseSummary
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import own_metadata, InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
 from xmodule.modulestore.xml import LocationReader
@@ -254,6 +256,15 @@ def metadata_cache_key(location):
     return u"{0.org}/{0.course}".format(location)
 
 
+def course_version_cache_key(location):
+    """Turn a `Location` into the cache key of its course's version token."""
+    return u"{0.org}/{0.course}/version".format(location)
+
+
+# The cache key of the version token of the courses in the store
+CATALOG_VERSION_CACHE_KEY = u"catalog_version"
+
+
 class MongoModuleStore(ModuleStoreWriteBase):
     """
     A Mongodb backed ModuleStore
@@ -432,8 +443,61 @@ class MongoModuleStore(ModuleStoreWriteBase):
         for location
         """
         pseudo_course_id = '/'.join([location.org, location.course])
+        if location.category == 'course' and self.metadata_inheritance_cache_subsystem is not None:
+            # Replacing the token is cheap, so this isn't deferred by bulk
+            # operations, which never refresh the tree of a deleted course
+            self.metadata_inheritance_cache_subsystem.set(CATALOG_VERSION_CACHE_KEY, uuid4().hex)
         if pseudo_course_id not in self.ignore_write_events_on_courses:
             self.get_cached_metadata_inheritance_tree(location, force_refresh=True)
+            self.refresh_course_version(location)
+
+    def refresh_course_version(self, location):
+        """
+        Replace the version token of the course of location, so that data
+        keyed on the old token is no longer used.  Like the metadata
+        inheritance tree, this is deferred while write events on the course
+        are ignored, and done when the tree is refreshed at the end.
+        """
+        pseudo_course_id = '/'.join([location.org, location.course])
+        if (self.metadata_inheritance_cache_subsystem is not None and
+                pseudo_course_id not in self.ignore_write_events_on_courses):
+            self.metadata_inheritance_cache_subsystem.set(
+                course_version_cache_key(location), uuid4().hex
+            )
+
+    def get_course_version(self, course_id):
+        """
+        Returns a token that changes whenever an item in the course is written.
+
+        The token lives next to the metadata inheritance tree in the caching
+        subsystem and is replaced whenever the tree is refreshed or an item's
+        data is updated.  Without a
+        caching subsystem there is nothing to share it through, so None is returned.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return None
+        org, course, _ = course_id.split('/')
+        key = course_version_cache_key(Location('i4x', org, course, None, None))
+        version = self.metadata_inheritance_cache_subsystem.get(key)
+        if version is None:
+            version = uuid4().hex
+            self.metadata_inheritance_cache_subsystem.set(key, version)
+        return version
+
+    def get_catalog_version(self):
+        """
+        Returns a token that changes whenever a course item is written.
+
+        Like the course versions, the token lives in the caching subsystem, and
+        None is returned without one.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return None
+        version = self.metadata_inheritance_cache_subsystem.get(CATALOG_VERSION_CACHE_KEY)
+        if version is None:
+            version = uuid4().hex
+            self.metadata_inheritance_cache_subsystem.set(CATALOG_VERSION_CACHE_KEY, version)
+        return version
 
     def _clean_item_data(self, item):
         """
@@ -543,6 +607,46 @@ class MongoModuleStore(ModuleStoreWriteBase):
             )
         ]
 
+    def get_course_instances(self, course_ids, depth=0):
+        """
+        Returns a dict mapping each of `course_ids` that is in this modulestore
+        to its course descriptor, fetching all the courses in one query.
+        """
+        if not course_ids:
+            return {}
+        queries = []
+        for course_id in course_ids:
+            org, course, run = course_id.split('/')
+            queries.append(location_to_query(Location('i4x', org, course, 'course', run), wildcard=False))
+        items = self.collection.find({'$or': queries})
+        return {course.location.course_id: course for course in self._load_items(list(items), depth)}
+
+    def get_course_summaries(self, course_numbers=None):
+        """
+        Returns a list of CourseSummaries of the courses in this modulestore,
+        read straight from the course documents' metadata.
+        """
+        query = location_to_query(Location("i4x", category="course"))
+        if course_numbers is not None:
+            query['_id.course'] = {
+                '$in': [re.compile(u'^{0}$'.format(re.escape(number)), re.IGNORECASE) for number in course_numbers]
+            }
+        fields = ['metadata.display_name', 'metadata.display_organization', 'metadata.display_coursenumber']
+        summaries = []
+        for item in self.collection.find(query, fields=fields):
+            location = Location(item['_id'])
+            if location.org == 'edx' and location.course == 'templates':
+                continue
+            metadata = item.get('metadata', {})
+            summaries.append(CourseSummary(
+                location,
+                # the default display_name of CourseFields
+                metadata.get('display_name', 'Empty'),
+                metadata.get('display_organization'),
+                metadata.get('display_coursenumber'),
+            ))
+        return summaries
+
     def _find_one(self, location):
         '''Look for a given location in the collection.  If revision is not
         specified, returns the latest.  If the item is not present, raise
@@ -778,6 +882,8 @@ class MongoModuleStore(ModuleStoreWriteBase):
         except ItemNotFoundError:
             if not allow_not_found:
                 raise
+        # the data isn't part of the inheritance tree, but is of the course's version
+        self.refresh_course_version(Location(location))
 
     def update_children(self, location, children):
         """
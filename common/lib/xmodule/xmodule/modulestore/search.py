@@ -1,10 +1,107 @@
+from collections import OrderedDict
 from itertools import repeat
+import threading
 
 from xmodule.course_module import CourseDescriptor
 
 from .exceptions import (ItemNotFoundError, NoPathToItem)
 from . import Location
 
+# Path indexes of the most recently used course versions kept in this process
+PATH_INDEX_LOCAL_SIZE = 16
+_path_indexes = OrderedDict()
+_path_indexes_lock = threading.Lock()
+
+
+def _position(path, get_children_locations):
+    """
+    Compute the position part of a path_to_location result for path, a list of
+    locations from the course down to the target. get_children_locations
+    returns the ordered child locations of a location in the path.
+    """
+    # This block of code will find the position of a module within a nested tree
+    # of modules. If a problem is on tab 2 of a sequence that's on tab 3 of a
+    # sequence, the resulting position is 3_2. However, no positional modules
+    # (e.g. sequential and videosequence) currently deal with this form of
+    # representing nested positions. This needs to happen before jumping to a
+    # module nested in more than one positional module will work.
+    n = len(path)
+    if n <= 3:
+        return None
+    position_list = []
+    for path_index in range(2, n - 1):
+        category = path[path_index].category
+        if category == 'sequential' or category == 'videosequence':
+            child_locs = get_children_locations(path[path_index])
+            # positions are 1-indexed, and should be strings to be consistent with
+            # url parsing.
+            position_list.append(str(child_locs.index(path[path_index + 1]) + 1))
+    return "_".join(position_list)
+
+
+def build_path_index(course):
+    """
+    Map the url of every location reachable from course to its
+    (chapter, section, position) path, as returned by path_to_location.
+
+    course must have been loaded with all of its descendants (depth=None).
+    """
+    index = {}
+    # Depth first, keeping the first path found to each location. The work
+    # queue holds (descriptor, path from the course to its parent).
+    queue = [(course, [])]
+    children_locations = {}
+    while queue:
+        descriptor, parent_path = queue.pop()
+        location = descriptor.location.replace(revision=None)
+        url = location.url()
+        if url in index:
+            continue
+        path = parent_path + [location]
+        children = descriptor.get_children() if descriptor.has_children else []
+        children_locations[location] = [child.location.replace(revision=None) for child in children]
+        index[url] = (
+            path[1].name if len(path) > 1 else None,
+            path[2].name if len(path) > 2 else None,
+            _position(path, children_locations.__getitem__),
+        )
+        queue.extend((child, path) for child in reversed(children))
+    return index
+
+
+def _get_path_index(modulestore, course_id):
+    """
+    Return the path index of the current version of the course, or None if the
+    modulestore can't version the course.
+
+    Indexes are kept per course version, in this process for the most recently
+    used courses and in the modulestore's metadata cache for all processes.
+    """
+    version = modulestore.get_course_version(course_id)
+    if version is None:
+        return None
+
+    key = u'path_index/{0}/{1}'.format(course_id, version)
+    with _path_indexes_lock:
+        index = _path_indexes.pop(key, None)
+        if index is not None:
+            _path_indexes[key] = index
+            return index
+
+    cache = getattr(modulestore, 'metadata_inheritance_cache_subsystem', None)
+    index = cache.get(key) if cache is not None else None
+    if index is None:
+        course = modulestore.get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+        index = build_path_index(course)
+        if cache is not None:
+            cache.set(key, index)
+
+    with _path_indexes_lock:
+        _path_indexes[key] = index
+        while len(_path_indexes) > PATH_INDEX_LOCAL_SIZE:
+            _path_indexes.popitem(last=False)
+    return index
+
 
 def path_to_location(modulestore, course_id, location):
     '''
@@ -31,6 +128,14 @@ def path_to_location(modulestore, course_id, location):
     be None. TODO (vshnayder): Not true yet.
     '''
 
+    index = _get_path_index(modulestore, course_id)
+    if index is not None:
+        path = index.get(Location(location).replace(revision=None).url())
+        if path is not None:
+            return (course_id,) + path
+        # Not in the course tree: let the search below tell whether it
+        # doesn't exist or isn't reachable
+
     def flatten(xs):
         '''Convert lisp-style (a, (b, (c, ()))) list into a python list.
         Not a general flatten function. '''
@@ -94,24 +199,9 @@ def path_to_location(modulestore, course_id, location):
     chapter = path[1].name if n > 1 else None
     section = path[2].name if n > 2 else None
     # Figure out the position
-    position = None
-
-    # This block of code will find the position of a module within a nested tree
-    # of modules. If a problem is on tab 2 of a sequence that's on tab 3 of a
-    # sequence, the resulting position is 3_2. However, no positional modules
-    # (e.g. sequential and videosequence) currently deal with this form of
-    # representing nested positions. This needs to happen before jumping to a
-    # module nested in more than one positional module will work.
-    if n > 3:
-        position_list = []
-        for path_index in range(2, n - 1):
-            category = path[path_index].category
-            if category == 'sequential' or category == 'videosequence':
-                section_desc = modulestore.get_instance(course_id, path[path_index])
-                child_locs = [c.location for c in section_desc.get_children()]
-                # positions are 1-indexed, and should be strings to be consistent with
-                # url parsing.
-                position_list.append(str(child_locs.index(path[path_index + 1]) + 1))
-        position = "_".join(position_list)
+    position = _position(
+        path,
+        lambda loc: [c.location for c in modulestore.get_instance(course_id, loc).get_children()]
+    )
 
     return (course_id, chapter, section, position)
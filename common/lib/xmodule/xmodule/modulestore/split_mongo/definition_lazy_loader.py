@@ -8,18 +8,55 @@ class DefinitionLazyLoader(object):
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, definition_id):
+    def __init__(self, modulestore, definition_id, batch=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param batch: an optional DefinitionBatch to fetch the definition with
         """
         self.modulestore = modulestore
         self.definition_locator = DefinitionLocator(definition_id)
+        self.batch = batch
 
     def fetch(self):
         """
         Fetch the definition. Note, the caller should replace this lazy
         loader pointer with the result so as not to fetch more than once
         """
+        if self.batch is not None:
+            return self.batch.fetch(self.definition_locator.definition_id)
         return self.modulestore.db_connection.get_definition(self.definition_locator.definition_id)
+
+
+class DefinitionBatch(object):
+    """
+    The definitions of blocks that were loaded together, and so are likely
+    to be used together: the first fetch of any of them fetches them all,
+    in one query.
+    """
+    def __init__(self, modulestore, definition_ids):
+        """
+        :param modulestore: the split modulestore with the definitions
+        :param definition_ids: the ids of the definitions in the batch
+        """
+        self.modulestore = modulestore
+        self.definition_ids = definition_ids
+        self.definitions = None
+
+    def fetch(self, definition_id):
+        """
+        Fetch the definition whose id is definition_id.
+        """
+        if self.definitions is None:
+            self.definitions = {
+                definition['_id']: definition
+                for definition in self.modulestore.db_connection.get_definitions(self.definition_ids)
+            }
+        # Each definition is handed out once, so that blocks sharing a
+        # definition don't share its mutable fields; later fetches of it
+        # go to the db.
+        definition = self.definitions.pop(definition_id, None)
+        if definition is None:
+            definition = self.modulestore.db_connection.get_definition(definition_id)
+        return definition
@@ -1,18 +1,103 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import threading
+from collections import OrderedDict
+
 import pymongo
+from bson import BSON
+
+# The most bytes of encoded structures and definitions kept by the process
+DOCUMENT_CACHE_SIZE = 64 * 1024 * 1024
+
+# The field counting the times a structure was rewritten in place
+REWRITE_COUNT = 'rewrite_count'
+
+
+class DocumentCache(object):
+    """
+    A process-wide, size bounded LRU cache of structures and definitions.
+
+    Structures and definitions are addressed by version and rarely change, so
+    every thread can share them (MongoConnection checks once per request that
+    cached structures weren't rewritten in place since).  They are kept encoded as BSON, and every
+    get decodes a fresh copy, so callers are free to modify what they get
+    (the modulestore does, e.g. to compute inheritance) and decoding costs
+    much less than a Mongo round trip.
+
+    Keys are (collection full name, _id) pairs.
+    """
+    def __init__(self, size=DOCUMENT_CACHE_SIZE):
+        self.size = size
+        self.used = 0
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, tz_aware=True):
+        """
+        Return a copy of the document cached under key, or None.
+        """
+        with self._lock:
+            encoded = self._documents.pop(key, None)
+            if encoded is None:
+                return None
+            self._documents[key] = encoded
+        return encoded.decode(tz_aware=tz_aware)
+
+    def set(self, key, document):
+        """
+        Cache document under key.  Documents bigger than the whole cache
+        aren't cached.
+        """
+        encoded = BSON.encode(document)
+        if len(encoded) > self.size:
+            return
+        with self._lock:
+            previous = self._documents.pop(key, None)
+            if previous is not None:
+                self.used -= len(previous)
+            self._documents[key] = encoded
+            self.used += len(encoded)
+            while self.used > self.size:
+                _, evicted = self._documents.popitem(last=False)
+                self.used -= len(evicted)
+
+    def delete(self, key):
+        """
+        Drop the document cached under key, if any.
+        """
+        with self._lock:
+            encoded = self._documents.pop(key, None)
+            if encoded is not None:
+                self.used -= len(encoded)
+
+    def clear(self):
+        """
+        Drop all the cached documents.
+        """
+        with self._lock:
+            self._documents.clear()
+            self.used = 0
+
+
+document_cache = DocumentCache()
 
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
-        self, db, collection, host, port=27017, tz_aware=True, user=None, password=None, **kwargs
+        self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
+        request_cache=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        :param request_cache: the modulestore's request cache, used to check
+            cached structures for rewrites only once per request
         """
+        self.tz_aware = tz_aware
+        self.request_cache = request_cache
         self.database = pymongo.database.Database(
             pymongo.MongoClient(
                 host=host,
@@ -38,11 +123,73 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+    def _get_cached(self, collection, key, check_rewrites=False):
+        """
+        Get the document of collection whose id is the given key, from the
+        document cache if possible
+        """
+        return next(iter(self._get_many_cached(collection, [key], check_rewrites)), None)
+
+    def _get_many_cached(self, collection, keys, check_rewrites=False):
+        """
+        Get the documents of collection whose ids are in keys, fetching the
+        ones that aren't cached in one query.
+
+        If check_rewrites, cached documents are only used if their rewrite
+        count is still the one in the db.  That costs one small query, made
+        once per request for each document when there is a request cache.
+        """
+        checked = self._checked_rewrites() if check_rewrites else None
+        cached = {}
+        missing = []
+        for key in keys:
+            document = document_cache.get((collection.full_name, key), self.tz_aware)
+            if document is None:
+                missing.append(key)
+            else:
+                cached[key] = document
+        unchecked = [key for key in cached if checked is None or key not in checked]
+        if unchecked and check_rewrites:
+            current = {
+                document['_id']: document.get(REWRITE_COUNT, 0)
+                for document in collection.find({'_id': {'$in': unchecked}}, fields=[REWRITE_COUNT])
+            }
+            for key in unchecked:
+                if current.get(key) != cached[key].get(REWRITE_COUNT, 0):
+                    del cached[key]
+                    document_cache.delete((collection.full_name, key))
+                    if key in current:
+                        missing.append(key)
+        documents = [cached[key] for key in keys if key in cached]
+        if missing:
+            for document in collection.find({'_id': {'$in': missing}}):
+                document_cache.set((collection.full_name, document['_id']), document)
+                documents.append(document)
+        if checked is not None:
+            checked.update(document['_id'] for document in documents)
+        return documents
+
+    def _checked_rewrites(self):
+        """
+        The set of ids of the structures checked for rewrites during the
+        current request, or None outside of requests.
+        """
+        data = getattr(self.request_cache, 'data', None)
+        if data is None:
+            return None
+        return data.setdefault('split_checked_structures', set())
+
     def get_structure(self, key):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return self.structures.find_one({'_id': key})
+        return self._get_cached(self.structures, key, check_rewrites=True)
+
+    def get_structures(self, keys):
+        """
+        Get the structures whose ids are in keys
+        """
+        return self._get_many_cached(self.structures, keys, check_rewrites=True)
 
     def find_matching_structures(self, query):
         """
@@ -56,12 +203,22 @@ class MongoConnection(object):
         Create the structure in the db
         """
         self.structures.insert(structure)
+        document_cache.set((self.structures.full_name, structure['_id']), structure)
 
     def update_structure(self, structure):
         """
-        Update the db record for structure
+        Update the db record for structure.  Counting the rewrite tells the
+        other processes that their cached copies of it are stale.
         """
+        structure[REWRITE_COUNT] = structure.get(REWRITE_COUNT, 0) + 1
         self.structures.update({'_id': structure['_id']}, structure)
+        self.uncache_structure(structure['_id'])
+
+    def uncache_structure(self, key):
+        """
+        Drop the structure whose id is the given key from the document cache
+        """
+        document_cache.delete((self.structures.full_name, key))
 
     def get_course_index(self, key):
         """
@@ -98,7 +255,13 @@ class MongoConnection(object):
         """
         Get the definition from the persistence mechanism whose id is the given key
         """
-        return self.definitions.find_one({'_id': key})
+        return self._get_cached(self.definitions, key)
+
+    def get_definitions(self, keys):
+        """
+        Get the definitions whose ids are in keys
+        """
+        return self._get_many_cached(self.definitions, keys)
 
     def find_matching_definitions(self, query):
         """
@@ -112,5 +275,6 @@ class MongoConnection(object):
         Create the definition in the db
         """
         self.definitions.insert(definition)
+        document_cache.set((self.definitions.full_name, definition['_id']), definition)
 
 
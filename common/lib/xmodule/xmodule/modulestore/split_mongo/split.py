@@ -62,7 +62,7 @@ from xmodule.modulestore.exceptions import InsufficientSpecificationError, Versi
 from xmodule.modulestore import inheritance, ModuleStoreWriteBase, Location, SPLIT_MONGO_MODULESTORE_TYPE
 
 from ..exceptions import ItemNotFoundError
-from .definition_lazy_loader import DefinitionLazyLoader
+from .definition_lazy_loader import DefinitionLazyLoader, DefinitionBatch
 from .caching_descriptor_system import CachingDescriptorSystem
 from xblock.fields import Scope
 from xblock.runtime import Mixologist
@@ -110,9 +110,12 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         super(SplitMongoModuleStore, self).__init__(**kwargs)
         self.loc_mapper = loc_mapper
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(request_cache=self.request_cache, **doc_store_config)
         self.db = self.db_connection.database
 
+        # Descriptor systems hold xblocks, which aren't safe to share between
+        # threads; the structures and definitions they are built from are
+        # shared through the db_connection's document cache.
         # Code review question: How should I expire entries?
         # _add_cache could use a lru mechanism to control the cache size?
         self.thread_cache = threading.local()
@@ -151,13 +154,23 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             )
 
         if lazy:
-            for block in new_module_data.itervalues():
-                block['definition'] = DefinitionLazyLoader(self, block['definition'])
+            # blocks already loaded by this system keep their loader
+            new_blocks = [
+                block for block in new_module_data.itervalues()
+                if not isinstance(block['definition'], DefinitionLazyLoader)
+            ]
+            # when several blocks are loaded, the caller is likely to use them all;
+            # so, fetch their definitions together on the first access to any of them
+            batch = None
+            if len(new_blocks) > 1:
+                batch = DefinitionBatch(self, [block['definition'] for block in new_blocks])
+            for block in new_blocks:
+                block['definition'] = DefinitionLazyLoader(self, block['definition'], batch)
         else:
             # Load all descendants by id
-            descendent_definitions = self.db_connection.find_matching_definitions({
-                '_id': {'$in': [block['definition']
-                                for block in new_module_data.itervalues()]}})
+            descendent_definitions = self.db_connection.get_definitions(
+                [block['definition'] for block in new_module_data.itervalues()]
+            )
             # turn into a map
             definitions = {definition['_id']: definition
                            for definition in descendent_definitions}
@@ -191,6 +204,12 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             )
             self._add_cache(course_entry['structure']['_id'], system)
             self.cache_items(system, block_ids, depth, lazy)
+        else:
+            # load the blocks this system doesn't have yet together rather than
+            # one at a time, so that their definitions are fetched together
+            missing = [block_id for block_id in block_ids if block_id not in system.module_data]
+            if missing:
+                self.cache_items(system, missing, depth, lazy)
         return [system.load_item(block_id, course_entry) for block_id in block_ids]
 
     def _get_cache(self, course_version_guid):
@@ -220,6 +239,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         :param course_version_guid: if provided, clear only this entry
         """
         if course_version_guid:
+            self.db_connection.uncache_structure(course_version_guid)
             del self.thread_cache.course_cache[course_version_guid]
         else:
             self.thread_cache.course_cache = {}
@@ -297,7 +317,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             version_guids.append(version_guid)
             id_version_map[version_guid] = structure['_id']
 
-        course_entries = self.db_connection.find_matching_structures({'_id': {'$in': version_guids}})
+        course_entries = self.db_connection.get_structures(version_guids)
 
         # get the block for the course element (s/b the root)
         result = []
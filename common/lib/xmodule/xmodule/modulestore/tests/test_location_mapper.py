@@ -240,6 +240,53 @@ class TestLocationMapper(unittest.TestCase):
         )
         self.translate_n_check(again_prob_locn, None, delta_new_package_id, again_usage_id, 'published', True)
 
+    def test_translate_locations(self):
+        """
+        Test translating many locations of a course at once
+        """
+        org = 'foo_org'
+        course = 'bar_course'
+        old_style_course_id = '{}/{}/{}'.format(org, course, 'baz_run')
+        new_style_package_id = '{}.geek_dept.{}.baz_run'.format(org, course)
+        loc_mapper().create_map_entry(
+            Location('i4x', org, course, 'course', 'baz_run'),
+            new_style_package_id,
+            block_map={'abc123': {'problem': 'problem2'}}
+        )
+        known = Location('i4x', org, course, 'problem', 'abc123')
+        new_chapter = Location('i4x', org, course, 'chapter', 'intro')
+        new_problem = Location('i4x', org, course, 'problem', 'def456')
+
+        with self.assertRaises(ItemNotFoundError):
+            loc_mapper().translate_locations(old_style_course_id, [known, new_chapter], add_entry_if_missing=False)
+
+        locators = loc_mapper().translate_locations(
+            old_style_course_id, [known, new_chapter, new_problem], published=False
+        )
+        self.assertEqual(locators[known], BlockUsageLocator(
+            package_id=new_style_package_id, branch='draft', block_id='problem2'
+        ))
+        self.assertEqual(locators[new_chapter].block_id, 'intro')
+        self.assertEqual(locators[new_problem].block_id, 'def456')
+        # the new block ids were persisted with one update, so they're found w/o the caches
+        entry = loc_mapper().location_map.find_one({
+            '_id': loc_mapper()._construct_location_son(org, course, 'baz_run')  # pylint: disable=protected-access
+        })
+        self.assertEqual(entry['block_map']['intro'], {'chapter': 'intro'})
+        self.assertEqual(entry['block_map']['def456'], {'problem': 'def456'})
+
+        # now everything is served from the local cache
+        location_map = loc_mapper().location_map
+        loc_mapper().location_map = Mock(wraps=location_map)
+        self.instrumented_cache.reset_mock()
+        locators = loc_mapper().translate_locations(old_style_course_id, [known, new_chapter, new_problem])
+        self.assertEqual(locators[new_chapter].branch, 'published')
+        self.assertFalse(loc_mapper().location_map.find.called)
+        self.assertFalse(self.instrumented_cache.get_many.called)
+        loc_mapper().location_map = location_map
+        for location, locator in locators.iteritems():
+            self.assertEqual(loc_mapper().translate_locator_to_location(locator), location)
+
     def test_translate_locator(self):
         """
         tests translate_locator_to_location(BlockUsageLocator)
@@ -403,6 +450,12 @@ class TrivialCache(object):
         """
         return self.cache.get(key, default)
 
+    def get_many(self, keys):
+        """
+        Mock the .get_many
+        """
+        return dict((key, self.cache[key]) for key in keys if key in self.cache)
+
     def set_many(self, entries):
         """
         mock set_many
@@ -221,6 +221,12 @@ class TestMixedModuleStore(object):
         assert_true(XML_COURSEID1 in course_ids)
         assert_true(XML_COURSEID2 in course_ids)
 
+    def test_get_course_instances(self):
+        courses = self.store.get_course_instances([IMPORT_COURSEID, XML_COURSEID1, 'edX/none/2012_Fall'])
+        assert_equals(set(courses), set([IMPORT_COURSEID, XML_COURSEID1]))
+        assert_equals(courses[IMPORT_COURSEID].location.course, self.import_course)
+        assert_equals(courses[XML_COURSEID1].location.course_id, XML_COURSEID1)
+
     def test_get_course(self):
         module = self.store.get_course(IMPORT_COURSEID)
         assert_equals(module.location.course, self.import_course)
@@ -1,7 +1,8 @@
 from nose.tools import assert_equals, assert_raises  # pylint: disable=E0611
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.modulestore.search import path_to_location
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.search import path_to_location, build_path_index
 
 def check_path_to_location(modulestore):
     """
@@ -24,3 +25,10 @@ def check_path_to_location(modulestore):
     )
     for location in not_found:
         assert_raises(ItemNotFoundError, path_to_location, modulestore, course_id, location)
+
+    # the precomputed index must agree with searching
+    course = modulestore.get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+    index = build_path_index(course)
+    assert_equals(index["i4x://edX/toy/video/Welcome"], ("Overview", "Welcome", None))
+    for location, path in index.iteritems():
+        assert_equals(path_to_location(modulestore, course_id, location), (course_id,) + path)
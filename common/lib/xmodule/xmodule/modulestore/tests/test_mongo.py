@@ -6,6 +6,7 @@ from itertools import ifilter
 # pylint: enable=E0611
 import pymongo
 import logging
+from mock import patch
 from uuid import uuid4
 
 from xblock.fields import Scope
@@ -20,6 +21,8 @@ from xmodule.modulestore.xml_importer import import_from_xml, perform_xlint
 from xmodule.contentstore.mongo import MongoContentStore
 
 from xmodule.modulestore.tests.test_modulestore import check_path_to_location
+from xmodule.modulestore.tests.test_location_mapper import TrivialCache
+from xmodule.modulestore import search
 from IPython.testing.nose_assert_methods import assert_in
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.exceptions import InsufficientSpecificationError
@@ -138,6 +141,31 @@ class TestMongoModuleStore(object):
         assert self.course_with_id_exists('edX/test_unicode/2012_Fall')
         assert self.course_with_id_exists('edX/toy/2012_Fall')
 
+    def test_get_course_instances(self):
+        courses = self.store.get_course_instances(['edX/toy/2012_Fall', 'edX/simple/2012_Fall', 'edX/none/2012_Fall'])
+        assert_equals(set(courses), set(['edX/toy/2012_Fall', 'edX/simple/2012_Fall']))
+        for course_id, course in courses.iteritems():
+            assert_equals(course.id, course_id)
+            assert_equals(course.location.category, 'course')
+        assert_equals(self.store.get_course_instances([]), {})
+
+    def test_get_course_summaries(self):
+        '''Make sure the course summaries match the course objects'''
+        courses = dict((course.id, course) for course in self.store.get_courses())
+        summaries = self.store.get_course_summaries()
+        assert_equals(set(summary.id for summary in summaries), set(courses))
+        for summary in summaries:
+            course = courses[summary.id]
+            assert_equals(summary.display_name, course.display_name)
+            assert_equals(summary.display_org_with_default, course.display_org_with_default)
+            assert_equals(summary.display_number_with_default, course.display_number_with_default)
+
+        summaries = self.store.get_course_summaries(['TOY', 'simple'])
+        assert_equals(
+            set(summary.id for summary in summaries),
+            set(['edX/toy/2012_Fall', 'edX/simple/2012_Fall'])
+        )
+
     def test_loads(self):
         assert_not_equals(
             self.store.get_item("i4x://edX/toy/course/2012_Fall"),
@@ -340,3 +368,72 @@ class TestMongoKeyValueStore(object):
         for scope in (Scope.preferences, Scope.user_info, Scope.user_state, Scope.parent):
             with assert_raises(InvalidScopeError):
                 self.kvs.delete(KeyValueStore.Key(scope, None, None, 'foo'))
+
+
+class TestMongoCourseVersion(object):
+    """
+    Tests of the course versions of a store with a metadata cache, and of the
+    path indexes path_to_location keys on them
+    """
+    course_id = 'edX/toy/2012_Fall'
+    location = 'i4x://edX/toy/video/Video_Resources'
+
+    def setUp(self):
+        self.connection = pymongo.MongoClient(host=HOST, port=PORT, tz_aware=True)
+        self.db = 'test_course_version_%s' % uuid4().hex[:5]
+        self.store = MongoModuleStore(
+            {'host': HOST, 'db': self.db, 'collection': COLLECTION},
+            FS_ROOT, RENDER_TEMPLATE, default_class=DEFAULT_CLASS,
+        )
+        self.store.metadata_inheritance_cache_subsystem = TrivialCache()
+        import_from_xml(self.store, DATA_DIR, ['toy'])
+        search._path_indexes.clear()  # pylint: disable=protected-access
+
+    def tearDown(self):
+        search._path_indexes.clear()  # pylint: disable=protected-access
+        self.connection.drop_database(self.db)
+
+    def test_writes_change_course_version(self):
+        html = Location('i4x://edX/toy/html/toyhtml')
+        versions = [self.store.get_course_version(self.course_id)]
+        assert_equals(self.store.get_course_version(self.course_id), versions[-1])
+
+        self.store.update_item(html, '<p>Changed</p>')
+        versions.append(self.store.get_course_version(self.course_id))
+        self.store.update_metadata(html, {'display_name': 'Changed'})
+        versions.append(self.store.get_course_version(self.course_id))
+        sequence = Location('i4x://edX/toy/videosequence/Toy_Videos')
+        self.store.update_children(sequence, self.store.get_item(sequence).children[1:])
+        versions.append(self.store.get_course_version(self.course_id))
+        assert_equals(len(set(versions)), 4)
+
+        # Other courses keep their version
+        other_version = self.store.get_course_version('edX/simple/2012_Fall')
+        self.store.update_item(html, '<p>Changed again</p>')
+        assert_equals(self.store.get_course_version('edX/simple/2012_Fall'), other_version)
+
+    def test_path_index(self):
+        with patch('xmodule.modulestore.search.build_path_index', wraps=search.build_path_index) as build:
+            assert_equals(
+                search.path_to_location(self.store, self.course_id, self.location),
+                (self.course_id, 'Overview', 'Toy_Videos', '9')
+            )
+            search.path_to_location(self.store, self.course_id, self.location)
+            assert_equals(build.call_count, 1)
+
+            # Other processes use the index in the metadata cache
+            key = u'path_index/{0}/{1}'.format(self.course_id, self.store.get_course_version(self.course_id))
+            assert_in(key, self.store.metadata_inheritance_cache_subsystem.cache)
+            search._path_indexes.clear()  # pylint: disable=protected-access
+            search.path_to_location(self.store, self.course_id, self.location)
+            assert_equals(build.call_count, 1)
+
+            # A write to the course changes its version, and so its index
+            sequence = Location('i4x://edX/toy/videosequence/Toy_Videos')
+            children = self.store.get_item(sequence).children
+            self.store.update_children(sequence, list(reversed(children)))
+            assert_equals(
+                search.path_to_location(self.store, self.course_id, self.location),
+                (self.course_id, 'Overview', 'Toy_Videos', '1')
+            )
+            assert_equals(build.call_count, 2)
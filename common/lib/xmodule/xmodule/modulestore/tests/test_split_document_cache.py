@@ -0,0 +1,57 @@
+"""
+Tests of the cache of split modulestore structures and definitions.
+"""
+import datetime
+import unittest
+
+from bson.objectid import ObjectId
+from pytz import UTC
+
+from xmodule.modulestore.split_mongo.mongo_connection import DocumentCache
+
+
+class TestDocumentCache(unittest.TestCase):
+    """
+    Test DocumentCache.
+    """
+    def setUp(self):
+        self.cache = DocumentCache()
+        self.document = {
+            '_id': ObjectId(),
+            'edited_on': datetime.datetime(2014, 1, 1, tzinfo=UTC),
+            'blocks': {'head': {'fields': {'children': ['a', 'b']}}},
+        }
+
+    def test_get_returns_copies(self):
+        self.cache.set('key', self.document)
+        first = self.cache.get('key')
+        self.assertEqual(first, self.document)
+        first['blocks']['head']['fields']['children'].append('c')
+        self.assertEqual(self.cache.get('key'), self.document)
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_delete(self):
+        self.cache.set('key', self.document)
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.used, 0)
+
+    def test_size_bound(self):
+        self.cache.set('size', self.document)
+        self.cache = DocumentCache(size=self.cache.used * 2)
+        self.cache.set('first', self.document)
+        self.cache.set('second', self.document)
+        # using first makes second the least recently used
+        self.cache.get('first')
+        self.cache.set('third', self.document)
+        self.assertIsNotNone(self.cache.get('first'))
+        self.assertIsNone(self.cache.get('second'))
+        self.assertIsNotNone(self.cache.get('third'))
+        self.assertLessEqual(self.cache.used, self.cache.size)
+
+    def test_too_big(self):
+        cache = DocumentCache(size=10)
+        cache.set('key', self.document)
+        self.assertIsNone(cache.get('key'))
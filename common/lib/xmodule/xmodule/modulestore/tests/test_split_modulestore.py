@@ -9,12 +9,15 @@ import unittest
 import uuid
 from importlib import import_module
 
+from mock import Mock, patch
 from xblock.fields import Scope
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.exceptions import InsufficientSpecificationError, ItemNotFoundError, VersionConflictError, \
     DuplicateItemError
 from xmodule.modulestore.locator import CourseLocator, BlockUsageLocator, VersionTree, DefinitionLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
+from xmodule.modulestore.loc_mapper_store import LocMapperStore
+from xmodule.modulestore.split_mongo.mongo_connection import document_cache, REWRITE_COUNT
 from xmodule.x_module import XModuleMixin
 from pytz import UTC
 from path import path
@@ -98,6 +101,8 @@ class SplitModuleTest(unittest.TestCase):
                 modulestore().db.drop_collection(collection_prefix + collection)
             # drop the modulestore to force re init
             SplitModuleTest.modulestore = None
+        # the next tests reload the fixtures, undoing their changes
+        document_cache.clear()
 
     def findByIdInResult(self, collection, _id):
         """
@@ -144,6 +149,63 @@ class SplitModuleCourseTests(SplitModuleTest):
         self.assertEqual(str(course.previous_version), self.GUID_D1)
         self.assertDictEqual(course.grade_cutoffs, {"Pass": 0.45})
 
+    def test_get_course_from_document_cache(self):
+        locator = CourseLocator(package_id="GreekHero", branch='draft')
+        modulestore().get_course(locator)
+        # drop the thread's descriptor systems, as another thread wouldn't have them
+        # pylint: disable=W0212
+        modulestore()._clear_cache()
+        structures = modulestore().db_connection.structures
+        with patch.object(structures, 'find', wraps=structures.find) as mock_find:
+            course = modulestore().get_course(locator)
+        # only the rewrite count of the structure is read from the db
+        self.assertEqual(mock_find.call_count, 1)
+        self.assertEqual(mock_find.call_args[1]['fields'], [REWRITE_COUNT])
+        self.assertEqual(course.display_name, "The Ancient Greek Hero")
+
+    def test_rewrites_checked_once_per_request(self):
+        locator = CourseLocator(package_id="GreekHero", branch='draft')
+        modulestore().get_course(locator)
+        db_connection = modulestore().db_connection
+        request_cache = Mock(data={})
+        structures = db_connection.structures
+        with patch.object(db_connection, 'request_cache', request_cache):
+            with patch.object(structures, 'find', wraps=structures.find) as mock_find:
+                for _ in range(2):
+                    # pylint: disable=W0212
+                    modulestore()._clear_cache()
+                    modulestore().get_course(locator)
+                self.assertEqual(mock_find.call_count, 1)
+
+                # the next request checks again
+                request_cache.data = {}
+                modulestore()._clear_cache()  # pylint: disable=W0212
+                modulestore().get_course(locator)
+                self.assertEqual(mock_find.call_count, 2)
+
+    def test_document_cache_notices_rewrites(self):
+        locator = CourseLocator(package_id="GreekHero", branch='draft')
+        modulestore().get_course(locator)
+        # pylint: disable=W0212
+        structure = modulestore()._lookup_course(locator)['structure']
+        # another process rewrites the cached structure in place
+        root = LocMapperStore.encode_key_for_mongo(structure['root'])
+        field = 'blocks.{}.fields.display_name'.format(root)
+
+        def rewrite(display_name):
+            """
+            Rewrite the root's display_name the way update_structure would.
+            """
+            modulestore().db_connection.structures.update(
+                {'_id': structure['_id']},
+                {'$set': {field: display_name}, '$inc': {REWRITE_COUNT: 1}}
+            )
+        rewrite("Rewritten")
+        self.addCleanup(rewrite, structure['blocks'][root]['fields']['display_name'])
+        modulestore()._clear_cache()
+        course = modulestore().get_course(locator)
+        self.assertEqual(course.display_name, "Rewritten")
+
     def test_branch_requests(self):
         # query w/ branch qualifier (both draft and published)
         def _verify_published_course(courses_published):
@@ -502,6 +564,23 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         self.assertEqual(len(expected_ids), 0)
 
+    def test_get_item_with_depth_batches_definitions(self):
+        """
+        Test that the definitions of blocks fetched together are fetched in one query
+        """
+        # pylint: disable=W0212
+        modulestore()._clear_cache()
+        document_cache.clear()
+        locator = BlockUsageLocator(package_id="GreekHero", block_id="head12345", branch='draft')
+        definitions = modulestore().db_connection.definitions
+        with patch.object(definitions, 'find_one', wraps=definitions.find_one) as mock_find_one:
+            with patch.object(definitions, 'find', wraps=definitions.find) as mock_find:
+                block = modulestore().get_item(locator, depth=1)
+                for child in block.get_children():
+                    child._field_data._kvs._load_definition()
+        self.assertEqual(mock_find.call_count, 1)
+        self.assertFalse(mock_find_one.called)
+
 
 class TestItemCrud(SplitModuleTest):
     """
@@ -9,6 +9,7 @@ import glob
 
 from collections import defaultdict
 from cStringIO import StringIO
+from uuid import uuid4
 from fs.osfs import OSFS
 from importlib import import_module
 from lxml import etree
@@ -368,6 +369,7 @@ class XMLModuleStore(ModuleStoreReadBase):
         self.errored_courses = {}  # course_dir -> errorlog, for dirs that failed to load
 
         self.load_error_modules = load_error_modules
+        self._catalog_version = uuid4().hex
 
         if default_class is None:
             self.default_class = None
@@ -411,6 +413,9 @@ class XMLModuleStore(ModuleStoreReadBase):
             log.exception(msg)
             errorlog.tracker(msg)
 
+        # Courses are only ever added by loading them
+        self._catalog_version = uuid4().hex
+
         if course_descriptor is not None and not isinstance(course_descriptor, ErrorDescriptor):
             self.courses[course_dir] = course_descriptor
             self._location_errors[course_descriptor.scope_ids.usage_id] = errorlog
@@ -669,6 +674,12 @@ class XMLModuleStore(ModuleStoreReadBase):
         """
         return self.courses.values()
 
+    def get_catalog_version(self):
+        """
+        Returns a token that changes whenever a course is loaded.
+        """
+        return self._catalog_version
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
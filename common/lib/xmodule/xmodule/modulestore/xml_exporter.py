@@ -2,8 +2,14 @@
 Methods for exporting course data to XML
 """
 
+import calendar
 import logging
 import lxml.etree
+import sys
+import tarfile
+import threading
+from tempfile import mkdtemp
+from xmodule.contentstore.content import ASSET_POLICY_EXCLUDED_ATTRIBUTES
 from xmodule.modulestore import Location
 from xmodule.modulestore.inheritance import own_metadata
 from fs.osfs import OSFS
@@ -120,6 +126,107 @@ def export_to_xml(modulestore, contentstore, course_location, root_dir, course_d
                     draft_vertical.add_xml_to_node(node)
 
 
+class AssetTarWriter(threading.Thread):
+    """
+    Streams the assets of a course from a contentstore into a tar file, in a
+    thread of its own, and collects their policy.
+
+    Assets are copied from their stored file to the archive a block at a time,
+    so they are never held in memory whole.  The tar file must not be written
+    to by anyone else until `finish` returns.
+    """
+    def __init__(self, contentstore, course_location, tar_file, static_dir):
+        super(AssetTarWriter, self).__init__(name='asset-export-{0}'.format(course_location.course))
+        self.daemon = True
+        self.contentstore = contentstore
+        self.course_location = course_location
+        self.tar_file = tar_file
+        self.static_dir = static_dir
+        self.policy = {}
+        self._stopped = threading.Event()
+        self._exc_info = None
+
+    def run(self):
+        try:
+            assets, __ = self.contentstore.get_all_content_for_course(self.course_location)
+            for asset in assets:
+                if self._stopped.is_set():
+                    return
+                asset_location = Location(asset['_id'])
+                self._add_asset(asset_location)
+                for attr, value in asset.iteritems():
+                    if attr not in ASSET_POLICY_EXCLUDED_ATTRIBUTES:
+                        self.policy.setdefault(asset_location.name, {})[attr] = value
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
+
+    def _add_asset(self, asset_location):
+        """
+        Copy the asset at `asset_location` into the tar file, where
+        `MongoContentStore.export` would write it.
+        """
+        handle = self.contentstore.get_stream(asset_location)
+        try:
+            import_path = getattr(handle, 'import_path', None)
+            asset_dir = self.static_dir
+            if import_path is not None:
+                asset_dir = asset_dir + '/' + os.path.dirname(import_path)
+            info = tarfile.TarInfo(os.path.normpath(os.path.join(asset_dir, handle.displayname)))
+            info.size = handle.length
+            if handle.upload_date is not None:
+                info.mtime = calendar.timegm(handle.upload_date.utctimetuple())
+            self.tar_file.addfile(info, handle)
+        finally:
+            self.contentstore.close_stream(handle)
+
+    def stop(self):
+        """
+        Stop after the asset being written, and wait for the thread to end.
+        """
+        self._stopped.set()
+        self.join()
+
+    def finish(self):
+        """
+        Wait for all the assets to be written, and return their policy.
+        Re-raises the error that stopped the thread, if any.
+        """
+        self.join()
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self.policy
+
+
+def export_to_tar(modulestore, contentstore, course_location, tar_file, course_dir, draft_modulestore=None):
+    """
+    Export a course like `export_to_xml`, into `tar_file` under `course_dir`.
+
+    `tar_file`: A `tarfile.TarFile` open for writing, e.g. with mode 'w:gz'
+
+    The assets are streamed from `contentstore` into the archive by an
+    `AssetTarWriter` while the modules are serialized, so that reading assets
+    and compressing them overlaps with the modulestore queries.  The modules
+    are written to a temporary directory, which is added to the archive once
+    the assets are done.  If the export fails the archive is left incomplete.
+    """
+    root_dir = path(mkdtemp())
+    asset_writer = None
+    if contentstore:
+        asset_writer = AssetTarWriter(contentstore, course_location, tar_file, course_dir + '/static')
+        asset_writer.start()
+    try:
+        export_to_xml(modulestore, None, course_location, root_dir, course_dir, draft_modulestore)
+        if asset_writer is not None:
+            policy = asset_writer.finish()
+            with open(root_dir / course_dir / 'policies' / 'assets.json', 'w') as assets_policy:
+                json.dump(policy, assets_policy)
+        tar_file.add(root_dir / course_dir, arcname=course_dir)
+    finally:
+        if asset_writer is not None and asset_writer.is_alive():
+            asset_writer.stop()
+        shutil.rmtree(root_dir)
+
+
 def export_extra_content(export_fs, modulestore, course_id, course_location, category_type, dirname, file_suffix=''):
     query_loc = Location('i4x', course_location.org, course_location.course, category_type, None)
     items = modulestore.get_items(query_loc, course_id)
@@ -58,39 +58,62 @@ class PollModule(PollFields, XModule):
         Returns:
             json string
         """
-        if dispatch in self.poll_answers and not self.voted:
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[dispatch] += 1
-            self.poll_answers = temp_poll_answers
+        if dispatch in self.get_poll_answers() and not self.voted:
+            self.add_vote(dispatch, 1)
 
             self.voted = True
             self.poll_answer = dispatch
-            return json.dumps({'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values()),
+            poll_answers = self.get_poll_answers()
+            return json.dumps({'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values()),
                                'callback': {'objectName': 'Conditional'}
                                })
         elif dispatch == 'get_state':
+            poll_answers = self.get_poll_answers()
             return json.dumps({'poll_answer': self.poll_answer,
-                               'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values())
+                               'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values())
                                })
         elif dispatch == 'reset_poll' and self.voted and \
                 self.descriptor.xml_attributes.get('reset', 'True').lower() != 'false':
             self.voted = False
-
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[self.poll_answer] -= 1
-            self.poll_answers = temp_poll_answers
-
+            self.add_vote(self.poll_answer, -1)
             self.poll_answer = ''
             return json.dumps({'status': 'success'})
         else:  # return error message
             return json.dumps({'error': 'Unknown Command!'})
 
+    def get_poll_answers(self):
+        """Return the number of votes for each answer.
+
+        With the runtime's aggregate counters, votes are counted there, on top
+        of any tallied in the poll_answers field before.
+        """
+        counters = self.system.aggregate_counters
+        if counters is None:
+            return self.poll_answers or {}
+
+        poll_answers = dict(self.poll_answers or {})
+        votes = counters.get_many(
+            self.location.url(), 'poll_answers', [answer['id'] for answer in self.answers]
+        )
+        for answer_id, count in votes.iteritems():
+            poll_answers[answer_id] = poll_answers.get(answer_id, 0) + count
+        return poll_answers
+
+    def add_vote(self, answer_id, delta):
+        """Add delta votes to an answer."""
+        counters = self.system.aggregate_counters
+        if counters is not None:
+            counters.increment(self.location.url(), 'poll_answers', {answer_id: delta})
+            return
+
+        # FIXME: fix this, when xblock will support mutable types.
+        # Now we use this hack.
+        temp_poll_answers = self.poll_answers
+        temp_poll_answers[answer_id] += delta
+        self.poll_answers = temp_poll_answers
+
     def get_html(self):
         """Renders parameters to template."""
         params = {
@@ -108,31 +131,36 @@ class PollModule(PollFields, XModule):
         Returns:
             string - Serialize json.
         """
-        # FIXME: hack for resolving caching `default={}` during definition
-        # poll_answers field
-        if self.poll_answers is None:
-            self.poll_answers = {}
-
         answers_to_json = OrderedDict()
 
-        # FIXME: fix this, when xblock support mutable types.
-        # Now we use this hack.
-        temp_poll_answers = self.poll_answers
+        if self.system.aggregate_counters is None:
+            # FIXME: hack for resolving caching `default={}` during definition
+            # poll_answers field
+            if self.poll_answers is None:
+                self.poll_answers = {}
 
-         # Fill self.poll_answers, prepare data for template context.
+            # FIXME: fix this, when xblock support mutable types.
+            # Now we use this hack.
+            temp_poll_answers = self.poll_answers
+        else:
+            # the counts live in the aggregate counters; nothing to store
+            temp_poll_answers = self.get_poll_answers()
+
+         # Fill poll answers, prepare data for template context.
         for answer in self.answers:
             # Set default count for answer = 0.
             if answer['id'] not in temp_poll_answers:
                 temp_poll_answers[answer['id']] = 0
             answers_to_json[answer['id']] = cgi.escape(answer['text'])
-        self.poll_answers = temp_poll_answers
+        if self.system.aggregate_counters is None:
+            self.poll_answers = temp_poll_answers
 
         return json.dumps({'answers': answers_to_json,
             'question': cgi.escape(self.question),
             # to show answered poll after reload:
             'poll_answer': self.poll_answer,
-            'poll_answers': self.poll_answers if self.voted else {},
-            'total': sum(self.poll_answers.values()) if self.voted else 0,
+            'poll_answers': temp_poll_answers if self.voted else {},
+            'total': sum(temp_poll_answers.values()) if self.voted else 0,
             'reset': str(self.descriptor.xml_attributes.get('reset', 'true')).lower()})
 
 
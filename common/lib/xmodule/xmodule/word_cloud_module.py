@@ -94,18 +94,25 @@ class WordCloudModule(WordCloudFields, XModule):
     def get_state(self):
         """Return success json answer for client."""
         if self.submitted:
-            total_count = sum(self.all_words.itervalues())
+            if self.system.aggregate_counters is None:
+                total_count = sum(self.all_words.itervalues())
+                student_words = {
+                    word: self.all_words[word] for word in self.student_words
+                }
+                top_words = self.top_words
+            else:
+                total_count = self.total_count()
+                student_words = self.word_counts(self.student_words)
+                top_words = self.counted_top_words()
             return json.dumps({
                 'status': 'success',
                 'submitted': True,
                 'display_student_percents': pretty_bool(
                     self.display_student_percents
                 ),
-                'student_words': {
-                    word: self.all_words[word] for word in self.student_words
-                },
+                'student_words': student_words,
                 'total_count': total_count,
-                'top_words': self.prepare_words(self.top_words, total_count)
+                'top_words': self.prepare_words(top_words, total_count)
             })
         else:
             return json.dumps({
@@ -173,6 +180,48 @@ class WordCloudModule(WordCloudFields, XModule):
             )[:amount]
         )
 
+    def word_counts(self, words):
+        """Return the number of times each of words was entered, counting
+        both the aggregate counters and the all_words field.
+
+        :param words: words to count
+        :type words: list
+        :rtype: dict
+        """
+        counts = self.system.aggregate_counters.get_many(
+            self.location.url(), 'all_words', words
+        )
+        return {
+            word: counts[word] + self.all_words.get(word, 0) for word in words
+        }
+
+    def total_count(self):
+        """Return the total number of words entered, counting both the
+        aggregate counters and the all_words field."""
+        return self.system.aggregate_counters.total(
+            self.location.url(), 'all_words'
+        ) + sum(self.all_words.itervalues())
+
+    def counted_top_words(self):
+        """Return the top num_top_words words from the aggregate counters and
+        the all_words field.
+
+        Candidates are the top words of each; the rare word that is in
+        neither but would make the top by adding both counts is missed.
+
+        :rtype: dict
+        """
+        candidates = set(
+            word for word, _ in self.system.aggregate_counters.top(
+                self.location.url(), 'all_words', self.num_top_words
+            )
+        )
+        candidates.update(self.top_words or {})
+        return self.top_dict(
+            self.word_counts(list(candidates)),
+            self.num_top_words
+        )
+
     def handle_ajax(self, dispatch, data):
         """Ajax handler.
 
@@ -196,14 +245,21 @@ class WordCloudModule(WordCloudFields, XModule):
             student_words = filter(None, map(self.good_word, raw_student_words))
 
             self.student_words = student_words
+            self.submitted = True
+
+            counters = self.system.aggregate_counters
+            if counters is not None:
+                deltas = {}
+                for word in self.student_words:
+                    deltas[word] = deltas.get(word, 0) + 1
+                counters.increment(self.location.url(), 'all_words', deltas)
+                return self.get_state()
 
             # FIXME: fix this, when xblock will support mutable types.
             # Now we use this hack.
             # speed issues
             temp_all_words = self.all_words
 
-            self.submitted = True
-
             # Save in all_words.
             for word in self.student_words:
                 temp_all_words[word] = temp_all_words.get(word, 0) + 1
@@ -1052,7 +1052,7 @@ class ModuleSystem(ConfigurableFragmentWrapper, Runtime):  # pylint: disable=abs
             open_ended_grading_interface=None, s3_interface=None,
             cache=None, can_execute_unsafe_code=None, replace_course_urls=None,
             replace_jump_to_id_urls=None, error_descriptor_class=None, get_real_user=None,
-            field_data=None, get_user_role=None,
+            field_data=None, get_user_role=None, aggregate_counters=None,
             **kwargs):
         """
         Create a closure around the system environment.
@@ -1109,6 +1109,17 @@ class ModuleSystem(ConfigurableFragmentWrapper, Runtime):  # pylint: disable=abs
             for LMS and Studio.
 
         field_data - the `FieldData` to use for backing XBlock storage.
+
+        aggregate_counters - An object keeping tallies of Scope.user_state_summary
+            data that all students add to (e.g. poll votes), identified by a
+            usage id and a field name, with methods:
+            .increment(usage_id, field_name, deltas) atomically adds the amounts in the
+                dict deltas to the counters of its keys.
+            .get_many(usage_id, field_name, keys) returns a dict of the counts of keys.
+            .top(usage_id, field_name, amount) returns the `amount` largest counters as
+                (key, count) pairs.
+            .total(usage_id, field_name) returns the sum of all counters.
+            If None, modules keep their tallies in their user_state_summary fields.
         """
 
         # Usage_store is unused, and field_data is often supplanted with an
@@ -1147,6 +1158,8 @@ class ModuleSystem(ConfigurableFragmentWrapper, Runtime):  # pylint: disable=abs
 
         self.get_user_role = get_user_role
 
+        self.aggregate_counters = aggregate_counters
+
     def get(self, attr):
         """	provide uniform access to attributes (like etree)."""
         return self.__dict__.get(attr)
@@ -0,0 +1,5 @@
+"""
+Offline benchmarks of the LMS hot paths, run against a generated course.
+
+See the run_benchmarks management command and lms/envs/benchmark.py.
+"""
@@ -0,0 +1,168 @@
+"""
+Generation of synthetic courses for the benchmarks.
+
+Courses are written in the OLX directory layout that courses are exported
+in, so that they can be imported with xml_importer.import_from_xml.  The
+content only depends on the sizes and the seed, so the same arguments always
+produce the same course.
+"""
+import json
+import os
+import random
+from collections import namedtuple
+
+from lxml import etree
+
+CourseSize = namedtuple('CourseSize', 'chapters sequentials verticals problems')
+CourseSize.__doc__ = """
+The shape of a course: the number of chapters, of sequentials per chapter, of
+verticals per sequential, and of problems per vertical.  Every vertical also
+has one html block.
+"""
+
+SMALL_COURSE = CourseSize(chapters=4, sequentials=3, verticals=3, problems=2)
+
+# Templates of the problems, by kind.  Each is formatted with a dict of the
+# problem's random parameters.
+PROBLEM_TEMPLATES = {
+    'numerical': """
+        <problem>
+          <p>What is {a} * {b} + sqrt({c})?</p>
+          <numericalresponse answer="{a} * {b} + sqrt({c})">
+            <responseparam type="tolerance" default="1%"/>
+            <formulaequationinput/>
+          </numericalresponse>
+        </problem>
+    """,
+    'formula': """
+        <problem>
+          <p>Write {a}*x^2 + {b}*y as a formula of x and y.</p>
+          <formularesponse type="cs" samples="x,y@1,1:3,3#10" answer="{a}*x^2 + {b}*y">
+            <responseparam type="tolerance" default="0.00001"/>
+            <formulaequationinput/>
+          </formularesponse>
+        </problem>
+    """,
+    'string': """
+        <problem>
+          <p>What is the name of option {a}?</p>
+          <stringresponse answer="option{a}" type="ci">
+            <textline size="20"/>
+          </stringresponse>
+        </problem>
+    """,
+    'choice': """
+        <problem>
+          <p>Which option is {a}?</p>
+          <multiplechoiceresponse>
+            <choicegroup type="MultipleChoice">
+              <choice correct="false">Option {b}</choice>
+              <choice correct="true">Option {a}</choice>
+              <choice correct="false">Option {c}</choice>
+            </choicegroup>
+          </multiplechoiceresponse>
+        </problem>
+    """,
+}
+
+PROBLEM_KINDS = sorted(PROBLEM_TEMPLATES)
+
+HTML_TEMPLATE = u"<p>{text}</p><ul>{items}</ul>"
+
+WORDS = (
+    "energy", "momentum", "circuit", "voltage", "entropy", "vector", "matrix",
+    "integral", "protein", "market", "history", "syntax", "theorem", "signal",
+)
+
+
+def problem_xml(kind, rand):
+    """
+    Return the xml of a problem of `kind` with parameters drawn from `rand`.
+    """
+    params = {'a': rand.randint(1, 99), 'b': rand.randint(1, 99), 'c': rand.randint(1, 99)}
+    return PROBLEM_TEMPLATES[kind].format(**params).strip()
+
+
+def _write(root, category, url_name, element):
+    """
+    Write `element` to the file of block `url_name` of `category`.
+    """
+    directory = os.path.join(root, category)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(os.path.join(directory, url_name + '.xml'), 'w') as xml_file:
+        xml_file.write(etree.tostring(element, pretty_print=True))
+
+
+def _pointer(parent, category, url_name):
+    """
+    Add a pointer to block `url_name` of `category` as a child of `parent`.
+    """
+    etree.SubElement(parent, category, url_name=url_name)
+
+
+def generate_course(data_dir, course_dir, org, number, run, size=SMALL_COURSE, seed=0):
+    """
+    Write a course of `size` to data_dir/course_dir, and return its course id.
+
+    Problems cycle through PROBLEM_KINDS, and the sequentials of every other
+    chapter are graded homework.
+    """
+    rand = random.Random(seed)
+    root = os.path.join(data_dir, course_dir)
+
+    course_pointer = etree.Element('course', url_name=run, org=org, course=number)
+    if not os.path.isdir(root):
+        os.makedirs(root)
+    with open(os.path.join(root, 'course.xml'), 'w') as course_file:
+        course_file.write(etree.tostring(course_pointer))
+
+    course = etree.Element('course', display_name="Benchmark course {0}".format(number))
+    problem_count = 0
+    for chapter_index in xrange(size.chapters):
+        chapter_name = 'chapter_{0}'.format(chapter_index)
+        chapter = etree.Element('chapter', display_name="Chapter {0}".format(chapter_index))
+        for sequential_index in xrange(size.sequentials):
+            sequential_name = '{0}_sequential_{1}'.format(chapter_name, sequential_index)
+            sequential = etree.Element('sequential', display_name="Sequential {0}".format(sequential_index))
+            if chapter_index % 2:
+                sequential.set('graded', 'true')
+                sequential.set('format', 'Homework')
+            for vertical_index in xrange(size.verticals):
+                vertical_name = '{0}_vertical_{1}'.format(sequential_name, vertical_index)
+                vertical = etree.Element('vertical', display_name="Unit {0}".format(vertical_index))
+
+                html_name = vertical_name + '_html'
+                _write(root, 'html', html_name, etree.Element('html', filename=html_name))
+                with open(os.path.join(root, 'html', html_name + '.html'), 'w') as html_file:
+                    words = [rand.choice(WORDS) for _ in xrange(40)]
+                    html_file.write(HTML_TEMPLATE.format(
+                        text=u" ".join(words),
+                        items=u"".join(u"<li>{0}</li>".format(word) for word in words[:10]),
+                    ).encode('utf-8'))
+                _pointer(vertical, 'html', html_name)
+
+                for problem_index in xrange(size.problems):
+                    problem_name = '{0}_problem_{1}'.format(vertical_name, problem_index)
+                    kind = PROBLEM_KINDS[problem_count % len(PROBLEM_KINDS)]
+                    problem = etree.fromstring(problem_xml(kind, rand))
+                    problem.set('display_name', "Problem {0}".format(problem_count))
+                    problem.set('weight', '1')
+                    _write(root, 'problem', problem_name, problem)
+                    _pointer(vertical, 'problem', problem_name)
+                    problem_count += 1
+
+                _write(root, 'vertical', vertical_name, vertical)
+                _pointer(sequential, 'vertical', vertical_name)
+            _write(root, 'sequential', sequential_name, sequential)
+            _pointer(chapter, 'sequential', sequential_name)
+        _write(root, 'chapter', chapter_name, chapter)
+        _pointer(course, 'chapter', chapter_name)
+    _write(root, 'course', run, course)
+
+    policy_dir = os.path.join(root, 'policies', run)
+    os.makedirs(policy_dir)
+    with open(os.path.join(policy_dir, 'policy.json'), 'w') as policy_file:
+        json.dump({'course/' + run: {'start': '2013-01-01T00:00:00Z'}}, policy_file)
+
+    return '/'.join([org, number, run])
@@ -0,0 +1,125 @@
+"""
+A stand-in for the comments service, answering the comment client in process.
+
+It serves one thread of a configurable size, so that forum views can be
+benchmarked without a running comments service or network latency.
+"""
+import json
+import re
+
+
+class FakeResponse(object):
+    """
+    The parts of a requests.Response that the comment client uses.
+    """
+    def __init__(self, content, status_code=200):
+        self.status_code = status_code
+        self.text = json.dumps(content)
+
+
+class FakeCommentService(object):
+    """
+    Answers comment client requests, in place of its requests.Session.
+
+    Every thread has `responses` responses, each with `comments` comments.
+    """
+    THREAD_URL = re.compile(r'/threads/(?P<thread_id>[^/]+)$')
+    USER_URL = re.compile(r'/users/(?P<user_id>[^/]+)$')
+
+    def __init__(self, course_id, commentable_id, responses=20, comments=5):
+        self.course_id = course_id
+        self.commentable_id = commentable_id
+        self.responses = responses
+        self.comments = comments
+
+    def _content(self, content_type, content_id, thread_id, parent_id=None, children=None):
+        """
+        A thread, response or comment.
+        """
+        content = {
+            'id': content_id,
+            'type': content_type,
+            'body': u"Body of {0} {1}, with some words to render.".format(content_type, content_id),
+            'course_id': self.course_id,
+            'commentable_id': self.commentable_id,
+            'thread_id': thread_id,
+            'user_id': '1',
+            'username': 'benchmark',
+            'anonymous': False,
+            'anonymous_to_peers': False,
+            'created_at': '2013-01-01T00:00:00Z',
+            'updated_at': '2013-01-01T00:00:00Z',
+            'at_position_list': [],
+            'abuse_flaggers': [],
+            'votes': {'count': 3, 'up_count': 2, 'down_count': 1, 'point': 1},
+            'endorsed': False,
+            'closed': False,
+        }
+        if parent_id is not None:
+            content['parent_id'] = parent_id
+        if children is not None:
+            content['children'] = children
+        return content
+
+    def thread(self, thread_id, recursive=True):
+        """
+        The thread `thread_id`, with its responses and their comments if
+        `recursive`.
+        """
+        thread = self._content('thread', thread_id, thread_id)
+        thread.update({
+            'title': u"Thread {0}".format(thread_id),
+            'pinned': False,
+            'comments_count': self.responses * (self.comments + 1),
+            'resp_total': self.responses,
+            'resp_skip': 0,
+            'resp_limit': self.responses,
+        })
+        if recursive:
+            thread['children'] = [
+                self._content(
+                    'comment', '{0}_response_{1}'.format(thread_id, response), thread_id,
+                    children=[
+                        self._content(
+                            'comment', '{0}_response_{1}_comment_{2}'.format(thread_id, response, comment),
+                            thread_id, parent_id='{0}_response_{1}'.format(thread_id, response), children=[],
+                        )
+                        for comment in xrange(self.comments)
+                    ]
+                )
+                for response in xrange(self.responses)
+            ]
+        return thread
+
+    def user(self, user_id):
+        """
+        The comment service's data about user `user_id`.
+        """
+        return {
+            'id': user_id,
+            'username': 'benchmark',
+            'upvoted_ids': [],
+            'downvoted_ids': [],
+            'subscribed_thread_ids': [],
+            'subscribed_commentable_ids': [],
+            'subscribed_user_ids': [],
+            'follower_ids': [],
+            'threads_count': 1,
+            'comments_count': 0,
+        }
+
+    def request(self, method, url, data=None, params=None, headers=None, timeout=None):  # pylint: disable=unused-argument
+        """
+        Answer a request like requests.Session.request.
+        """
+        params = params or {}
+        match = self.THREAD_URL.search(url)
+        if match:
+            recursive = params.get('recursive') in (True, 'True', 'true')
+            return FakeResponse(self.thread(match.group('thread_id'), recursive))
+        match = self.USER_URL.search(url)
+        if match:
+            return FakeResponse(self.user(match.group('user_id')))
+        if url.endswith('/threads'):
+            return FakeResponse({'collection': [self.thread('thread_0', recursive=False)], 'page': 1, 'num_pages': 1})
+        return FakeResponse({})
@@ -0,0 +1,120 @@
+"""
+Run the benchmark scenarios against a generated course.
+
+Meant to be run with the benchmark settings, which use a local sqlite
+database and Mongo:
+
+    ./manage.py lms run_benchmarks --settings=benchmark --output=results.json
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.course_generator import CourseSize, SMALL_COURSE, generate_course
+from benchmarks.runner import environment, measure
+from benchmarks.scenarios import BenchmarkContext, SCENARIOS
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Run the benchmarks and write their results as json.
+    """
+    help = """
+    Generate a synthetic course, import it, and time the hot paths of the LMS
+    against it: importing, building modules, grading, checking answers,
+    evaluating formulas and rendering forum threads.
+
+    Every scenario is run --repeat times.  The results, with timings, calls
+    made to the databases and caches, and peak memory, are written as json
+    to --output, or stdout.
+
+    The database and modulestore of the settings are emptied first, so only
+    use this with the benchmark settings.
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option('--chapters', type='int', default=SMALL_COURSE.chapters,
+                    help='Number of chapters of the course'),
+        make_option('--sequentials', type='int', default=SMALL_COURSE.sequentials,
+                    help='Number of sequentials per chapter'),
+        make_option('--verticals', type='int', default=SMALL_COURSE.verticals,
+                    help='Number of verticals per sequential'),
+        make_option('--problems', type='int', default=SMALL_COURSE.problems,
+                    help='Number of problems per vertical'),
+        make_option('--forum-responses', type='int', default=20, dest='forum_responses',
+                    help='Number of responses of the forum thread'),
+        make_option('--forum-comments', type='int', default=5, dest='forum_comments',
+                    help='Number of comments per response of the forum thread'),
+        make_option('--repeat', type='int', default=5,
+                    help='Number of runs of each scenario'),
+        make_option('--seed', type='int', default=0,
+                    help='Seed of the generated content'),
+        make_option('--scenarios', default=None,
+                    help='Comma separated names of the scenarios to run, all of them by default'),
+        make_option('--output', default=None,
+                    help='File to write the results to'),
+    )
+
+    def handle(self, *args, **options):
+        names = [name for name, _ in SCENARIOS]
+        if options['scenarios']:
+            selected = options['scenarios'].split(',')
+            unknown = set(selected) - set(names)
+            if unknown:
+                raise CommandError("Unknown scenarios: {0}".format(", ".join(sorted(unknown))))
+            names = [name for name in names if name in selected]
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1")
+
+        size = CourseSize(options['chapters'], options['sequentials'], options['verticals'], options['problems'])
+        self._reset_stores()
+
+        data_dir = tempfile.mkdtemp(prefix='benchmark-')
+        try:
+            course_id = generate_course(data_dir, 'benchmark', 'Benchmark', 'B101', 'run', size, options['seed'])
+            context = BenchmarkContext(
+                data_dir, 'benchmark', course_id, seed=options['seed'],
+                forum_responses=options['forum_responses'], forum_comments=options['forum_comments'],
+            )
+            results = {
+                'environment': environment(),
+                'course_size': size._asdict(),
+                'options': {key: options[key] for key in ('repeat', 'seed', 'forum_responses', 'forum_comments')},
+                'scenarios': {},
+            }
+            for name, scenario in SCENARIOS:
+                if name in names:
+                    self.stderr.write("Running {0}\n".format(name))
+                    results['scenarios'][name] = measure(scenario(context), options['repeat'])
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+        output = json.dumps(results, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        else:
+            sys.stdout.write(output + "\n")
+
+    def _reset_stores(self):
+        """
+        Start from an empty sqlite database and modulestore, so that runs are
+        comparable.
+        """
+        database = settings.DATABASES['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("The benchmarks need a sqlite database, use the benchmark settings")
+        if os.path.exists(database['NAME']):
+            os.remove(database['NAME'])
+        call_command('syncdb', interactive=False, migrate_all=True, verbosity=0)
+
+        store = modulestore()
+        store.collection.drop()
@@ -0,0 +1,3 @@
+"""
+The benchmarks have no models: Django needs this module to find their tests.
+"""
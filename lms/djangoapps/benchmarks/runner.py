@@ -0,0 +1,95 @@
+"""
+Measurement of benchmark scenarios.
+
+A scenario is run a number of times, and for each run we record the wall
+clock time and the calls made to the modulestore, Mongo, SQL, the caches
+and the renderers (see lms.lib.perfstats.stats).  Memory is reported as the
+peak resident size of the process, before and after the scenario.
+"""
+import gc
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from lms.lib.perfstats import stats
+
+
+def _maxrss_kb():
+    """
+    The peak resident size of this process so far, in kilobytes.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _median(values):
+    """
+    The median of a non-empty list of numbers.
+    """
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+def measure(run, repeat):
+    """
+    Call `run` `repeat` times, and return its measurements as a dict.
+
+    The first call is reported separately from the others, as it usually pays
+    for filling caches; `calls` are the calls made by the last run.
+    """
+    stats.install()
+    maxrss_before = _maxrss_kb()
+    times = []
+    calls = []
+    for _ in xrange(repeat):
+        gc.collect()
+        stats.start()
+        begin = time.time()
+        try:
+            run()
+        finally:
+            elapsed = time.time() - begin
+            run_stats = stats.stop()
+        times.append(elapsed)
+        calls.append(dict(run_stats.counts))
+
+    warm_times = times[1:] or times
+    return {
+        'runs': repeat,
+        'first_seconds': times[0],
+        'min_seconds': min(warm_times),
+        'median_seconds': _median(warm_times),
+        'mean_seconds': sum(warm_times) / len(warm_times),
+        'max_seconds': max(warm_times),
+        'times': times,
+        'first_calls': calls[0],
+        'calls': calls[-1],
+        'maxrss_kb_before': maxrss_before,
+        'maxrss_kb_after': _maxrss_kb(),
+    }
+
+
+def revision():
+    """
+    The git revision of the working tree, or None if it can't be found.
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.PIPE).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """
+    A description of the machine the benchmarks ran on.
+    """
+    return {
+        'revision': revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
@@ -0,0 +1,207 @@
+"""
+The benchmark scenarios.
+
+Each scenario is a function taking a BenchmarkContext and returning the
+function to measure; the setup it does before returning isn't measured.
+"""
+import gettext
+import os
+import random
+
+from django.contrib.auth.models import User
+from django.test.client import RequestFactory
+from fs.osfs import OSFS
+
+from calc import evaluator
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from courseware import grades
+from courseware.model_data import FieldDataCache
+from courseware.models import StudentModule
+from courseware.module_render import get_module_for_descriptor
+from django_comment_client.forum.views import single_thread
+from edxmako.shortcuts import render_to_string
+from lms.lib.comment_client import utils as comment_client_utils
+from student.models import CourseEnrollment
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.xml_importer import import_from_xml
+
+from benchmarks.fake_comment_service import FakeCommentService
+
+
+class BenchmarkContext(object):
+    """
+    A generated course imported into the modulestore, and an enrolled
+    student.
+    """
+    def __init__(self, data_dir, course_dir, course_id, seed=0, forum_responses=20, forum_comments=5):
+        self.data_dir = data_dir
+        self.course_dir = course_dir
+        self.course_id = course_id
+        self.seed = seed
+        self.store = modulestore()
+
+        self.import_course()
+
+        self.user = User.objects.create_user('benchmark', 'benchmark@example.com', 'benchmark')
+        CourseEnrollment.enroll(self.user, course_id)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+
+        # The comment client uses the session returned by get_session, so this
+        # makes it talk to the fake service.
+        comment_client_utils._session = FakeCommentService(  # pylint: disable=protected-access
+            course_id, 'benchmark_discussion', responses=forum_responses, comments=forum_comments
+        )
+
+    def import_course(self):
+        """
+        Import the generated course into the modulestore.
+        """
+        import_from_xml(self.store, self.data_dir, [self.course_dir], do_import_static=False)
+
+    def course(self):
+        """
+        The course, with all its descendants loaded.
+        """
+        return self.store.get_instance(self.course_id, CourseDescriptor.id_to_location(self.course_id), depth=None)
+
+    def problems(self, course):
+        """
+        The problem descriptors of `course`, in course order.
+        """
+        problems = []
+        stack = [course]
+        while stack:
+            descriptor = stack.pop()
+            if descriptor.location.category == 'problem':
+                problems.append(descriptor)
+            stack.extend(reversed(descriptor.get_children()))
+        return problems
+
+
+def import_course_scenario(context):
+    """
+    Import the whole course with xml_importer.import_from_xml.
+    """
+    return context.import_course
+
+
+def get_module_scenario(context):
+    """
+    Build the student's module of every problem of the course with
+    module_render.get_module_for_descriptor, as the courseware pages do.
+    """
+    course = context.course()
+    problems = context.problems(course)
+
+    def run():  # pylint: disable=missing-docstring
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            context.course_id, context.user, course, depth=None
+        )
+        for descriptor in problems:
+            get_module_for_descriptor(context.user, context.request, descriptor, field_data_cache, context.course_id)
+    return run
+
+
+def grade_scenario(context):
+    """
+    Grade the student with courseware.grades.grade, after answering every
+    other problem.
+    """
+    course = context.course()
+    for index, descriptor in enumerate(context.problems(course)):
+        if index % 2 == 0:
+            StudentModule.objects.get_or_create(
+                student=context.user,
+                course_id=context.course_id,
+                module_state_key=descriptor.location.url(),
+                defaults={'module_type': 'problem', 'state': '{}', 'grade': 1, 'max_grade': 1},
+            )
+
+    def run():  # pylint: disable=missing-docstring
+        grades.grade(context.user, context.request, course)
+    return run
+
+
+def grade_answers_scenario(context):
+    """
+    Grade the correct answers to every problem of the course with
+    LoncapaProblem.grade_answers.
+    """
+    system = LoncapaSystem(
+        ajax_url='/benchmark',
+        anonymous_student_id='benchmark',
+        cache=None,
+        can_execute_unsafe_code=lambda: False,
+        DEBUG=False,
+        filestore=OSFS(os.path.join(context.data_dir, context.course_dir)),
+        i18n=gettext.NullTranslations(),
+        node_path='',
+        render_template=render_to_string,
+        seed=1,
+        STATIC_URL='/static/',
+        xqueue=None,
+    )
+    problems = []
+    for descriptor in context.problems(context.course()):
+        problem = LoncapaProblem(descriptor.data, id=descriptor.location.html_id(), capa_system=system, seed=1)
+        problems.append((problem, problem.get_question_answers()))
+
+    def run():  # pylint: disable=missing-docstring
+        for problem, answers in problems:
+            problem.grade_answers(answers)
+    return run
+
+
+CALC_TEMPLATES = (
+    "{a}*x^2 + {b}*y - {c}",
+    "sin({a}*x) + cos(y/{b}) * sqrt({c})",
+    "({a}+x)/({b}-y) + e^(-{c}/100)",
+    "{a}k * x + {b}m / (y + {c}) - pi",
+    "sqrt(x^2 + y^2) * {a} / {b} + ln({c})",
+)
+
+
+def calc_scenario(context):
+    """
+    Evaluate formulas of a few shapes with calc.evaluator, as numerical and
+    formula responses do.
+    """
+    rand = random.Random(context.seed)
+    cases = []
+    for index in xrange(200):
+        expression = CALC_TEMPLATES[index % len(CALC_TEMPLATES)].format(
+            a=rand.randint(1, 99), b=rand.randint(1, 99), c=rand.randint(1, 99)
+        )
+        cases.append(({'x': rand.uniform(1, 10), 'y': rand.uniform(1, 10)}, expression))
+
+    def run():  # pylint: disable=missing-docstring
+        for variables, expression in cases:
+            evaluator(variables, {}, expression)
+    return run
+
+
+def forum_thread_scenario(context):
+    """
+    Render a forum thread, with its responses and comments, with the
+    single_thread view as its ajax requests do.
+    """
+    request = RequestFactory().get('/', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    request.user = context.user
+
+    def run():  # pylint: disable=missing-docstring
+        single_thread(request, context.course_id, 'benchmark_discussion', 'thread_0')
+    return run
+
+
+# The scenarios by name, in the order they are run
+SCENARIOS = (
+    ('import_from_xml', import_course_scenario),
+    ('get_module_for_descriptor', get_module_scenario),
+    ('grade', grade_scenario),
+    ('grade_answers', grade_answers_scenario),
+    ('calc_evaluator', calc_scenario),
+    ('forum_thread', forum_thread_scenario),
+)
@@ -0,0 +1,75 @@
+"""
+Tests for the benchmark harness.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.course_generator import CourseSize, generate_course
+from benchmarks.fake_comment_service import FakeCommentService
+from benchmarks.runner import measure
+
+
+class GenerateCourseTest(unittest.TestCase):
+    """
+    Test the generation of synthetic courses.
+    """
+    size = CourseSize(chapters=2, sequentials=2, verticals=1, problems=3)
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+
+    def _files(self, course_dir):
+        """
+        The contents of the files of a generated course, by path.
+        """
+        root = os.path.join(self.data_dir, course_dir)
+        contents = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                with open(path) as course_file:
+                    contents[os.path.relpath(path, root)] = course_file.read()
+        return contents
+
+    def test_shape(self):
+        course_id = generate_course(self.data_dir, 'course', 'Org', 'Num', 'run', self.size)
+        self.assertEqual(course_id, 'Org/Num/run')
+        files = self._files('course')
+        for category, count in [('chapter', 2), ('sequential', 4), ('vertical', 4), ('problem', 12)]:
+            self.assertEqual(len([path for path in files if path.startswith(category + '/')]), count)
+        self.assertIn('course.xml', files)
+        self.assertIn('course/run.xml', files)
+
+    def test_reproducible(self):
+        generate_course(self.data_dir, 'first', 'Org', 'Num', 'run', self.size, seed=3)
+        generate_course(self.data_dir, 'second', 'Org', 'Num', 'run', self.size, seed=3)
+        self.assertEqual(self._files('first'), self._files('second'))
+
+
+class MeasureTest(unittest.TestCase):
+    """
+    Test the measurement of scenarios.
+    """
+    def test_measure(self):
+        calls = []
+        results = measure(lambda: calls.append(1), 3)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(results['runs'], 3)
+        self.assertEqual(len(results['times']), 3)
+        self.assertLessEqual(results['min_seconds'], results['max_seconds'])
+        self.assertEqual(results['calls'], {})
+
+
+class FakeCommentServiceTest(unittest.TestCase):
+    """
+    Test the fake comments service.
+    """
+    def test_thread(self):
+        service = FakeCommentService('Org/Num/run', 'discussion', responses=3, comments=2)
+        thread = service.thread('thread_0')
+        self.assertEqual(len(thread['children']), 3)
+        self.assertEqual(len(thread['children'][0]['children']), 2)
+        self.assertNotIn('children', service.thread('thread_0', recursive=False))
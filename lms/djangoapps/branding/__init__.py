@@ -1,19 +1,15 @@
-from xmodule.modulestore.django import modulestore
-from xmodule.course_module import CourseDescriptor
 from django.conf import settings
 
+from courseware.catalog import get_catalog
 from microsite_configuration.middleware import MicrositeConfiguration
 
 
 def get_visible_courses():
     """
-    Return the set of CourseDescriptors that should be visible in this branded instance
+    Return the CatalogEntries of the courses that should be visible in this branded instance,
+    sorted by course number
     """
-    _courses = modulestore().get_courses()
-
-    courses = [c for c in _courses
-               if isinstance(c, CourseDescriptor)]
-    courses = sorted(courses, key=lambda course: course.number)
+    courses = get_catalog()
 
     subdomain = MicrositeConfiguration.get_microsite_configuration_value('subdomain')
 
@@ -0,0 +1,178 @@
+"""
+Bulk certificate generation for the students enrolled in a course.
+
+Students are processed in chunks, in order of user id.  Certificate statuses
+are looked up one chunk at a time, and the students that need a certificate
+are graded and queued by a pool of worker processes, each holding the course
+and a single xqueue session.  After each chunk completes, a
+CertificateGenerationCheckpoint records the last user id processed, so an
+interrupted run picks up where it stopped.
+"""
+import logging
+from itertools import izip
+from multiprocessing import Pool
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import close_connection
+
+from certificates.models import (
+    CertificateGenerationCheckpoint, CertificateStatuses, certificate_statuses_for_students
+)
+from certificates.queue import XQueueCertInterface
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.django import modulestore, clear_existing_modulestores
+
+log = logging.getLogger(__name__)
+
+# State of the current worker process, set up by _init_worker
+_WORKER = {}
+
+
+def _load_course(course_id):
+    """
+    Load a course with its chapters and sequentials, which grading needs.
+    """
+    return modulestore().get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=2)
+
+
+def _init_worker(course_id, insecure, course=None):
+    """
+    Set up a process to generate certificates for course_id.
+    """
+    if course is None:
+        # We are in a freshly forked process: connections inherited from the
+        # parent can't be shared with it, so drop them and open our own.
+        close_connection()
+        if hasattr(cache, 'close'):
+            cache.close()
+        clear_existing_modulestores()
+        course = _load_course(course_id)
+
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+
+    _WORKER.update(course_id=course_id, course=course, xqueue=xqueue)
+
+
+def _generate_for_students(student_ids):
+    """
+    Grade the given students and queue certificate requests for those that
+    pass.  Returns a list of (username, new status) pairs.
+    """
+    course_id = _WORKER['course_id']
+    results = []
+    students = User.objects.filter(id__in=student_ids).prefetch_related("groups").order_by('id')
+    for student in students:
+        try:
+            new_status = _WORKER['xqueue'].add_cert(student, course_id, course=_WORKER['course'])
+        except Exception:  # pylint: disable=broad-except
+            # One student failing shouldn't stop the run; they keep their
+            # status and will be retried by the next run.
+            log.exception("Unable to generate a certificate for %s in %s", student.username, course_id)
+            new_status = CertificateStatuses.error
+        results.append((student.username, new_status))
+    return results
+
+
+def _chunks(items, chunk_size):
+    """
+    Split a list into lists of at most chunk_size items.
+    """
+    return [items[i:i + chunk_size] for i in xrange(0, len(items), chunk_size)]
+
+
+def generate_certificates(course_id, valid_statuses, workers=1, chunk_size=100,
+                          noop=False, insecure=False, restart=False):
+    """
+    Generate certificates for the students enrolled in a course whose
+    current certificate status is in valid_statuses.
+
+    Arguments:
+        course_id: the course to generate certificates for.
+        valid_statuses: only students with one of these statuses are graded.
+        workers: number of processes grading students in parallel.
+        chunk_size: number of students handed to a worker at a time, and
+            between checkpoints.
+        noop: only find the students that need a certificate, without
+            grading them or queueing anything.
+        insecure: use http for the xqueue callback url.
+        restart: ignore the checkpoint of a previous run and start from the
+            first enrolled student.  The checkpoint itself is only reset
+            without noop.
+
+    Yields, for every chunk of students processed, a tuple
+    (number of students processed so far, total number of students,
+    list of (username, new status) pairs for the chunk).  With noop, the
+    new status is the current one.
+    """
+    try:
+        checkpoint = CertificateGenerationCheckpoint.objects.get(course_id=course_id)
+    except CertificateGenerationCheckpoint.DoesNotExist:
+        checkpoint = CertificateGenerationCheckpoint(course_id=course_id)
+    if restart:
+        checkpoint.last_user_id = 0
+        if not noop:
+            checkpoint.save()
+    elif checkpoint.last_user_id:
+        log.info("Resuming certificate generation for %s after user id %s",
+                 course_id, checkpoint.last_user_id)
+
+    student_ids = list(
+        User.objects.filter(
+            courseenrollment__course_id=course_id, id__gt=checkpoint.last_user_id
+        ).order_by('id').values_list('id', flat=True)
+    )
+    chunks = _chunks(student_ids, chunk_size)
+    total = len(student_ids)
+
+    def students_to_process(chunk):
+        """
+        The students of a chunk whose certificate status needs updating, with
+        their current status.
+        """
+        statuses = certificate_statuses_for_students(chunk, course_id)
+        return [(student_id, statuses[student_id]) for student_id in chunk if statuses[student_id] in valid_statuses]
+
+    if noop:
+        done = 0
+        for chunk in chunks:
+            done += len(chunk)
+            statuses = dict(students_to_process(chunk))
+            students = User.objects.filter(id__in=statuses.keys()).order_by('id')
+            yield done, total, [(student.username, statuses[student.id]) for student in students]
+        return
+
+    def ids_to_process(chunk):
+        """
+        The ids of the students of a chunk whose certificate status needs updating.
+        """
+        return [student_id for student_id, _ in students_to_process(chunk)]
+
+    pool = None
+    if workers > 1:
+        # Children must not share the parent's database connection
+        close_connection()
+        pool = Pool(workers, _init_worker, (course_id, insecure))
+        results = pool.imap(_generate_for_students, (ids_to_process(chunk) for chunk in chunks))
+    else:
+        _init_worker(course_id, insecure, course=_load_course(course_id))
+        results = (_generate_for_students(ids_to_process(chunk)) for chunk in chunks)
+
+    try:
+        done = 0
+        # imap returns results in submission order, so every chunk before the
+        # checkpoint has completed
+        for chunk, chunk_results in izip(chunks, results):
+            done += len(chunk)
+            checkpoint.last_user_id = chunk[-1]
+            checkpoint.save()
+            yield done, total, chunk_results
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    # The whole enrollment set has been processed, so the next run starts over
+    checkpoint.last_user_id = 0
+    checkpoint.save()
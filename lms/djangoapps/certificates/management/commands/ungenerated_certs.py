@@ -1,7 +1,5 @@
 from django.core.management.base import BaseCommand
-from certificates.models import certificate_status_for_student
-from certificates.queue import XQueueCertInterface
-from django.contrib.auth.models import User
+from certificates.generation import generate_certificates
 from optparse import make_option
 from django.conf import settings
 from xmodule.course_module import CourseDescriptor
@@ -21,6 +19,10 @@ class Command(BaseCommand):
 
     Use the --noop option to test without actually putting certificates on the
     queue to be generated.
+
+    Students are processed in chunks by a pool of --workers processes.  A run
+    that is interrupted resumes after the last completed chunk, unless
+    --restart is given.
     """
 
     option_list = BaseCommand.option_list + (
@@ -48,6 +50,23 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('-w', '--workers',
+                    metavar='NUM',
+                    dest='workers',
+                    type='int',
+                    default=1,
+                    help='Number of processes grading students in parallel'),
+        make_option('--chunk-size',
+                    metavar='NUM',
+                    dest='chunk_size',
+                    type='int',
+                    default=100,
+                    help='Number of students handed to a worker at a time'),
+        make_option('--restart',
+                    action='store_true',
+                    dest='restart',
+                    default=False,
+                    help="Start from the first student rather than resuming an interrupted run"),
     )
 
     def handle(self, *args, **options):
@@ -79,39 +98,31 @@ class Command(BaseCommand):
                     ended_courses.append(course_id)
 
         for course_id in ended_courses:
-            # prefetch all chapters/sequentials by saying depth=2
-            course = modulestore().get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=2)
-
             print "Fetching enrolled students for {0}".format(course_id)
-            enrolled_students = User.objects.filter(
-                courseenrollment__course_id=course_id).prefetch_related(
-                    "groups").order_by('username')
-
-            xq = XQueueCertInterface()
-            if options['insecure']:
-                xq.use_https = False
-            total = enrolled_students.count()
-            count = 0
             start = datetime.datetime.now(UTC)
+            last_report = 0
+
+            for count, total, results in generate_certificates(
+                    course_id, valid_statuses,
+                    workers=options['workers'],
+                    chunk_size=options['chunk_size'],
+                    noop=options['noop'],
+                    insecure=options['insecure'],
+                    restart=options['restart']):
+                if not options['noop']:
+                    for username, ret in results:
+                        if ret == 'generating':
+                            print '{0} - {1}'.format(username, ret)
 
-            for student in enrolled_students:
-                count += 1
-                if count % STATUS_INTERVAL == 0:
+                if count - last_report >= STATUS_INTERVAL:
                     # Print a status update with an approximation of
                     # how much time is left based on how long the last
                     # interval took
                     diff = datetime.datetime.now(UTC) - start
-                    timeleft = diff * (total - count) / STATUS_INTERVAL
+                    timeleft = diff * (total - count) / (count - last_report)
                     hours, remainder = divmod(timeleft.seconds, 3600)
                     minutes, seconds = divmod(remainder, 60)
                     print "{0}/{1} completed ~{2:02}:{3:02}m remaining".format(
                         count, total, hours, minutes)
                     start = datetime.datetime.now(UTC)
-
-                if certificate_status_for_student(
-                        student, course_id)['status'] in valid_statuses:
-                    if not options['noop']:
-                        # Add the certificate request to the queue
-                        ret = xq.add_cert(student, course_id, course=course)
-                        if ret == 'generating':
-                            print '{0} - {1}'.format(student, ret)
+                    last_report = count
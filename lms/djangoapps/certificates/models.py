@@ -99,6 +99,33 @@ class GeneratedCertificate(models.Model):
         unique_together = (('user', 'course_id'),)
 
 
+class CertificateGenerationCheckpoint(models.Model):
+    """
+    Records how far the last bulk certificate generation run for a course got.
+
+    Enrolled students are processed in order of user id, so an interrupted run
+    can resume with the students after `last_user_id`.
+    """
+    course_id = models.CharField(max_length=255, unique=True)
+    last_user_id = models.IntegerField(default=0)
+    modified_date = models.DateTimeField(auto_now=True, default=datetime.now)
+
+
+def certificate_statuses_for_students(student_ids, course_id):
+    """
+    Bulk version of certificate_status_for_student: returns a dict mapping
+    each of `student_ids` to its certificate status in the course, with one
+    query.  Students without a certificate are 'unavailable'.
+    """
+    statuses = dict.fromkeys(student_ids, CertificateStatuses.unavailable)
+    statuses.update(
+        GeneratedCertificate.objects.filter(
+            course_id=course_id, user__id__in=student_ids
+        ).values_list('user_id', 'status')
+    )
+    return statuses
+
+
 def certificate_status_for_student(student, course_id):
     '''
     This returns a dictionary with a key for status, and other information.
@@ -131,14 +158,38 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+
+
+def certificate_statuses_for_courses(student, course_ids):
+    """
+    Bulk version of certificate_status_for_student: returns a dict mapping
+    each of `course_ids` to the student's certificate status in it, with one
+    query.
+    """
+    statuses = {
+        course_id: {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+        for course_id in course_ids
+    }
+    if statuses:
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids):
+            statuses[generated_certificate.course_id] = _certificate_status(generated_certificate)
+    return statuses
+
+
+def _certificate_status(generated_certificate):
+    """
+    The status dictionary of certificate_status_for_student for an existing
+    certificate.
+    """
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+
+    return d
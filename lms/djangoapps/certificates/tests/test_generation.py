@@ -0,0 +1,152 @@
+"""
+Tests for bulk certificate generation.
+"""
+from django.test import TestCase
+from mock import patch
+
+from certificates.generation import generate_certificates
+from certificates.models import (
+    CertificateGenerationCheckpoint, CertificateStatuses, GeneratedCertificate,
+    certificate_statuses_for_students
+)
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+
+class CertificateStatusesTest(TestCase):
+    """
+    Tests for certificate_statuses_for_students.
+    """
+    course_id = "edX/Test101/2013"
+
+    def test_statuses(self):
+        with_cert, without_cert = UserFactory.create(), UserFactory.create()
+        GeneratedCertificate.objects.create(
+            user=with_cert, course_id=self.course_id, status=CertificateStatuses.downloadable
+        )
+        GeneratedCertificate.objects.create(
+            user=without_cert, course_id="edX/Other/2013", status=CertificateStatuses.downloadable
+        )
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_students([with_cert.id, without_cert.id], self.course_id)
+        self.assertEqual(statuses, {
+            with_cert.id: CertificateStatuses.downloadable,
+            without_cert.id: CertificateStatuses.unavailable,
+        })
+
+
+class GenerateCertificatesTest(TestCase):
+    """
+    Tests for generate_certificates, run in this process.
+    """
+    course_id = "edX/Test101/2013"
+    valid_statuses = [CertificateStatuses.unavailable, CertificateStatuses.error]
+
+    def setUp(self):
+        self.students = [
+            CourseEnrollmentFactory.create(course_id=self.course_id).user for _ in xrange(4)
+        ]
+        self.students.sort(key=lambda student: student.id)
+
+        patcher = patch('certificates.generation._load_course')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch('certificates.generation.XQueueCertInterface')
+        self.add_cert = patcher.start().return_value.add_cert
+        self.add_cert.return_value = CertificateStatuses.generating
+        self.addCleanup(patcher.stop)
+
+    def generate(self, **kwargs):
+        """
+        Run generate_certificates in chunks of one student, and return the
+        (username, status) results of every chunk.
+        """
+        return [
+            result
+            for _, _, results in generate_certificates(self.course_id, self.valid_statuses, chunk_size=1, **kwargs)
+            for result in results
+        ]
+
+    def generated_for(self):
+        """
+        The students add_cert was called for.
+        """
+        return [call[0][0] for call in self.add_cert.call_args_list]
+
+    def set_checkpoint(self, last_user_id):
+        """
+        Record a checkpoint after last_user_id.
+        """
+        CertificateGenerationCheckpoint.objects.create(course_id=self.course_id, last_user_id=last_user_id)
+
+    def get_checkpoint(self):
+        """
+        The id of the last student the checkpoint records.
+        """
+        return CertificateGenerationCheckpoint.objects.get(course_id=self.course_id).last_user_id
+
+    def test_generates_for_valid_statuses(self):
+        GeneratedCertificate.objects.create(
+            user=self.students[0], course_id=self.course_id, status=CertificateStatuses.downloadable
+        )
+        results = self.generate()
+        self.assertEqual(self.generated_for(), self.students[1:])
+        self.assertEqual(
+            results,
+            [(student.username, CertificateStatuses.generating) for student in self.students[1:]]
+        )
+        # A completed run starts over next time
+        self.assertEqual(self.get_checkpoint(), 0)
+
+    def test_resumes_after_interruption(self):
+        run = generate_certificates(self.course_id, self.valid_statuses, chunk_size=2)
+        run.next()
+        run.close()
+        self.assertEqual(self.get_checkpoint(), self.students[1].id)
+
+        self.add_cert.reset_mock()
+        self.generate()
+        self.assertEqual(self.generated_for(), self.students[2:])
+
+    def test_resumes_after_checkpoint(self):
+        self.set_checkpoint(self.students[1].id)
+        self.generate()
+        self.assertEqual(self.generated_for(), self.students[2:])
+
+    def test_restart(self):
+        self.set_checkpoint(self.students[1].id)
+        self.generate(restart=True)
+        self.assertEqual(self.generated_for(), self.students)
+
+    def test_student_failure(self):
+        def add_cert(student, course_id, course=None):  # pylint: disable=unused-argument
+            """
+            Fail for the second student only.
+            """
+            if student == self.students[1]:
+                raise Exception("Grading failed")
+            return CertificateStatuses.generating
+        self.add_cert.side_effect = add_cert
+
+        results = self.generate()
+        self.assertEqual(self.generated_for(), self.students)
+        self.assertEqual(results[1], (self.students[1].username, CertificateStatuses.error))
+        self.assertEqual(
+            [status for _, status in results[:1] + results[2:]],
+            [CertificateStatuses.generating] * 3
+        )
+
+    def test_noop_changes_nothing(self):
+        self.set_checkpoint(self.students[1].id)
+        results = self.generate(noop=True, restart=True)
+        self.assertFalse(self.add_cert.called)
+        # Everyone is listed with their current status
+        self.assertEqual(
+            results,
+            [(student.username, CertificateStatuses.unavailable) for student in self.students]
+        )
+        self.assertEqual(self.get_checkpoint(), self.students[1].id)
+
+    def test_noop_creates_no_checkpoint(self):
+        self.generate(noop=True)
+        self.assertFalse(CertificateGenerationCheckpoint.objects.filter(course_id=self.course_id).exists())
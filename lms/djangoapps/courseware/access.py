@@ -271,6 +271,34 @@ def _has_access_descriptor(user, descriptor, action, course_context=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def has_access_to_outline_entry(user, entry, course_context):
+    """
+    Check whether user can load the chapter or section described by an entry
+    of a course outline (see courseware.outline), without loading its descriptor.
+
+    Applies the same rules as loading the descriptor itself: entries for
+    descriptors that failed to load are only visible to staff, others are
+    subject to start dates.
+    """
+    if entry.is_error:
+        return _has_staff_access_to_descriptor(user, entry, course_context)
+    return _has_access_descriptor(user, entry, 'load', course_context)
+
+
+def has_access_to_catalog_entry(user, entry, action):
+    """
+    Check whether user has access to do action on the course described by an
+    entry of the course catalog (see courseware.catalog), without loading its
+    descriptor.
+
+    Applies the same rules, and takes the same actions, as for the course
+    descriptor itself.
+    """
+    if not user:
+        user = AnonymousUser()
+    return _has_access_course_desc(user, entry, action)
+
+
 def _has_access_xmodule(user, xmodule, action, course_context):
     """
     Check if user has access to this xmodule.
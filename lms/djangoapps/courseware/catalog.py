@@ -0,0 +1,105 @@
+"""
+A compact index of the courses in the modulestore, used to list and filter
+courses without constructing their descriptors.
+
+The catalog only depends on the course items themselves, so it is cached per
+catalog version (see ModuleStoreReadBase.get_catalog_version), which changes
+whenever a course is created, edited, imported or deleted, and is shared by
+all users.  Per-user data, i.e. whether a user can see a course, is checked
+against the entries when courses are listed.
+"""
+from django.core.cache import cache
+from django.utils.translation import ugettext as _
+
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.django import modulestore
+
+# Catalogs are keyed by version, so they never need invalidating; the timeout
+# only lets catalogs of old versions expire.
+CATALOG_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class CatalogEntry(object):
+    """
+    The fields of a course needed to list it and check who can see it.
+
+    Exposes the attributes that the course listing templates and the access
+    checks read from a course descriptor, so that entries can be used in their
+    place.
+    """
+    def __init__(self, course):
+        self.location = course.location
+        self.id = course.id  # pylint: disable=invalid-name
+        self.org = course.org
+        self.number = course.number
+        self.display_name = course.display_name
+        self.display_name_with_default = course.display_name_with_default
+        self.display_coursenumber = course.display_coursenumber
+        self.display_organization = course.display_organization
+        self.start = course.start
+        self.end = course.end
+        self.advertised_start = course.advertised_start
+        self.announcement = course.announcement
+        self.is_new = course.is_new
+        self.enrollment_start = course.enrollment_start
+        self.enrollment_end = course.enrollment_end
+        self.enrollment_domain = course.enrollment_domain
+        self.ispublic = course.ispublic
+        self.days_early_for_beta = course.days_early_for_beta
+        self.course_image = course.course_image
+        self.static_asset_path = course.static_asset_path
+        self.data_dir = getattr(course, 'data_dir', '')
+        self._class_tags = set(course._class_tags)  # pylint: disable=protected-access
+
+    # These only read the fields above, so they are shared with the descriptor
+    # rather than reimplemented.
+    display_number_with_default = CourseDescriptor.__dict__['display_number_with_default']
+    display_org_with_default = CourseDescriptor.__dict__['display_org_with_default']
+    start_date_is_still_default = CourseDescriptor.__dict__['start_date_is_still_default']
+    is_newish = CourseDescriptor.__dict__['is_newish']
+    sorting_score = CourseDescriptor.__dict__['sorting_score']
+    _sorting_dates = CourseDescriptor.__dict__['_sorting_dates']
+
+    @property
+    def start_date_text(self):
+        """
+        The text of the course's start date, as CourseDescriptor.start_date_text.
+        """
+        if isinstance(self.advertised_start, basestring) or not self.start_date_is_still_default:
+            return CourseDescriptor.__dict__['start_date_text'].fget(self)
+        # Translators: TBD stands for 'To Be Determined' and is used when a course
+        # does not yet have an announced start date.
+        return _('TBD')
+
+    def __repr__(self):
+        return "CatalogEntry({0})".format(self.location.url())
+
+
+def build_catalog(store):
+    """
+    Build the catalog of the courses in `store`: a list of CatalogEntries,
+    sorted by course number.
+    """
+    return sorted(
+        (CatalogEntry(course) for course in store.get_courses() if isinstance(course, CourseDescriptor)),
+        key=lambda entry: entry.number
+    )
+
+
+def get_catalog():
+    """
+    Return the catalog of the courses in the modulestore, from the cache when
+    possible.
+    """
+    store = modulestore()
+    version = store.get_catalog_version()
+    if version is None:
+        # Without a version we can't tell when a cached catalog goes stale
+        return build_catalog(store)
+
+    key = u"courseware.catalog.{0}".format(version)
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = build_catalog(store)
+        cache.set(key, catalog, CATALOG_CACHE_TIMEOUT)
+    return catalog
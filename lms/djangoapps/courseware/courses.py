@@ -5,9 +5,11 @@ import inspect
 import re
 
 from path import path
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.http import Http404
 from django.conf import settings
-from .module_render import get_module
+from .module_render import get_module, get_module_for_descriptor
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore import Location, XML_MODULESTORE_TYPE
 from xmodule.modulestore.django import modulestore, loc_mapper
@@ -15,7 +17,8 @@ from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore.exceptions import ItemNotFoundError, InvalidLocationError
 from courseware.model_data import FieldDataCache
 from static_replace import replace_static_urls
-from courseware.access import has_access
+from courseware.access import has_access, has_access_to_catalog_entry
+from student.models import anonymous_id_for_user
 import branding
 
 log = logging.getLogger(__name__)
@@ -128,6 +131,87 @@ def find_file(filesystem, dirs, filename):
     raise ResourceNotFoundError("Could not find {0}".format(filename))
 
 
+# The about sections that are stored as about items of the course
+ABOUT_ITEM_SECTIONS = (
+    'short_description', 'description', 'key_dates', 'video',
+    'course_staff_short', 'course_staff_extended',
+    'requirements', 'syllabus', 'textbook', 'faq', 'more_info',
+    'number', 'instructors', 'overview',
+    'effort', 'end_date', 'prerequisites', 'ocw_links',
+)
+
+# Bundles are keyed by course version, so they never need invalidating; the
+# timeout only lets bundles of old versions expire.
+ABOUT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def render_course_about_sections(request, course):
+    """
+    Render all the about items of `course`, fetched from the modulestore at
+    once, and return their html by section key.
+
+    The sections are rendered for an anonymous user, as anyone can see the
+    about page, so that the result can be shared by all users; the %%USER_ID%%
+    placeholder of html sections is left in place.
+    """
+    user = AnonymousUser()
+    about_location = Location('i4x', course.location.org, course.location.course, 'about', None)
+    # Use an empty cache
+    field_data_cache = FieldDataCache([], course.id, user)
+
+    sections = {}
+    for descriptor in modulestore().get_items(about_location, course_id=course.id):
+        section_key = descriptor.location.name
+        if section_key not in ABOUT_ITEM_SECTIONS:
+            continue
+        try:
+            about_module = get_module_for_descriptor(
+                user,
+                request,
+                descriptor,
+                field_data_cache,
+                course.id,
+                wrap_xmodule_display=False,
+                static_asset_path=course.static_asset_path
+            )
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Error rendering about section {key} in course {url}".format(
+                key=section_key, url=course.location.url()))
+            continue
+        if about_module is not None:
+            sections[section_key] = about_module.render('student_view').content
+    return sections
+
+
+def get_course_about_sections(request, course):
+    """
+    Return the rendered about sections of `course` by section key, from the
+    cache when possible.
+
+    Bundles are cached per course version, and remembered on `request` so that
+    the page asking for several sections only fetches them once.
+    """
+    bundles = getattr(request, '_course_about_sections', None)
+    if bundles is None:
+        bundles = request._course_about_sections = {}  # pylint: disable=protected-access
+    if course.id in bundles:
+        return bundles[course.id]
+
+    version = modulestore().get_course_version(course.id)
+    if version is None:
+        # Without a version we can't tell when a cached bundle goes stale
+        sections = render_course_about_sections(request, course)
+    else:
+        key = u"courseware.about.{0}.{1}".format(course.id, version)
+        sections = cache.get(key)
+        if sections is None:
+            sections = render_course_about_sections(request, course)
+            cache.set(key, sections, ABOUT_CACHE_TIMEOUT)
+
+    bundles[course.id] = sections
+    return sections
+
+
 def get_course_about_section(course, section_key):
     """
     This returns the snippet of html to be rendered on the course about page,
@@ -157,42 +241,16 @@ def get_course_about_section(course, section_key):
     # good format for defining so many snippets of text/html.
 
 # TODO: Remove number, instructors from this list
-    if section_key in ['short_description', 'description', 'key_dates', 'video',
-                       'course_staff_short', 'course_staff_extended',
-                       'requirements', 'syllabus', 'textbook', 'faq', 'more_info',
-                       'number', 'instructors', 'overview',
-                       'effort', 'end_date', 'prerequisites', 'ocw_links']:
+    if section_key in ABOUT_ITEM_SECTIONS:
+        request = get_request_for_thread()
+        html = get_course_about_sections(request, course).get(section_key, '')
 
-        try:
-
-            request = get_request_for_thread()
-
-            loc = course.location.replace(category='about', name=section_key)
+        # The bundle is shared by all users, so the user's id is filled in here
+        anonymous_student_id = anonymous_id_for_user(request.user, '')
+        if anonymous_student_id:
+            html = html.replace("%%USER_ID%%", anonymous_student_id)
+        return html
 
-            # Use an empty cache
-            field_data_cache = FieldDataCache([], course.id, request.user)
-            about_module = get_module(
-                request.user,
-                request,
-                loc,
-                field_data_cache,
-                course.id,
-                not_found_ok=True,
-                wrap_xmodule_display=False,
-                static_asset_path=course.static_asset_path
-            )
-
-            html = ''
-
-            if about_module is not None:
-                html = about_module.render('student_view').content
-
-            return html
-
-        except ItemNotFoundError:
-            log.warning("Missing about section {key} in course {url}".format(
-                key=section_key, url=course.location.url()))
-            return None
     elif section_key == "title":
         return course.display_name_with_default
     elif section_key == "university":
@@ -292,10 +350,11 @@ def get_courses_by_university(user, domain=None):
 
 def get_courses(user, domain=None):
     '''
-    Returns a list of courses available, sorted by course.number
+    Returns a list of the catalog entries (see courseware.catalog) of the
+    courses available, sorted by course.number
     '''
     courses = branding.get_visible_courses()
-    courses = [c for c in courses if has_access(user, c, 'see_exists')]
+    courses = [c for c in courses if has_access_to_catalog_entry(user, c, 'see_exists')]
 
     courses = sorted(courses, key=lambda course: course.number)
 
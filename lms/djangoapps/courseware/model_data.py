@@ -7,13 +7,15 @@ from collections import defaultdict
 from itertools import chain
 from .models import (
     StudentModule,
+    XModuleAggregateCounter,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
     XModuleStudentInfoField
 )
 import logging
 
-from django.db import DatabaseError
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Sum
 from django.contrib.auth.models import User
 
 from xblock.runtime import KeyValueStore
@@ -384,3 +386,68 @@ class DjangoKeyValueStore(KeyValueStore):
             return key.field_name in json.loads(field_object.state)
         else:
             return True
+
+
+class DjangoAggregateCounters(object):
+    """
+    The LMS implementation of ModuleSystem.aggregate_counters: tallies kept
+    in the Scope.user_state_summary scope, with each counter stored as its own
+    XModuleAggregateCounter row.
+
+    Tallies are identified by the usage id of the module keeping them and a
+    field name.  Increments are atomic, so concurrent submissions neither
+    overwrite each other nor all wait on a single row.
+    """
+    def _counters(self, usage_id, field_name):
+        """
+        The counters of a tally
+        """
+        return XModuleAggregateCounter.objects.filter(usage_id=usage_id, field_name=field_name)
+
+    def increment(self, usage_id, field_name, deltas):
+        """
+        Add deltas, a dict mapping keys to amounts, to the counters of the tally.
+        """
+        max_length = XModuleAggregateCounter.MAX_KEY_LENGTH
+        # always update rows in the same order so concurrent increments can't deadlock
+        for key, delta in sorted(deltas.iteritems()):
+            key = key[:max_length]
+            counter = self._counters(usage_id, field_name).filter(key=key)
+            if counter.update(count=F('count') + delta):
+                continue
+            # A failed insert aborts the whole transaction on some databases,
+            # so only roll back to before it.
+            sid = transaction.savepoint()
+            try:
+                XModuleAggregateCounter.objects.create(
+                    usage_id=usage_id, field_name=field_name, key=key, count=delta
+                )
+                transaction.savepoint_commit(sid)
+            except IntegrityError:
+                # Another request created the counter first, so add to it
+                transaction.savepoint_rollback(sid)
+                counter.update(count=F('count') + delta)
+
+    def get_many(self, usage_id, field_name, keys):
+        """
+        Return a dict mapping each of keys to its count in the tally.
+        """
+        max_length = XModuleAggregateCounter.MAX_KEY_LENGTH
+        counts = dict(
+            self._counters(usage_id, field_name).filter(
+                key__in=[key[:max_length] for key in keys]
+            ).values_list('key', 'count')
+        )
+        return dict((key, counts.get(key[:max_length], 0)) for key in keys)
+
+    def top(self, usage_id, field_name, amount):
+        """
+        Return the `amount` largest counters of the tally, as a list of (key, count) pairs.
+        """
+        return list(self._counters(usage_id, field_name).order_by('-count').values_list('key', 'count')[:amount])
+
+    def total(self, usage_id, field_name):
+        """
+        Return the sum of all the counters of the tally.
+        """
+        return self._counters(usage_id, field_name).aggregate(total=Sum('count'))['total'] or 0
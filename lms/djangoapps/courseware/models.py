@@ -150,6 +150,44 @@ class XModuleUserStateSummaryField(models.Model):
         return unicode(repr(self))
 
 
+class XModuleAggregateCounter(models.Model):
+    """
+    Stores one counter of a tally kept in the Scope.user_state_summary scope,
+    e.g. the number of votes for one answer of a poll.
+
+    Each counter is its own row, so that concurrent submissions increment
+    different rows atomically rather than rewriting a shared field value.
+    """
+
+    class Meta:
+        unique_together = (('usage_id', 'field_name', 'key'),)
+
+    # The longest key that can be counted; longer keys are truncated
+    MAX_KEY_LENGTH = 255
+
+    # The name of the tally
+    field_name = models.CharField(max_length=64)
+
+    # The usage id of the module keeping the tally
+    usage_id = models.CharField(max_length=255)
+
+    # What is counted, e.g. the id of a poll answer
+    key = models.CharField(max_length=MAX_KEY_LENGTH)
+
+    count = models.IntegerField(default=0, db_index=True)
+
+    def __repr__(self):
+        return 'XModuleAggregateCounter<%r>' % ({
+            'field_name': self.field_name,
+            'usage_id': self.usage_id,
+            'key': self.key,
+            'count': self.count,
+        },)
+
+    def __unicode__(self):
+        return unicode(repr(self))
+
+
 class XModuleStudentPrefsField(models.Model):
     """
     Stores data set in the Scope.preferences scope by an xmodule field
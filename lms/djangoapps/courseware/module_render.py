@@ -19,7 +19,8 @@ from django.views.decorators.csrf import csrf_exempt
 from capa.xqueue_interface import XQueueInterface
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import setup_masquerade
-from courseware.model_data import FieldDataCache, DjangoKeyValueStore
+from courseware.model_data import FieldDataCache, DjangoKeyValueStore, DjangoAggregateCounters
+from courseware.outline import get_course_outline, toc_from_outline
 from lms.lib.xblock.field_data import LmsFieldData
 from lms.lib.xblock.runtime import LmsModuleSystem, unquote_slashes
 from edxmako.shortcuts import render_to_string
@@ -92,8 +93,30 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     None if this is not the case.
 
     field_data_cache must include data from the course module and 2 levels of its descendents
+
+    The table of contents is built from the course's precomputed outline when
+    possible, and from the course's module tree otherwise.
     '''
+    outline = get_course_outline(course)
+    if outline is None:
+        return _toc_from_modules(user, request, course, active_chapter, active_section, field_data_cache)
+
+    # allow course staff to masquerade as student
+    if has_access(user, course, 'staff', course.id):
+        setup_masquerade(request, True)
 
+    # Do not check access when it's a noauth request.
+    if getattr(user, 'known', True) and not has_access(user, course, 'load', course.id):
+        return None
+
+    return toc_from_outline(user, course.id, outline, active_chapter, active_section, field_data_cache)
+
+
+def _toc_from_modules(user, request, course, active_chapter, active_section, field_data_cache):
+    '''
+    Create a table of contents by constructing the course's chapter and section
+    modules. See toc_for_course for details.
+    '''
     course_module = get_module_for_descriptor(user, request, course, field_data_cache, course.id)
     if course_module is None:
         return None
@@ -434,6 +457,7 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
             'i18n': django.utils.translation,
         },
         get_user_role=lambda: get_user_role(user, course_id),
+        aggregate_counters=DjangoAggregateCounters(),
     )
 
     # pass position specified in URL to module through ModuleSystem
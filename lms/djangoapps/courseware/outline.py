@@ -0,0 +1,174 @@
+"""
+A compact index of a course's chapters and sections, used to build the
+courseware table of contents without constructing any XModules.
+
+The outline only depends on course content, so it is cached per course
+version (see ModuleStoreReadBase.get_course_version) and shared by all users.
+Per-user data, i.e. access and extended due dates, is applied when the table
+of contents is built from it.
+"""
+import json
+
+from django.core.cache import cache
+from xblock.fields import Scope
+
+from courseware.access import has_access_to_outline_entry
+from courseware.model_data import DjangoKeyValueStore
+from xmodule.error_module import ErrorDescriptor
+from xmodule.fields import Date
+from xmodule.modulestore.django import modulestore
+from xmodule.util.duedate import get_extended_due_date
+from xmodule.x_module import XModule
+
+# Outlines are keyed by course version, so they never need invalidating; the
+# timeout only lets outlines of old versions expire.
+OUTLINE_CACHE_TIMEOUT = 24 * 60 * 60
+
+DATE_FIELD = Date()
+
+
+class OutlineEntry(object):
+    """
+    The metadata of a chapter or section needed for the table of contents.
+
+    Exposes the attributes that the access checks read from a descriptor, so
+    that access can be checked against an entry directly.
+    """
+    def __init__(self, descriptor):
+        self.location = descriptor.location
+        self.url_name = descriptor.url_name
+        self.display_name = descriptor.display_name_with_default
+        self.is_error = isinstance(descriptor, ErrorDescriptor)
+        self.hide_from_toc = getattr(descriptor, 'hide_from_toc', False)
+        self.start = descriptor.start
+        self.days_early_for_beta = getattr(descriptor, 'days_early_for_beta', None)
+        self._class_tags = set(descriptor._class_tags)  # pylint: disable=protected-access
+        self.due = getattr(descriptor, 'due', None)
+        self.format = getattr(descriptor, 'format', None)
+        self.graded = getattr(descriptor, 'graded', False)
+        self.children = []
+
+    def __repr__(self):
+        return "OutlineEntry({0})".format(self.location.url())
+
+
+def _has_static_children(descriptor):
+    """
+    Returns whether the children a user sees of this descriptor can be known
+    without constructing its XModule.
+
+    Modules such as ABTests pick their children per user, so courses containing
+    them as chapters or sections can't be described by a shared outline.
+    """
+    module_class = getattr(descriptor, 'module_class', None)
+    if module_class is None or not issubclass(module_class, XModule):
+        return True
+    return (
+        module_class.get_child_descriptors.im_func is XModule.get_child_descriptors.im_func and
+        module_class.displayable_items.im_func is XModule.displayable_items.im_func
+    )
+
+
+def build_course_outline(course):
+    """
+    Build the outline of `course`: a list of chapter OutlineEntries, each with
+    its sections as children.
+
+    Returns None if the course's table of contents depends on per-user module
+    state and so can't be precomputed.
+    """
+    if not _has_static_children(course):
+        return None
+
+    chapters = []
+    for chapter in course.get_children():
+        if not _has_static_children(chapter):
+            return None
+        chapter_entry = OutlineEntry(chapter)
+        for section in chapter.get_children():
+            if not _has_static_children(section):
+                return None
+            chapter_entry.children.append(OutlineEntry(section))
+        chapters.append(chapter_entry)
+    return chapters
+
+
+def get_course_outline(course):
+    """
+    Return the outline of `course`, from the cache when possible.
+
+    Returns None if the course's outline can't be precomputed.
+    """
+    version = modulestore().get_course_version(course.id)
+    if version is None:
+        # Without a version we can't tell when a cached outline goes stale
+        return build_course_outline(course)
+
+    key = u"courseware.outline.{0}.{1}".format(course.id, version)
+    outline = cache.get(key)
+    if outline is None:
+        outline = build_course_outline(course)
+        # An outline that can't be precomputed is cached as an empty marker,
+        # so that the course isn't walked again on every page
+        cache.set(key, outline if outline is not None else False, OUTLINE_CACHE_TIMEOUT)
+    return outline if outline is not False else None
+
+
+def _get_due_date(user, section, field_data_cache):
+    """
+    Return the due date of a section for user, taking extensions granted to
+    the user into account.
+    """
+    if section.due is None or field_data_cache is None:
+        return section.due
+
+    key = DjangoKeyValueStore.Key(
+        scope=Scope.user_state,
+        user_id=user.id,
+        block_scope_id=section.location,
+        field_name='extended_due'
+    )
+    student_module = field_data_cache.find(key)
+    extended_due = None
+    if student_module is not None and student_module.state:
+        extended_due = DATE_FIELD.from_json(json.loads(student_module.state).get('extended_due'))
+    return get_extended_due_date({'due': section.due, 'extended_due': extended_due})
+
+
+def toc_from_outline(user, course_id, outline, active_chapter, active_section, field_data_cache):
+    """
+    Build the table of contents of a course for user from its outline.
+
+    See courseware.module_render.toc_for_course for the return format.
+    """
+    def can_load(entry):
+        """
+        Whether the user may see the chapter or section described by entry.
+        """
+        # Do not check access when it's a noauth request.
+        return not getattr(user, 'known', True) or has_access_to_outline_entry(user, entry, course_id)
+
+    chapters = list()
+    for chapter in outline:
+        if chapter.hide_from_toc or not can_load(chapter):
+            continue
+
+        sections = list()
+        for section in chapter.children:
+            if section.hide_from_toc or not can_load(section):
+                continue
+
+            sections.append({'display_name': section.display_name,
+                             'url_name': section.url_name,
+                             'format': section.format if section.format is not None else '',
+                             'due': _get_due_date(user, section, field_data_cache),
+                             'active': (chapter.url_name == active_chapter and
+                                        section.url_name == active_section),
+                             'graded': section.graded,
+                             })
+
+        chapters.append({'display_name': chapter.display_name,
+                         'url_name': chapter.url_name,
+                         'sections': sections,
+                         'active': chapter.url_name == active_chapter})
+    return chapters
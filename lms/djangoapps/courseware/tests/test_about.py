@@ -2,12 +2,18 @@
 Test the about xblock
 """
 import mock
+from django.core.cache import cache
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 
 from .helpers import LoginEnrollmentTestCase
+from courseware.courses import get_course_about_section, render_course_about_sections
+from student.models import anonymous_id_for_user
+from student.tests.factories import UserFactory
+from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
-from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE, TEST_DATA_MONGO_MODULESTORE
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 
@@ -102,3 +108,68 @@ class AboutWithCappedEnrollmentsTestCase(LoginEnrollmentTestCase, ModuleStoreTes
         # Try to enroll as well
         result = self.enroll(self.course)
         self.assertFalse(result)
+
+
+def _about_section(request, course, section_key):  # pylint: disable=unused-argument
+    """
+    get_course_about_section, called with `request` on the stack as views do.
+    """
+    return get_course_about_section(course, section_key)
+
+
+@override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
+class AboutSectionsTestCase(ModuleStoreTestCase):
+    """
+    Test the bundled rendering of about sections
+    """
+    def setUp(self):
+        # Bundles of an earlier test's course with the same id mustn't be used
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course = CourseFactory.create()
+        self.overview = ItemFactory.create(
+            category="about", parent_location=self.course.location,
+            data="Hello %%USER_ID%%", display_name="overview"
+        )
+        ItemFactory.create(
+            category="about", parent_location=self.course.location,
+            data="4 hours", display_name="effort"
+        )
+
+    def _request(self, user):
+        """
+        A new request made by `user`.
+        """
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    @mock.patch('courseware.courses.cache.get', mock.Mock(return_value=None))
+    def test_sections_rendered_once_per_request(self):
+        request = self._request(UserFactory.create())
+        with mock.patch('courseware.courses.render_course_about_sections',
+                        side_effect=render_course_about_sections) as render:
+            self.assertEqual(_about_section(request, self.course, 'effort'), '4 hours')
+            self.assertEqual(_about_section(request, self.course, 'video'), '')
+        self.assertEqual(render.call_count, 1)
+
+    def test_user_id_filled_in_per_user(self):
+        first, second = UserFactory.create(), UserFactory.create()
+        for user in (first, second):
+            self.assertIn(
+                "Hello {0}".format(anonymous_id_for_user(user, '')),
+                _about_section(self._request(user), self.course, 'overview')
+            )
+
+    def test_sections_follow_course_changes(self):
+        self.assertIsNotNone(modulestore().get_course_version(self.course.id))
+        with mock.patch('courseware.courses.render_course_about_sections',
+                        side_effect=render_course_about_sections) as render:
+            self.assertIn("4 hours", _about_section(self._request(UserFactory.create()), self.course, 'effort'))
+            self.assertIn("4 hours", _about_section(self._request(UserFactory.create()), self.course, 'effort'))
+            self.assertEqual(render.call_count, 1)
+
+            # Studio saves about text with update_item
+            modulestore().update_item(self.course.location.replace(category='about', name='effort'), "6 hours")
+            self.assertIn("6 hours", _about_section(self._request(UserFactory.create()), self.course, 'effort'))
+            self.assertEqual(render.call_count, 2)
@@ -4,15 +4,18 @@ Tests for course access
 """
 import mock
 
+from django.contrib.auth.models import AnonymousUser
 from django.http import Http404
 from django.test.utils import override_settings
-from xmodule.modulestore.django import get_default_store_name_for_current_request
+from xmodule.modulestore.django import get_default_store_name_for_current_request, modulestore
+from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.tests.xml import factories as xml
 from xmodule.tests.xml import XModuleXmlImportTest
 
-from courseware.courses import get_course_by_id, get_course, get_cms_course_link, course_image_url
+from courseware.catalog import CatalogEntry, get_catalog
+from courseware.courses import get_course_by_id, get_course, get_cms_course_link, course_image_url, get_courses
 from courseware.tests.tests import TEST_DATA_MONGO_MODULESTORE
 
 
@@ -118,6 +121,39 @@ class MongoCourseImageTestCase(ModuleStoreTestCase):
         )
 
 
+@override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
+class CatalogTestCase(ModuleStoreTestCase):
+    """Tests for the course catalog."""
+
+    def test_entries_match_courses(self):
+        course = CourseFactory.create(
+            org='edX', course='999', display_name='Catalog', advertised_start='Spring', display_coursenumber='CAT'
+        )
+        entry = CatalogEntry(course)
+        for attr in ('id', 'org', 'number', 'display_name_with_default', 'display_number_with_default',
+                     'display_org_with_default', 'start_date_is_still_default', 'start_date_text', 'is_newish',
+                     'sorting_score'):
+            self.assertEqual(getattr(entry, attr), getattr(course, attr), attr)
+        self.assertEqual(course_image_url(entry), course_image_url(course))
+
+    def test_catalog_follows_course_changes(self):
+        first = CourseFactory.create(org='edX', course='999', display_name='First')
+        self.assertEqual([entry.id for entry in get_catalog()], [first.id])
+
+        second = CourseFactory.create(org='edX', course='100', display_name='Second')
+        self.assertEqual([entry.id for entry in get_catalog()], [second.id, first.id])
+
+        second.display_name = 'Renamed'
+        modulestore().update_metadata(second.location, own_metadata(second))
+        self.assertEqual([entry.display_name for entry in get_catalog()], ['Renamed', 'First'])
+
+    @mock.patch.dict('django.conf.settings.FEATURES', {'ACCESS_REQUIRE_STAFF_FOR_COURSE': True})
+    def test_get_courses_filters_by_access(self):
+        public = CourseFactory.create(org='edX', course='999', display_name='Public', ispublic=True)
+        CourseFactory.create(org='edX', course='100', display_name='Private', ispublic=False)
+        self.assertEqual([entry.id for entry in get_courses(AnonymousUser())], [public.id])
+
+
 class XmlCourseImageTestCase(XModuleXmlImportTest):
     """Tests for course image URLs when using an xml modulestore."""
 
@@ -5,9 +5,9 @@ import json
 from mock import Mock, patch
 from functools import partial
 
-from courseware.model_data import DjangoKeyValueStore
+from courseware.model_data import DjangoKeyValueStore, DjangoAggregateCounters
 from courseware.model_data import InvalidScopeError, FieldDataCache
-from courseware.models import StudentModule, XModuleUserStateSummaryField
+from courseware.models import StudentModule, XModuleUserStateSummaryField, XModuleAggregateCounter
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
 from student.tests.factories import UserFactory
@@ -16,9 +16,14 @@ from courseware.tests.factories import UserStateSummaryFactory
 from courseware.tests.factories import StudentPrefsFactory, StudentInfoFactory
 
 from xblock.fields import Scope, BlockScope, ScopeIds
+from xblock.field_data import DictFieldData
 from xmodule.modulestore import Location
+from xmodule.poll_module import PollDescriptor
+from xmodule.tests import get_test_system
+from xmodule.word_cloud_module import WordCloudDescriptor
+from webob.multidict import MultiDict
 from django.test import TestCase
-from django.db import DatabaseError
+from django.db import DatabaseError, transaction
 from xblock.core import KeyValueMultiSaveError
 
 
@@ -309,3 +314,110 @@ class TestStudentInfoStorage(StorageTestBase, TestCase):
     scope = Scope.user_info
     key_factory = user_info_key
     storage_class = XModuleStudentInfoField
+
+
+class TestAggregateCounters(TestCase):
+    """Tests for DjangoAggregateCounters"""
+
+    def setUp(self):
+        self.counters = DjangoAggregateCounters()
+        self.usage_id = location('usage_id').url()
+
+    def test_increment(self):
+        self.counters.increment(self.usage_id, 'votes', {'a': 1, 'b': 2})
+        self.counters.increment(self.usage_id, 'votes', {'a': 3, 'c': 1})
+        self.counters.increment(self.usage_id, 'votes', {'c': -1})
+        self.counters.increment(location('other_id').url(), 'votes', {'a': 10})
+        self.counters.increment(self.usage_id, 'other_votes', {'a': 10})
+
+        self.assertEquals(
+            {'a': 4, 'b': 2, 'c': 0, 'd': 0},
+            self.counters.get_many(self.usage_id, 'votes', ['a', 'b', 'c', 'd'])
+        )
+        self.assertEquals(6, self.counters.total(self.usage_id, 'votes'))
+        self.assertEquals([('a', 4), ('b', 2)], self.counters.top(self.usage_id, 'votes', 2))
+
+    def test_long_keys(self):
+        key = 'x' * 300
+        self.counters.increment(self.usage_id, 'votes', {key: 1})
+        self.counters.increment(self.usage_id, 'votes', {key: 1})
+        self.assertEquals({key: 2}, self.counters.get_many(self.usage_id, 'votes', [key]))
+
+    def test_empty_tally(self):
+        self.assertEquals(0, self.counters.total(self.usage_id, 'votes'))
+        self.assertEquals([], self.counters.top(self.usage_id, 'votes', 5))
+
+    def test_concurrent_create(self):
+        # Another request creates the counter between our update and insert
+        real_savepoint = transaction.savepoint
+
+        def savepoint_after_concurrent_create():
+            XModuleAggregateCounter.objects.create(usage_id=self.usage_id, field_name='votes', key='a', count=1)
+            return real_savepoint()
+
+        with patch('courseware.model_data.transaction.savepoint', side_effect=savepoint_after_concurrent_create):
+            self.counters.increment(self.usage_id, 'votes', {'a': 1})
+        self.assertEquals({'a': 2}, self.counters.get_many(self.usage_id, 'votes', ['a']))
+
+
+class TestModulesCountingAggregates(TestCase):
+    """Tests of the Poll and WordCloud modules keeping their tallies in DjangoAggregateCounters"""
+
+    def create_module(self, descriptor_class, category, field_data):
+        """
+        Return a module of `descriptor_class` for a new student, all of them
+        with the same usage id and counting through DjangoAggregateCounters.
+        """
+        system = get_test_system()
+        system.aggregate_counters = DjangoAggregateCounters()
+        usage_id = Location('i4x', 'edX', 'test_course', category, 'counted')
+        scope_ids = ScopeIds(UserFactory.create().id, category, usage_id, usage_id)
+        return descriptor_class.module_class(Mock(), system, DictFieldData(dict(field_data)), scope_ids)
+
+    def test_poll(self):
+        field_data = {
+            'answers': [{'id': 'Yes', 'text': 'Yes'}, {'id': 'No', 'text': 'No'}],
+            # Votes counted before the aggregate counters are kept
+            'poll_answers': {'Yes': 1},
+        }
+        first = self.create_module(PollDescriptor, 'poll_question', field_data)
+        second = self.create_module(PollDescriptor, 'poll_question', field_data)
+
+        first.handle_ajax('Yes', {})
+        response = json.loads(second.handle_ajax('No', {}))
+        self.assertEquals({'Yes': 2, 'No': 1}, response['poll_answers'])
+        self.assertEquals(3, response['total'])
+        self.assertEquals(
+            {'Yes': 1, 'No': 1},
+            DjangoAggregateCounters().get_many(first.location.url(), 'poll_answers', ['Yes', 'No'])
+        )
+        # The votes aren't stored in the shared field
+        self.assertEquals({'Yes': 1}, second.poll_answers)
+
+        first.handle_ajax('reset_poll', {})
+        response = json.loads(second.handle_ajax('get_state', {}))
+        self.assertEquals({'Yes': 1, 'No': 1}, response['poll_answers'])
+
+    def test_word_cloud(self):
+        # Words entered before the aggregate counters are kept
+        field_data = {'all_words': {'cat': 1}, 'top_words': {'cat': 1}}
+        first = self.create_module(WordCloudDescriptor, 'word_cloud', field_data)
+        second = self.create_module(WordCloudDescriptor, 'word_cloud', field_data)
+
+        first.handle_ajax('submit', MultiDict(('student_words[]', word) for word in ['cat', 'Cat', 'dog']))
+        response = json.loads(
+            second.handle_ajax('submit', MultiDict(('student_words[]', word) for word in ['cat', 'sun']))
+        )
+        self.assertEquals('success', response['status'])
+        self.assertEquals(6, response['total_count'])
+        self.assertEquals({'cat': 4, 'sun': 1}, response['student_words'])
+        self.assertEquals(
+            {'cat': 4, 'dog': 1, 'sun': 1},
+            dict((word['text'], word['size']) for word in response['top_words'])
+        )
+        self.assertEquals(
+            {'cat': 3, 'dog': 1, 'sun': 1},
+            DjangoAggregateCounters().get_many(first.location.url(), 'all_words', ['cat', 'dog', 'sun'])
+        )
+        # The words aren't stored in the shared fields
+        self.assertEquals({'cat': 1}, second.all_words)
@@ -1,6 +1,7 @@
 """
 Test for lms courseware app, module render unit
 """
+from datetime import datetime, timedelta
 from ddt import ddt, data
 from mock import MagicMock, patch, Mock
 import json
@@ -11,6 +12,7 @@ from django.conf import settings
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
+from django.utils.timezone import UTC
 
 from xblock.field_data import FieldData
 from xblock.runtime import Runtime
@@ -25,6 +27,7 @@ import courseware.module_render as render
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
 from courseware.model_data import FieldDataCache
+from courseware.outline import build_course_outline
 
 from courseware.courses import get_course_with_access, course_image_url, get_course_info_section
 
@@ -368,6 +371,31 @@ class TestTOC(TestCase):
             self.assertIn(toc_section, actual)
 
 
+    @patch('courseware.module_render.get_module_for_descriptor')
+    def test_toc_does_not_build_modules(self, mock_get_module):
+        request = RequestFactory().get('/courses/{0}/Overview'.format(self.course_name))
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.toy_course.id, self.portal_user, self.toy_course, depth=2)
+
+        actual = render.toc_for_course(self.portal_user, request, self.toy_course, 'Overview', 'Welcome', field_data_cache)
+        self.assertFalse(mock_get_module.called)
+        self.assertIn('Welcome', [section['url_name'] for section in actual[0]['sections']])
+
+    def test_toc_hides_unstarted_sections(self):
+        request = RequestFactory().get('/courses/{0}/Overview'.format(self.course_name))
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.toy_course.id, self.portal_user, self.toy_course, depth=2)
+
+        outline = build_course_outline(self.toy_course)
+        outline[0].children[0].start = datetime.now(UTC()) + timedelta(days=1)
+        with patch('courseware.module_render.get_course_outline', return_value=outline):
+            with patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False}):
+                actual = render.toc_for_course(
+                    self.portal_user, request, self.toy_course, 'Overview', None, field_data_cache
+                )
+        self.assertNotIn(outline[0].children[0].url_name, [section['url_name'] for section in actual[0]['sections']])
+
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class TestHtmlModifiers(ModuleStoreTestCase):
     """
@@ -13,6 +13,7 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from courseware.tests.helpers import LoginEnrollmentTestCase, check_for_get_code
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from session_inactivity_timeout.middleware import LAST_TOUCH_KEYNAME
 
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
@@ -64,6 +65,25 @@ class TestNavigation(ModuleStoreTestCase, LoginEnrollmentTestCase):
         # re-request, and we should get a redirect to login page
         self.assertRedirects(resp, settings.LOGIN_REDIRECT_URL + '?next=' + reverse('dashboard'))
 
+    @override_settings(SESSION_INACTIVITY_TIMEOUT_IN_SECONDS=600, SESSION_ACTIVITY_SAVE_DELAY_SECONDS=60)
+    def test_session_activity_saved_after_delay(self):
+        """
+        Verify that the time of the last request is only stored again once it
+        is behind by more than the save delay
+        """
+        email, password = self.STUDENT_INFO[0]
+        self.login(email, password)
+
+        self.assertEquals(self.client.get(reverse('dashboard')).status_code, 200)
+        last_touch = self.client.session[LAST_TOUCH_KEYNAME]
+
+        self.assertEquals(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertEquals(self.client.session[LAST_TOUCH_KEYNAME], last_touch)
+
+        with override_settings(SESSION_ACTIVITY_SAVE_DELAY_SECONDS=0):
+            self.assertEquals(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertGreater(self.client.session[LAST_TOUCH_KEYNAME], last_touch)
+
     def test_redirects_first_time(self):
         """
         Verify that the first time we click on the courseware tab we are
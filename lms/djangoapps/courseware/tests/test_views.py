@@ -6,6 +6,7 @@ from mock import MagicMock, patch
 from datetime import datetime
 from pytz import UTC
 
+from django.core.cache import get_cache
 from django.test import TestCase
 from django.http import Http404
 from django.test.utils import override_settings
@@ -73,6 +74,7 @@ class TestJumpTo(TestCase):
 class ViewsTestCase(TestCase):
     """ Tests for views.py methods. """
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = User.objects.create(username='dummy', password='123456',
                                         email='test@mit.edu')
         self.date = datetime(2013, 1, 22, tzinfo=UTC)
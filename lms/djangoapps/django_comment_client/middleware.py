@@ -1,4 +1,5 @@
 from lms.lib.comment_client import CommentClientRequestError
+import lms.lib.comment_client.utils as cc_utils
 from django_comment_client.utils import JsonError
 import json
 import logging
@@ -22,3 +23,27 @@ class AjaxExceptionMiddleware(object):
             except ValueError:
                 return JsonError(exception.message, exception.status_code)
         return None
+
+
+class CommentClientRequestScopeMiddleware(object):
+    """
+    Middleware that coalesces identical comments service GETs made while serving a request
+    """
+    def process_request(self, request):
+        """
+        Starts collecting comments service responses for this request
+        """
+        cc_utils.start_request_scope()
+
+    def process_response(self, request, response):
+        """
+        Drops the responses collected while serving this request
+        """
+        cc_utils.end_request_scope()
+        return response
+
+    def process_exception(self, request, exception):
+        """
+        Drops the responses collected while serving a request that failed
+        """
+        cc_utils.end_request_scope()
@@ -1,8 +1,11 @@
 import django.http
+from django.core.cache import cache
 from django.test import TestCase
 import json
+from mock import patch
 
 import lms.lib.comment_client
+import lms.lib.comment_client.utils as cc_utils
 import django_comment_client.middleware as middleware
 
 
@@ -37,3 +40,116 @@ class AjaxExceptionTestCase(TestCase):
         self.assertIsNone(self.a.process_exception(self.request1, self.exception0))
         self.assertIsNone(self.a.process_exception(self.request0, self.exception1))
         self.assertIsNone(self.a.process_exception(self.request0, self.exception0))
+
+
+@patch('lms.lib.comment_client.utils.requests.Session.request')
+class CommentClientRequestScopeTestCase(TestCase):
+    def setUp(self):
+        self.middleware = middleware.CommentClientRequestScopeMiddleware()
+        self.request = django.http.HttpRequest()
+        self.url = 'http://localhost:4567/api/v1/users/1'
+
+    def _respond(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.text = '{"id": "1"}'
+
+    def test_identical_gets_are_coalesced(self, mock_request):
+        self._respond(mock_request)
+        self.middleware.process_request(self.request)
+        cc_utils.perform_request('get', self.url, {'complete': True})
+        self.assertEqual(
+            {'id': '1'},
+            cc_utils.perform_request('get', self.url, {'complete': True})
+        )
+        self.assertEqual(1, mock_request.call_count)
+
+        cc_utils.perform_request('get', self.url, {'complete': False})
+        self.assertEqual(2, mock_request.call_count)
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+
+    def test_write_discards_responses(self, mock_request):
+        self._respond(mock_request)
+        self.middleware.process_request(self.request)
+        cc_utils.perform_request('get', self.url)
+        cc_utils.perform_request('put', self.url, {'username': 'foo'})
+        cc_utils.perform_request('get', self.url)
+        self.assertEqual(3, mock_request.call_count)
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+
+    def test_no_coalescing_outside_request(self, mock_request):
+        self._respond(mock_request)
+        cc_utils.perform_request('get', self.url)
+        cc_utils.perform_request('get', self.url)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_perform_concurrently(self, mock_request):
+        self._respond(mock_request)
+        results = cc_utils.perform_concurrently(
+            lambda: cc_utils.perform_request('get', self.url),
+            lambda: cc_utils.perform_request('get', self.url + '/stats'),
+        )
+        self.assertEqual([{'id': '1'}, {'id': '1'}], results)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_perform_concurrently_pool_per_call(self, mock_request):
+        self._respond(mock_request)
+        with patch.object(cc_utils, 'ThreadPool', wraps=cc_utils.ThreadPool) as mock_pool:
+            cc_utils.perform_concurrently(*[lambda: cc_utils.perform_request('get', self.url)] * 2)
+            cc_utils.perform_concurrently(*[lambda: cc_utils.perform_request('get', self.url)] * 9)
+        self.assertEqual(
+            [2, cc_utils.settings.MAX_CONCURRENT_REQUESTS],
+            [args[0] for args, _kwargs in mock_pool.call_args_list]
+        )
+
+
+@patch('lms.lib.comment_client.utils.requests.Session.request')
+@patch.object(cc_utils.settings, 'METADATA_CACHE_TIMEOUT', 60)
+class CommentClientCacheTestCase(TestCase):
+    def setUp(self):
+        self.thread_url = cc_utils.settings.PREFIX + '/threads/t1'
+        self.user_url = cc_utils.settings.PREFIX + '/users/1'
+        self.addCleanup(cache.clear)
+
+    def _respond(self, mock_request, text='{"id": "1"}'):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.text = text
+
+    def _get_thread_and_user(self):
+        cc_utils.perform_request('get', self.thread_url, cache_timeout=60)
+        cc_utils.perform_request('get', self.user_url, {'complete': True}, cache_timeout=60)
+
+    def test_metadata_is_cached(self, mock_request):
+        self._respond(mock_request)
+        self._get_thread_and_user()
+        self._get_thread_and_user()
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_comment_invalidates_thread_and_author(self, mock_request):
+        self._respond(mock_request)
+        self._get_thread_and_user()
+        cc_utils.perform_request('post', self.thread_url + '/comments', {'user_id': '1', 'body': 'Hi'})
+        self._get_thread_and_user()
+        self.assertEqual(5, mock_request.call_count)
+
+    def test_reply_invalidates_its_thread(self, mock_request):
+        self._respond(mock_request)
+        cc_utils.perform_request('get', self.thread_url, cache_timeout=60)
+        self._respond(mock_request, '{"id": "c2", "thread_id": "t1"}')
+        cc_utils.perform_request('post', cc_utils.settings.PREFIX + '/comments/c1', {'user_id': '2', 'body': 'Hi'})
+        cc_utils.perform_request('get', self.thread_url, cache_timeout=60)
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_unrelated_write_keeps_cache(self, mock_request):
+        self._respond(mock_request)
+        self._get_thread_and_user()
+        cc_utils.perform_request('put', cc_utils.settings.PREFIX + '/threads/t2/votes', {'user_id': '2', 'value': 'up'})
+        self._get_thread_and_user()
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_thread_metadata_cached_unless_marked_read(self, mock_request):
+        self._respond(mock_request, '{"id": "t1", "title": "Hello"}')
+        lms.lib.comment_client.Thread.find('t1').retrieve(mark_as_read=False)
+        lms.lib.comment_client.Thread.find('t1').retrieve(mark_as_read=False)
+        self.assertEqual(1, mock_request.call_count)
+        lms.lib.comment_client.Thread.find('t1').retrieve(user_id='1')
+        self.assertEqual(2, mock_request.call_count)
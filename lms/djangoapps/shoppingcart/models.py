@@ -17,7 +17,7 @@ from django.core.mail import send_mail
 from django.contrib.auth.models import User
 from django.utils.translation import ugettext as _
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Count, Sum
 from django.core.urlresolvers import reverse
 from model_utils.managers import InheritanceManager
 
@@ -608,6 +608,56 @@ class CertificateItem(OrderItem):
         else:
             return query
 
+    @classmethod
+    def verified_certificates_totals(cls, course_ids, statuses):
+        """
+        Returns the totals of the verified certificates of many courses with one query.
+
+        Returns a dict mapping each of `course_ids` to a dict mapping each of `statuses` to
+        the number of verified certificates of the course with that status, as 'count', and
+        the sums of their 'unit_cost' and 'service_fee'.  Sums over no certificates are
+        Decimal(0.00), as in verified_certificates_monetary_field_sum.
+        """
+        totals = dict(
+            (course_id, dict(
+                (status, {'count': 0, 'unit_cost': Decimal(0.00), 'service_fee': Decimal(0.00)})
+                for status in statuses
+            ))
+            for course_id in course_ids
+        )
+        if not totals:
+            return totals
+        query = use_read_replica_if_available(
+            CertificateItem.objects.filter(course_id__in=course_ids, mode='verified', status__in=statuses)
+            .values('course_id', 'status').order_by().annotate(Count('id'), Sum('unit_cost'), Sum('service_fee'))
+        )
+        for item in query:
+            total = totals[item['course_id']][item['status']]
+            total['count'] = item['id__count']
+            for field in ('unit_cost', 'service_fee'):
+                if item[field + '__sum'] is not None:
+                    total[field] = item[field + '__sum']
+        return totals
+
+    @classmethod
+    def verified_certificates_contributing_more_than_minimums(cls, minimums):
+        """
+        Returns a dict mapping each course id of `minimums`, a dict mapping course ids to
+        their minimum prices, to the number of purchased verified certificates of the course
+        whose unit cost is above its minimum, with one query.
+        """
+        counts = dict((course_id, 0) for course_id in minimums)
+        if not counts:
+            return counts
+        query = use_read_replica_if_available(
+            CertificateItem.objects.filter(course_id__in=minimums.keys(), mode='verified', status='purchased')
+            .values('course_id', 'unit_cost').order_by().annotate(Count('id'))
+        )
+        for item in query:
+            if item['unit_cost'] > minimums[item['course_id']]:
+                counts[item['course_id']] += item['id__count']
+        return counts
+
     @classmethod
     def verified_certificates_contributing_more_than_minimum(cls, course_id):
         return use_read_replica_if_available(
@@ -5,12 +5,11 @@ import unicodecsv
 
 from django.utils.translation import ugettext as _
 
-from courseware.courses import get_course_by_id
+from courseware.catalog import get_catalog
 from course_modes.models import CourseMode
 from shoppingcart.models import CertificateItem, OrderItem
 from student.models import CourseEnrollment
 from util.query import use_read_replica_if_available
-from xmodule.modulestore.django import modulestore
 
 
 class Report(object):
@@ -152,13 +151,23 @@ class CertificateStatusReport(Report):
     gross revenue, gross revenue over the minimum, and total dollars refunded.
     """
     def rows(self):
-        for course_id in course_ids_between(self.start_word, self.end_word):
-            # If the first letter of the university is between start_word and end_word, then we include
-            # it in the report.  These comparisons are unicode-safe.
-            cur_course = get_course_by_id(course_id)
-            university = cur_course.org
-            course = cur_course.number + " " + cur_course.display_name_with_default  # TODO add term (i.e. Fall 2013)?
-            counts = CourseEnrollment.enrollment_counts(course_id)
+        # If the first letter of the university is between start_word and end_word, then we include
+        # it in the report.  These comparisons are unicode-safe.
+        courses = courses_between(self.start_word, self.end_word)
+        course_ids = [entry.id for entry in courses]
+
+        # Every figure is computed for all the courses at once
+        all_counts = CourseEnrollment.enrollment_counts_for_courses(course_ids)
+        all_totals = CertificateItem.verified_certificates_totals(course_ids, ['purchased', 'refunded'])
+        min_prices = CourseMode.min_course_prices_for_verified_for_currency(course_ids, 'usd')
+        all_over_the_minimum = CertificateItem.verified_certificates_contributing_more_than_minimums(min_prices)
+
+        for entry in courses:
+            course_id = entry.id
+            university = entry.org
+            course = entry.number + " " + entry.display_name_with_default  # TODO add term (i.e. Fall 2013)?
+            counts = all_counts[course_id]
+            totals = all_totals[course_id]
             total_enrolled = counts['total']
             audit_enrolled = counts['audit']
             honor_enrolled = counts['honor']
@@ -169,17 +178,17 @@ class CertificateStatusReport(Report):
                 gross_rev_over_min = Decimal(0.00)
             else:
                 verified_enrolled = counts['verified']
-                gross_rev = CertificateItem.verified_certificates_monetary_field_sum(course_id, 'purchased', 'unit_cost')
-                gross_rev_over_min = gross_rev - (CourseMode.min_course_price_for_verified_for_currency(course_id, 'usd') * verified_enrolled)
+                gross_rev = totals['purchased']['unit_cost']
+                gross_rev_over_min = gross_rev - (min_prices[course_id] * verified_enrolled)
 
-            num_verified_over_the_minimum = CertificateItem.verified_certificates_contributing_more_than_minimum(course_id)
+            num_verified_over_the_minimum = all_over_the_minimum[course_id]
 
             # should I be worried about is_active here?
-            number_of_refunds = CertificateItem.verified_certificates_count(course_id, 'refunded')
+            number_of_refunds = totals['refunded']['count']
             if number_of_refunds == 0:
                 dollars_refunded = Decimal(0.00)
             else:
-                dollars_refunded = CertificateItem.verified_certificates_monetary_field_sum(course_id, 'refunded', 'unit_cost')
+                dollars_refunded = totals['refunded']['unit_cost']
 
             course_announce_date = ""
             course_reg_start_date = ""
@@ -234,15 +243,18 @@ class UniversityRevenueShareReport(Report):
     total payments collected, service fees, number of refunds, and total amount of refunds.
     """
     def rows(self):
-        for course_id in course_ids_between(self.start_word, self.end_word):
-            cur_course = get_course_by_id(course_id)
-            university = cur_course.org
-            course = cur_course.number + " " + cur_course.display_name_with_default
-            total_payments_collected = CertificateItem.verified_certificates_monetary_field_sum(course_id, 'purchased', 'unit_cost')
-            service_fees = CertificateItem.verified_certificates_monetary_field_sum(course_id, 'purchased', 'service_fee')
-            num_refunds = CertificateItem.verified_certificates_count(course_id, "refunded")
-            amount_refunds = CertificateItem.verified_certificates_monetary_field_sum(course_id, 'refunded', 'unit_cost')
-            num_transactions = (num_refunds * 2) + CertificateItem.verified_certificates_count(course_id, "purchased")
+        courses = courses_between(self.start_word, self.end_word)
+        all_totals = CertificateItem.verified_certificates_totals([entry.id for entry in courses], ['purchased', 'refunded'])
+
+        for entry in courses:
+            university = entry.org
+            course = entry.number + " " + entry.display_name_with_default
+            purchased, refunded = all_totals[entry.id]['purchased'], all_totals[entry.id]['refunded']
+            total_payments_collected = purchased['unit_cost']
+            service_fees = purchased['service_fee']
+            num_refunds = refunded['count']
+            amount_refunds = refunded['unit_cost']
+            num_transactions = (num_refunds * 2) + purchased['count']
 
             yield [
                 university,
@@ -266,14 +278,20 @@ class UniversityRevenueShareReport(Report):
         ]
 
 
+def courses_between(start_word, end_word):
+    """
+    Returns the catalog entries (see courseware.catalog) of all courses whose ids fall
+    alphabetically between start_word and end_word.  These comparisons are unicode-safe.
+    """
+    return [
+        entry for entry in get_catalog()
+        if start_word.lower() <= entry.id.lower() <= end_word.lower()
+    ]
+
+
 def course_ids_between(start_word, end_word):
     """
     Returns a list of all valid course_ids that fall alphabetically between start_word and end_word.
     These comparisons are unicode-safe.
     """
-
-    valid_courses = []
-    for course in modulestore().get_courses():
-        if (start_word.lower() <= course.id.lower() <= end_word.lower()) and (get_course_by_id(course.id) is not None):
-            valid_courses.append(course.id)
-    return valid_courses
+    return [entry.id for entry in courses_between(start_word, end_word)]
@@ -2,6 +2,7 @@
 Unit tests for shoppingcart context_processor
 """
 from mock import patch, Mock
+from django.core.cache import get_cache
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.test.utils import override_settings
@@ -21,6 +22,7 @@ class UserCartContextProcessorUnitTest(ModuleStoreTestCase):
     Unit test for shoppingcart context_processor
     """
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create()
         self.request = Mock()
 
@@ -7,6 +7,7 @@ from textwrap import dedent
 from boto.exception import BotoServerError  # this is a super-class of SESError and catches connection errors
 
 from mock import patch, MagicMock, sentinel
+from django.core.cache import get_cache
 from django.core import mail
 from django.conf import settings
 from django.db import DatabaseError
@@ -242,6 +243,7 @@ class OrderItemTest(TestCase):
 @override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
 class PaidCourseRegistrationTest(ModuleStoreTestCase):
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create()
         self.course_id = "MITx/999/Robot_Super_Course"
         self.cost = 40
@@ -329,6 +331,7 @@ class CertificateItemTest(ModuleStoreTestCase):
     Tests for verifying specific CertificateItem functionality
     """
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create()
         self.course_id = "org/test/Test_Course"
         self.cost = 40
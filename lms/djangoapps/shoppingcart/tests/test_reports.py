@@ -8,6 +8,7 @@ from textwrap import dedent
 import pytz
 import datetime
 
+from django.core.cache import get_cache
 from django.conf import settings
 from django.test.utils import override_settings
 
@@ -29,6 +30,7 @@ class ReportTypeTests(ModuleStoreTestCase):
     FIVE_MINS = datetime.timedelta(minutes=5)
 
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         # Need to make a *lot* of users for this one
         self.first_verified_user = UserFactory.create()
         self.first_verified_user.profile.name = "John Doe"
@@ -177,6 +179,19 @@ class ReportTypeTests(ModuleStoreTestCase):
         csv = csv_file.getvalue()
         self.assertEqual(csv.replace('\r\n', '\n').strip(), self.CORRECT_UNI_REVENUE_SHARE_CSV.strip())
 
+    def test_reports_cover_courses_in_range(self):
+        CourseFactory.create(org='MITx', number='100', display_name=u'Empty Course')
+        CourseFactory.create(org='ZZx', number='200', display_name=u'Out Of Range')
+        report = initialize_report("certificate_status", self.now - self.FIVE_MINS, self.now + self.FIVE_MINS, 'A', 'N')
+        rows = list(report.rows())
+        self.assertEqual([row[1] for row in rows], [u'100 Empty Course', u'999 Robot Super Course'])
+        self.assertEqual(rows[0][6:], [0, 0, 0, 0, 0, 0, 0, 0, 0])
+
+        report = initialize_report("university_revenue_share", self.now - self.FIVE_MINS, self.now + self.FIVE_MINS, 'A', 'N')
+        rows = list(report.rows())
+        self.assertEqual([row[1] for row in rows], [u'100 Empty Course', u'999 Robot Super Course'])
+        self.assertEqual(rows[0][2:], [0, 0, 0, 0, 0])
+
 
 @override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
 class ItemizedPurchaseReportTest(ModuleStoreTestCase):
@@ -187,6 +202,7 @@ class ItemizedPurchaseReportTest(ModuleStoreTestCase):
     TEST_ANNOTATION = u'Ba\xfc\u5305'
 
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create()
         self.course_id = "MITx/999/Robot_Super_Course"
         self.cost = 40
@@ -3,6 +3,7 @@ Tests for Shopping Cart views
 """
 from urlparse import urlparse
 
+from django.core.cache import get_cache
 from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -40,6 +41,7 @@ postpay_mock = Mock()
 @override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
 class ShoppingCartViewsTests(ModuleStoreTestCase):
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         patcher = patch('student.models.server_track')
         self.mock_server_track = patcher.start()
         self.user = UserFactory.create()
@@ -294,6 +296,7 @@ class CSVReportViewsTest(ModuleStoreTestCase):
     Test suite for CSV Purchase Reporting
     """
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create()
         self.user.set_password('password')
         self.user.save()
@@ -7,6 +7,7 @@ from nose.tools import (
     assert_equals, assert_true
 )
 from mock import patch
+from django.core.cache import get_cache
 from django.test import TestCase
 from django.conf import settings
 import requests
@@ -26,6 +27,8 @@ class TestVerifyStudentCommand(TestCase):
     """
     Tests for django admin commands in the verify_student module
     """
+    def setUp(self):
+        self.addCleanup(get_cache('verify_student').clear)
 
     def create_and_submit(self, username):
         """
@@ -8,6 +8,7 @@ of a student over a period of time. Right now, the only models are the abstract
 `SoftwareSecurePhotoVerification`. The hope is to keep as much of the
 photo verification process as generic as possible.
 """
+from collections import namedtuple
 from datetime import datetime, timedelta
 from email.utils import formatdate
 from hashlib import md5
@@ -23,8 +24,11 @@ import pytz
 import requests
 
 from django.conf import settings
+from django.core.cache import get_cache, InvalidCacheBackendError
 from django.core.urlresolvers import reverse
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.utils.translation import ugettext as _
 from model_utils.models import StatusModel
@@ -36,9 +40,23 @@ from verify_student.ssencrypt import (
 )
 
 from reverification.models import MidcourseReverificationWindow
+from util.cache import delete_after_commit
 
 log = logging.getLogger(__name__)
 
+try:
+    cache = get_cache('verify_student')  # pylint: disable=invalid-name
+except InvalidCacheBackendError:
+    from django.core.cache import cache
+
+# A user's attempts are cached until one of them changes; the timeout only
+# lets the attempts of users nobody looks at expire.
+ATTEMPTS_CACHE_TIMEOUT = 60 * 60
+
+# What the status checks need to know of an attempt, as cached by
+# PhotoVerification.attempts_for_user
+AttemptSummary = namedtuple('AttemptSummary', ['id', 'window_id', 'status', 'created_at', 'display'])
+
 
 def generateUUID():  # pylint: disable=C0103
     """ Utility function; generates UUIDs """
@@ -184,6 +202,48 @@ class PhotoVerification(StatusModel):
         ordering = ['-created_at']
 
     ##### Methods listed in the order you'd typically call them
+    @classmethod
+    def attempts_cache_key_name(cls, user_id):
+        """Return the name of the key to use to cache the attempts of user_id"""
+        return u'verify_student/{}/attempts/{}'.format(cls.__name__, user_id)
+
+    @classmethod
+    def attempts_for_user(cls, user):
+        """
+        Returns AttemptSummary tuples of all of the user's attempts, initial
+        verifications and reverifications alike, most recently updated first.
+
+        They are loaded with one query and cached until one of them is saved or
+        deleted, so that the status of the user can be checked for any number
+        of windows without querying again.  Load an attempt by its id to read
+        anything else or change it.
+        """
+        key = cls.attempts_cache_key_name(user.id)
+        attempts = cache.get(key)
+        if attempts is None:
+            attempts = [
+                AttemptSummary(*values)
+                for values in cls.objects.filter(user=user).order_by('-updated_at').values_list(
+                    'id', 'window', 'status', 'created_at', 'display'
+                )
+            ]
+            cache.set(key, attempts, ATTEMPTS_CACHE_TIMEOUT)
+        return attempts
+
+    @classmethod
+    def attempts_for_window(cls, user, window=None):
+        """
+        Returns AttemptSummary tuples of the user's attempts for window, most
+        recently updated first.
+
+        If window=None, these are the user's *initial* verifications.
+        """
+        window_id = getattr(window, 'id', window)
+        return [
+            attempt for attempt in cls.attempts_for_user(user)
+            if attempt.window_id == window_id
+        ]
+
     @classmethod
     def _earliest_allowed_date(cls):
         """
@@ -207,13 +267,11 @@ class PhotoVerification(StatusModel):
         If window is set to anything else, it will check for the reverification
         associated with that window.
         """
-        return cls.objects.filter(
-            user=user,
-            status="approved",
-            created_at__gte=(earliest_allowed_date
-                             or cls._earliest_allowed_date()),
-            window=window
-        ).exists()
+        earliest_allowed_date = earliest_allowed_date or cls._earliest_allowed_date()
+        return any(
+            attempt.status == "approved" and attempt.created_at >= earliest_allowed_date
+            for attempt in cls.attempts_for_window(user, window)
+        )
 
     @classmethod
     def user_has_valid_or_pending(cls, user, earliest_allowed_date=None, window=None):
@@ -231,13 +289,11 @@ class PhotoVerification(StatusModel):
         valid_statuses = ['submitted', 'approved']
         if not window:
             valid_statuses.append('must_retry')
-        return cls.objects.filter(
-            user=user,
-            status__in=valid_statuses,
-            created_at__gte=(earliest_allowed_date
-                             or cls._earliest_allowed_date()),
-            window=window,
-        ).exists()
+        earliest_allowed_date = earliest_allowed_date or cls._earliest_allowed_date()
+        return any(
+            attempt.status in valid_statuses and attempt.created_at >= earliest_allowed_date
+            for attempt in cls.attempts_for_window(user, window)
+        )
 
     @classmethod
     def active_for_user(cls, user, window=None):
@@ -285,8 +341,7 @@ class PhotoVerification(StatusModel):
             # we need to check the most recent attempt to see if we need to ask them to do
             # a retry
             try:
-                attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
-                attempt = attempts[0]
+                attempt = cls.attempts_for_window(user, window)[0]
             except IndexError:
 
                 # If no verification exists for a *midcourse* reverification, then that just
@@ -307,8 +362,11 @@ class PhotoVerification(StatusModel):
                     status = 'must_reverify'
                 else:
                     status = 'denied'
-            if attempt.error_msg:
-                error_msg = attempt.parsed_error_msg()
+            # Only failed attempts have error messages, which aren't cached
+            if attempt.status in ('denied', 'must_retry'):
+                attempt = cls.objects.get(id=attempt.id)
+                if attempt.error_msg:
+                    error_msg = attempt.parsed_error_msg()
 
         return (status, error_msg)
 
@@ -477,6 +535,8 @@ class PhotoVerification(StatusModel):
         """
         user = User.objects.get(id=user_id)
         cls.objects.filter(user=user, status="denied").exclude(window=None).update(display=False)
+        # Updating doesn't save the attempts, so their cache has to be cleared here
+        delete_after_commit(cache, cls.attempts_cache_key_name(user_id))
 
     @classmethod
     def display_status(cls, user, window):
@@ -484,7 +544,7 @@ class PhotoVerification(StatusModel):
         Finds the `display` property for the PhotoVerification associated with
         (user, window). Default is True
         """
-        attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
+        attempts = cls.attempts_for_window(user, window)
         try:
             attempt = attempts[0]
             return attempt.display
@@ -543,19 +603,13 @@ class SoftwareSecurePhotoVerification(PhotoVerification):
         not re-verified for all windows, then they cannot receive a certificate.
         """
         all_windows = MidcourseReverificationWindow.objects.filter(course_id=course_id)
-        # if there are no windows for a course, then return True right off
-        if (not all_windows.exists()):
-            return True
-
+        # if there are no windows for a course, then return True right off;
+        # otherwise the user's attempts are only loaded once for all of them
         for window in all_windows:
-            try:
-                # The status of the most recent reverification for each window must be "approved"
-                # for a student to count as completely reverified
-                attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
-                attempt = attempts[0]
-                if attempt.status != "approved":
-                    return False
-            except Exception:  # pylint: disable=W0703
+            # The status of the most recent reverification for each window must be "approved"
+            # for a student to count as completely reverified
+            attempts = cls.attempts_for_window(user, window)
+            if not attempts or attempts[0].status != "approved":
                 return False
 
         return True
@@ -810,3 +864,13 @@ class SoftwareSecurePhotoVerification(PhotoVerification):
         log.debug("Return message:\n\n{}\n\n".format(response.text))
 
         return response
+
+
+@receiver(post_save, sender=SoftwareSecurePhotoVerification)
+@receiver(post_delete, sender=SoftwareSecurePhotoVerification)
+def clear_attempts_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached attempts of a user when one of them changes, including
+    any cached before the change was committed.
+    """
+    delete_after_commit(cache, sender.attempts_cache_key_name(instance.user_id))
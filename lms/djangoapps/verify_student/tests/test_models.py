@@ -8,6 +8,7 @@ from nose.tools import (
 )
 from mock import MagicMock, patch
 import pytz
+from django.core.cache import get_cache
 from django.test import TestCase
 from courseware.tests.tests import TEST_DATA_MONGO_MODULESTORE
 from django.test.utils import override_settings
@@ -17,7 +18,7 @@ import requests.exceptions
 
 from student.tests.factories import UserFactory
 from verify_student.models import (
-    SoftwareSecurePhotoVerification, VerificationException,
+    AttemptSummary, SoftwareSecurePhotoVerification, VerificationException,
 )
 from reverification.tests.factories import MidcourseReverificationWindowFactory
 from util.testing import UrlResetMixin
@@ -128,6 +129,9 @@ def mock_software_secure_post_unavailable(url, headers=None, data=None, **kwargs
 @patch('verify_student.models.requests.post', new=mock_software_secure_post)
 class TestPhotoVerification(TestCase):
 
+    def setUp(self):
+        self.addCleanup(get_cache('verify_student').clear)
+
     def test_state_transitions(self):
         """
         Make sure we can't make unexpected status transitions.
@@ -427,6 +431,7 @@ class TestPhotoVerification(TestCase):
 class TestMidcourseReverification(TestCase):
     """ Tests for methods that are specific to midcourse SoftwareSecurePhotoVerification objects """
     def setUp(self):
+        self.addCleanup(get_cache('verify_student').clear)
         self.course_id = "MITx/999/Robot_Super_Course"
         self.course = CourseFactory.create(org='MITx', number='999', display_name='Robot Super Course')
         self.user = UserFactory.create()
@@ -515,3 +520,56 @@ class TestMidcourseReverification(TestCase):
         attempt.status = "approved"
         attempt.save()
         assert_true(SoftwareSecurePhotoVerification.user_has_valid_or_pending(user=self.user, window=window))
+
+    def test_attempts_cached_until_changed(self):
+        cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='verify_student_test')
+        self.addCleanup(cache.clear)
+        windows = [
+            MidcourseReverificationWindowFactory(
+                course_id=self.course_id,
+                start_date=datetime.now(pytz.UTC) - timedelta(days=days + 2),
+                end_date=datetime.now(pytz.UTC) - timedelta(days=days),
+            )
+            for days in (13, 8, 3)
+        ]
+
+        with patch('verify_student.models.cache', cache):
+            SoftwareSecurePhotoVerification(status="approved", user=self.user).save()
+            attempt = SoftwareSecurePhotoVerification(status="denied", user=self.user, window=windows[0])
+            attempt.save()
+
+            # The attempts are loaded once for all windows; only the denied
+            # attempt is loaded again, for its error message
+            with self.assertNumQueries(2):
+                self.assertEquals(SoftwareSecurePhotoVerification.user_status(self.user), ('approved', ''))
+                for window in windows:
+                    SoftwareSecurePhotoVerification.user_status(self.user, window)
+                    SoftwareSecurePhotoVerification.display_status(self.user, window)
+            with self.assertNumQueries(1):
+                self.assertFalse(SoftwareSecurePhotoVerification.user_is_reverified_for_all(self.course_id, self.user))
+
+            SoftwareSecurePhotoVerification.display_off(self.user.id)
+            self.assertFalse(SoftwareSecurePhotoVerification.display_status(self.user, windows[0]))
+
+            attempt.approve()
+            self.assertEquals(SoftwareSecurePhotoVerification.user_status(self.user, windows[0]), ('approved', ''))
+
+    def test_cached_attempts_are_summaries(self):
+        window = MidcourseReverificationWindowFactory(course_id=self.course_id)
+        attempt = SoftwareSecurePhotoVerification(user=self.user, window=window)
+        attempt.status = "submitted"
+        attempt.save()
+        attempt.deny(json.dumps([{"photoIdReasons": ["Not provided"]}]))
+
+        summaries = SoftwareSecurePhotoVerification.attempts_for_user(self.user)
+        self.assertEquals(len(summaries), 1)
+        self.assertIsInstance(summaries[0], AttemptSummary)
+        self.assertEquals(
+            (summaries[0].id, summaries[0].window_id, summaries[0].status, summaries[0].display),
+            (attempt.id, window.id, "denied", True)
+        )
+        # The error message is read from the attempt itself
+        self.assertEquals(
+            SoftwareSecurePhotoVerification.user_status(self.user, window),
+            ("denied", attempt.parsed_error_msg())
+        )
@@ -14,6 +14,7 @@ from mock import patch, Mock, ANY
 import pytz
 from datetime import timedelta, datetime
 
+from django.core.cache import get_cache
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.conf import settings
@@ -58,6 +59,7 @@ class StartView(TestCase):
 @override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
 class TestVerifyView(TestCase):
     def setUp(self):
+        self.addCleanup(get_cache('course_modes').clear)
         self.user = UserFactory.create(username="rusty", password="test")
         self.client.login(username="rusty", password="test")
         self.course_id = 'Robot/999/Test_Course'
@@ -84,6 +86,7 @@ class TestReverifyView(TestCase):
 
     """
     def setUp(self):
+        self.addCleanup(get_cache('verify_student').clear)
         self.user = UserFactory.create(username="rusty", password="test")
         self.client.login(username="rusty", password="test")
         self.course_id = "MITx/999/Robot_Super_Course"
@@ -127,6 +130,7 @@ class TestReverifyView(TestCase):
 class TestMidCourseReverifyView(TestCase):
     """ Tests for the midcourse reverification views """
     def setUp(self):
+        self.addCleanup(get_cache('verify_student').clear)
         self.user = UserFactory.create(username="rusty", password="test")
         self.client.login(username="rusty", password="test")
         self.course_id = 'Robot/999/Test_Course'
@@ -201,6 +201,11 @@ MKTG_URL_LINK_MAP.update(ENV_TOKENS.get('MKTG_URL_LINK_MAP', {}))
 # Timezone overrides
 TIME_ZONE = ENV_TOKENS.get('TIME_ZONE', TIME_ZONE)
 
+# Per-request profiling
+PERFSTATS = ENV_TOKENS.get('PERFSTATS', PERFSTATS)
+PERFSTATS_SAMPLE_RATE = ENV_TOKENS.get('PERFSTATS_SAMPLE_RATE', PERFSTATS_SAMPLE_RATE)
+PERFSTATS_HEADER = ENV_TOKENS.get('PERFSTATS_HEADER', PERFSTATS_HEADER)
+
 # Translation overrides
 LANGUAGES = ENV_TOKENS.get('LANGUAGES', LANGUAGES)
 LANGUAGE_CODE = ENV_TOKENS.get('LANGUAGE_CODE', LANGUAGE_CODE)
@@ -371,3 +376,4 @@ PASSWORD_DICTIONARY = ENV_TOKENS.get("PASSWORD_DICTIONARY", [])
 
 ### INACTIVITY SETTINGS ####
 SESSION_INACTIVITY_TIMEOUT_IN_SECONDS = AUTH_TOKENS.get("SESSION_INACTIVITY_TIMEOUT_IN_SECONDS")
+SESSION_ACTIVITY_SAVE_DELAY_SECONDS = ENV_TOKENS.get("SESSION_ACTIVITY_SAVE_DELAY_SECONDS", 60)
@@ -0,0 +1,38 @@
+"""
+Settings for running the benchmarks, see the benchmarks app.
+
+Everything runs locally: a sqlite database, a Mongo modulestore on
+localhost, in-memory caches and a fake comments service.
+"""
+
+# We intentionally define lots of variables that aren't used, and
+# want to import all variables from base settings files
+# pylint: disable=W0401, W0614
+
+from .test import *
+
+INSTALLED_APPS += ('benchmarks',)
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': TEST_ROOT / 'db' / 'benchmark.db',
+    },
+}
+
+MODULESTORE = {
+    'default': {
+        'ENGINE': 'xmodule.modulestore.mongo.MongoModuleStore',
+        'DOC_STORE_CONFIG': {
+            'host': 'localhost',
+            'db': 'benchmark_xmodule',
+            'collection': 'modulestore',
+        },
+        'OPTIONS': {
+            'default_class': 'xmodule.raw_module.RawDescriptor',
+            'fs_root': TEST_ROOT / 'data',
+            'render_template': 'edxmako.shortcuts.render_to_string',
+        },
+    },
+}
+MODULESTORE['direct'] = MODULESTORE['default']
@@ -44,7 +44,12 @@ CC_MERCHANT_NAME = PLATFORM_NAME
 COURSEWARE_ENABLED = True
 ENABLE_JASMINE = False
 
+# Per-request performance breakdown, see lms.lib.perfstats.middleware.
 PERFSTATS = False
+# The fraction of requests profiled.
+PERFSTATS_SAMPLE_RATE = 0.01
+# Whether to return the breakdown in the X-Perfstats header, as well as logging it.
+PERFSTATS_HEADER = False
 
 DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
@@ -430,6 +435,10 @@ CODE_JAIL = {
     'python_bin': None,
     # User to run as in the sandbox.
     'user': 'sandbox',
+    # How many sandbox processes to keep started and waiting for code, so that
+    # problems don't pay for starting Python and importing numpy.  0 starts a
+    # new process for every execution.
+    'warm_workers': 0,
 
     # Configurable limits.
     'limits': {
@@ -669,9 +678,12 @@ TEMPLATE_LOADERS = (
 )
 
 MIDDLEWARE_CLASSES = (
+    # Only used when PERFSTATS is on; first, so that it sees all the work done
+    'lms.lib.perfstats.middleware.ProfileMiddleware',
     'request_cache.middleware.RequestCache',
     'microsite_configuration.middleware.MicrositeConfiguration',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
+    'django_comment_client.middleware.CommentClientRequestScopeMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
 
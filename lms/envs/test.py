@@ -167,6 +167,18 @@ CACHES = {
         'LOCATION': 'edx_location_mem_cache',
     },
 
+    # Course modes and verification attempts are only invalidated when they
+    # are saved, which rolling back a test's transaction doesn't do, so tests
+    # saving them clear these caches.
+    'course_modes': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lms_course_modes_mem_cache',
+    },
+    'verify_student': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lms_verify_student_mem_cache',
+    },
+
 }
 
 # Dummy secret key for dev
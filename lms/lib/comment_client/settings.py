@@ -11,3 +11,13 @@ if hasattr(settings, "COMMENTS_SERVICE_KEY"):
     API_KEY = settings.COMMENTS_SERVICE_KEY
 else:
     API_KEY = "PUT_YOUR_API_KEY_HERE"
+
+# Size of the keep-alive connection pool shared by all comment service calls
+POOL_CONNECTIONS = getattr(settings, "COMMENTS_SERVICE_POOL_CONNECTIONS", 10)
+POOL_MAXSIZE = getattr(settings, "COMMENTS_SERVICE_POOL_MAXSIZE", 10)
+
+# Number of comment service calls a view may issue in parallel
+MAX_CONCURRENT_REQUESTS = getattr(settings, "COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS", 4)
+
+# Seconds to cache user and thread metadata for; 0 disables caching
+METADATA_CACHE_TIMEOUT = getattr(settings, "COMMENTS_SERVICE_METADATA_CACHE_TIMEOUT", 0)
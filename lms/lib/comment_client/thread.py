@@ -79,7 +79,13 @@ class Thread(models.Model):
         }
         request_params = strip_none(request_params)
 
-        response = perform_request('get', url, request_params)
+        # Marking a thread as read is a side effect of the request, so only
+        # plain metadata fetches may be served from the cache.
+        if request_params['mark_as_read']:
+            cache_timeout = None
+        else:
+            cache_timeout = settings.METADATA_CACHE_TIMEOUT
+        response = perform_request('get', url, request_params, cache_timeout=cache_timeout)
         self.update_attributes(**response)
 
     def flagAbuse(self, user, voteable):
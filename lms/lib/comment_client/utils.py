@@ -1,14 +1,29 @@
 from contextlib import contextmanager
 from dogapi import dog_stats_api
+from django.core.cache import cache
+from hashlib import md5
+from multiprocessing.pool import ThreadPool
+from requests.adapters import HTTPAdapter
 import json
 import logging
+import re
 import requests
 import settings
+import threading
 from time import time
 from uuid import uuid4
 
 log = logging.getLogger(__name__)
 
+# Shared keep-alive session so that consecutive calls to the comments service
+# reuse pooled connections instead of opening a new one per request.
+_session = None
+_session_lock = threading.Lock()
+
+# Holds the GET responses of the request currently being served, so that
+# identical GETs issued while rendering a single page only hit the service once.
+_request_scope = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -49,9 +64,175 @@ def request_timer(request_id, method, url):
     )
 
 
+def get_session():
+    """
+    Returns the process-wide requests session used to talk to the comments service.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.POOL_CONNECTIONS,
+                    pool_maxsize=settings.POOL_MAXSIZE
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def start_request_scope():
+    """
+    Starts coalescing identical GET requests made to the comments service.
+
+    Any write (post, put, patch or delete) discards the responses collected so
+    far, so reads that follow a write are never stale.
+    """
+    _request_scope.responses = {}
+
+
+def end_request_scope():
+    """
+    Stops coalescing GET requests and drops the responses collected so far.
+    """
+    _request_scope.responses = None
+
+
+@contextmanager
+def request_scope():
+    """
+    Coalesces identical GET requests made to the comments service within the block.
+    """
+    outer = getattr(_request_scope, 'responses', None)
+    if outer is None:
+        start_request_scope()
+    try:
+        yield
+    finally:
+        _request_scope.responses = outer
+
+
+def perform_concurrently(*calls):
+    """
+    Runs independent comment service calls in parallel and returns their results in order.
+
+    Each call is a callable taking no arguments. The calls share the request
+    scope of the caller, and the first exception raised by any of them is
+    re-raised here. Latency is then that of the slowest call rather than the
+    sum of all of them.
+
+    Each invocation gets its own pool of at most MAX_CONCURRENT_REQUESTS
+    threads, so concurrent requests to the LMS never queue behind each other.
+    """
+    if len(calls) < 2 or settings.MAX_CONCURRENT_REQUESTS < 2:
+        return [call() for call in calls]
+
+    responses = getattr(_request_scope, 'responses', None)
+
+    def _run_in_scope(call):
+        _request_scope.responses = responses
+        try:
+            return call()
+        finally:
+            _request_scope.responses = None
+
+    pool = ThreadPool(min(len(calls), settings.MAX_CONCURRENT_REQUESTS))
+    try:
+        pending = [pool.apply_async(_run_in_scope, (call,)) for call in calls]
+        return [result.get() for result in pending]
+    finally:
+        pool.terminate()
+
+
+def _cache_key(url, params):
+    """
+    Returns the cache key for a GET of `url` with `params`.
+
+    The key includes a per-url generation, which `invalidate_cached` bumps.
+    """
+    url_hash = md5(url.encode('utf-8')).hexdigest()
+    generation = cache.get('comment_client.generation.' + url_hash, 0)
+    params_hash = md5(json.dumps(params, sort_keys=True, default=str)).hexdigest()
+    return 'comment_client.{0}.{1}.{2}'.format(url_hash, generation, params_hash)
+
+
+def invalidate_cached(url):
+    """
+    Discards cached GET responses for `url`, whatever parameters they were made with.
+    """
+    key = 'comment_client.generation.' + md5(url.encode('utf-8')).hexdigest()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1)
+
+
+def _invalidate_written(url, data_or_params, response_text):
+    """
+    Discards the cached GET responses that a write to `url` may have made stale.
+
+    Besides `url` itself, these are the thread the write is about (its
+    comment count, votes or flags change) and the acting user (their votes
+    and subscriptions change, and authors are subscribed to their threads).
+    """
+    urls = set([url])
+    thread_ids = set()
+    user_ids = set()
+
+    match = re.match(re.escape(settings.PREFIX) + r'/threads/([^/]+)', url)
+    if match:
+        thread_ids.add(match.group(1))
+    match = re.match(re.escape(settings.PREFIX) + r'/users/([^/]+)', url)
+    if match:
+        user_ids.add(match.group(1))
+    if data_or_params.get('user_id'):
+        user_ids.add(data_or_params['user_id'])
+
+    try:
+        content = json.loads(response_text) if response_text else None
+    except ValueError:
+        content = None
+    if isinstance(content, dict):
+        # New comments, replies and their votes only name their thread here
+        if content.get('thread_id'):
+            thread_ids.add(content['thread_id'])
+        if content.get('type') == 'thread' and content.get('id'):
+            thread_ids.add(content['id'])
+
+    urls.update("{0}/threads/{1}".format(settings.PREFIX, thread_id) for thread_id in thread_ids)
+    urls.update("{0}/users/{1}".format(settings.PREFIX, user_id) for user_id in user_ids)
+    for stale_url in urls:
+        invalidate_cached(stale_url)
+
+
 def perform_request(method, url, data_or_params=None, *args, **kwargs):
+    """
+    Performs a request to the comments service and returns the decoded response.
+
+    Pass `raw=True` to get the response text rather than decoded json, and
+    `cache_timeout` (in seconds) to cache a GET response across requests.
+    """
     if data_or_params is None:
         data_or_params = {}
+    cache_timeout = kwargs.get("cache_timeout")
+    responses = getattr(_request_scope, 'responses', None)
+
+    if method == 'get':
+        scope_key = (url, json.dumps(data_or_params, sort_keys=True, default=str))
+        if responses is not None and scope_key in responses:
+            return _decode_response(responses[scope_key], **kwargs)
+        if cache_timeout:
+            cache_key = _cache_key(url, data_or_params)
+            text = cache.get(cache_key)
+            if text is not None:
+                if responses is not None:
+                    responses[scope_key] = text
+                return _decode_response(text, **kwargs)
+    elif responses is not None:
+        responses.clear()
+
     headers = {'X-Edx-Api-Key': settings.API_KEY}
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
@@ -63,7 +244,7 @@ def perform_request(method, url, data_or_params=None, *args, **kwargs):
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -72,6 +253,11 @@ def perform_request(method, url, data_or_params=None, *args, **kwargs):
             timeout=5
         )
 
+    if method != 'get' and settings.METADATA_CACHE_TIMEOUT:
+        # Only once the service has made the change, so that nothing reads
+        # and caches the old state in between
+        _invalidate_written(url, data_or_params, response.text)
+
     if 200 < response.status_code < 500:
         raise CommentClientRequestError(response.text, response.status_code)
     # Heroku returns a 503 when an application is in maintenance mode
@@ -80,10 +266,22 @@ def perform_request(method, url, data_or_params=None, *args, **kwargs):
     elif response.status_code == 500:
         raise CommentClient500Error(response.text)
     else:
-        if kwargs.get("raw", False):
-            return response.text
-        else:
-            return json.loads(response.text)
+        if method == 'get':
+            if responses is not None:
+                responses[scope_key] = response.text
+            if cache_timeout:
+                cache.set(cache_key, response.text, cache_timeout)
+        return _decode_response(response.text, **kwargs)
+
+
+def _decode_response(text, **kwargs):
+    """
+    Returns the response text, decoded from json unless `raw` is set.
+    """
+    if kwargs.get("raw", False):
+        return text
+    else:
+        return json.loads(text)
 
 
 class CommentClientError(Exception):
@@ -1,30 +1,82 @@
-import json
-import tempfile
-import time
+"""
+Per-request performance breakdown.
+
+When settings.PERFSTATS is on, a fraction PERFSTATS_SAMPLE_RATE of requests
+is profiled: the modulestore, Mongo, SQL, memcache, Mako and XBlock render
+calls it makes are counted and timed (see perfstats.stats), and a summary is
+logged.  With PERFSTATS_HEADER on, the summary is also returned in the
+X-Perfstats response header.
+"""
+import logging
+import random
+import threading
+from collections import defaultdict
 
 from django.conf import settings
-from django.db import connection
+from django.core.exceptions import MiddlewareNotUsed
 
-import views
+from lms.lib.perfstats import stats
 
+log = logging.getLogger(__name__)
 
-class ProfileMiddleware:
-    def process_request(self, request):
-        self.t = time.time()
-        print "Process request"
+# Totals of the requests profiled since the last restart_profile
+_totals_lock = threading.Lock()
+_totals = {'requests': 0, 'counts': defaultdict(int), 'times': defaultdict(float)}
+
+
+def restart_profile():
+    """
+    Return the totals of the requests profiled by this process since the last
+    call, and start new totals.
+    """
+    with _totals_lock:
+        totals = {
+            'requests': _totals['requests'],
+            'counts': dict(_totals['counts']),
+            'times': dict(_totals['times']),
+        }
+        _totals['requests'] = 0
+        _totals['counts'].clear()
+        _totals['times'].clear()
+    return totals
 
-    def process_response(self, request, response):
-        # totalTime = time.time() - self.t
-        # tmpfile = tempfile.NamedTemporaryFile(prefix='sqlprof-t=' + str(totalTime) + "-", delete=False)
 
-        # output = ""
-        # for query in connection.queries:
-        #     output += "Time: " + str(query['time']) + "\nQuery: " + query['sql'] + "\n\n"
+def _add_to_totals(request_stats):
+    """
+    Add a profiled request to the totals.
+    """
+    with _totals_lock:
+        _totals['requests'] += 1
+        for category, count in request_stats.counts.iteritems():
+            _totals['counts'][category] += count
+            _totals['times'][category] += request_stats.times[category]
 
-        # tmpfile.write(output)
 
-        # print "SQL Log file: " , tmpfile.name
-        # tmpfile.close()
+class ProfileMiddleware(object):
+    """
+    Profiles a sample of the requests.  Should be the first middleware, so
+    that the work of the others is included.
+    """
+    def __init__(self):
+        if not settings.PERFSTATS:
+            raise MiddlewareNotUsed
+        stats.install()
+
+    def process_request(self, request):  # pylint: disable=unused-argument
+        if random.random() < settings.PERFSTATS_SAMPLE_RATE:
+            stats.start()
+        else:
+            # Don't leave a profile of a previous request running.
+            stats.stop()
+
+    def process_response(self, request, response):
+        request_stats = stats.stop()
+        if request_stats is None:
+            return response
 
-        # print "Process response"
+        summary = request_stats.summary()
+        log.info(u"perfstats %s %s %s", request.method, request.path, summary)
+        if settings.PERFSTATS_HEADER:
+            response['X-Perfstats'] = summary
+        _add_to_totals(request_stats)
         return response
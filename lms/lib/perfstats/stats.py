@@ -0,0 +1,190 @@
+"""
+Counting and timing of the work done while handling a request.
+
+`install()` wraps the methods that talk to the modulestore, Mongo, the SQL
+database and memcache, and that render Mako templates and XBlocks.  The
+wrappers only record anything in threads where `start()` has been called, so
+outside of sampled requests they cost one thread-local lookup per call.
+
+Calls are grouped in categories.  A call made while another call of the same
+category is in progress is part of that call and isn't recorded separately:
+a modulestore call made by the mixed modulestore to the mongo one counts
+once, and the time of a template includes the templates it renders.  Calls
+of different categories do overlap: modulestore time includes Mongo time.
+"""
+import functools
+import threading
+import time
+from collections import defaultdict
+
+_state = threading.local()
+_installed = False
+
+
+class RequestStats(object):
+    """
+    The number of calls and the time spent in each category of calls.
+    """
+    def __init__(self):
+        self.start = time.time()
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+        # Categories with a call in progress
+        self.active = set()
+
+    def record(self, category, seconds):
+        """
+        Record a call of `category` that took `seconds`.
+        """
+        self.counts[category] += 1
+        self.times[category] += seconds
+
+    def summary(self):
+        """
+        A one line summary: the total time, then the number of calls and time
+        of every category, like "total=120ms sql=4/3ms mongo=12/20ms".
+        """
+        parts = ["total={0:.0f}ms".format((time.time() - self.start) * 1000)]
+        for category in sorted(self.counts):
+            parts.append("{0}={1}/{2:.0f}ms".format(category, self.counts[category], self.times[category] * 1000))
+        return " ".join(parts)
+
+
+def start():
+    """
+    Start recording the calls made by this thread.
+    """
+    _state.stats = RequestStats()
+
+
+def stop():
+    """
+    Stop recording the calls made by this thread, and return what was
+    recorded, or None if recording wasn't started.
+    """
+    stats = getattr(_state, 'stats', None)
+    _state.stats = None
+    return stats
+
+
+def current():
+    """
+    The RequestStats being recorded by this thread, or None.
+    """
+    return getattr(_state, 'stats', None)
+
+
+def _timed(function, category):
+    """
+    Wrap `function` to record its calls under `category`, either a string or
+    a function of the call's arguments returning one.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):  # pylint: disable=missing-docstring
+        stats = getattr(_state, 'stats', None)
+        if stats is None:
+            return function(*args, **kwargs)
+        name = category(*args, **kwargs) if callable(category) else category
+        if name in stats.active:
+            return function(*args, **kwargs)
+        stats.active.add(name)
+        begin = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.active.discard(name)
+            stats.record(name, time.time() - begin)
+    wrapper.perfstats_wrapped = True
+    return wrapper
+
+
+def instrument(owner, names, category):
+    """
+    Record calls of the methods `names` defined by class `owner` under
+    `category`.  Methods that `owner` only inherits are left alone.
+    """
+    for name in names:
+        method = owner.__dict__.get(name)
+        if method is None or getattr(method, 'perfstats_wrapped', False):
+            continue
+        setattr(owner, name, _timed(method, category))
+
+
+def _xblock_category(runtime, block, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    The category of rendering `block`.
+    """
+    return "xblock." + block.scope_ids.block_type
+
+
+MODULESTORE_METHODS = (
+    'get_item', 'get_items', 'get_instance', 'has_item', 'get_course', 'get_courses',
+    'get_course_summaries', 'get_parent_locations', 'get_orphans', 'get_errored_courses',
+    'create_xmodule', 'update_item', 'update_children', 'update_metadata', 'delete_item',
+)
+
+
+def _install_sql():
+    """
+    Record SQL queries.
+
+    Django's CursorWrapper passes `execute` through to the database cursor,
+    and CursorDebugWrapper (used when DEBUG is on) defines its own.
+    """
+    from django.db.backends import util
+
+    def execute(self, sql, params=()):  # pylint: disable=missing-docstring
+        self.set_dirty()
+        return self.cursor.execute(sql, params)
+
+    def executemany(self, sql, param_list):  # pylint: disable=missing-docstring
+        self.set_dirty()
+        return self.cursor.executemany(sql, param_list)
+
+    if 'execute' not in util.CursorWrapper.__dict__:
+        util.CursorWrapper.execute = execute
+        util.CursorWrapper.executemany = executemany
+    instrument(util.CursorWrapper, ['execute', 'executemany'], 'sql')
+    instrument(util.CursorDebugWrapper, ['execute', 'executemany'], 'sql')
+
+
+def install():
+    """
+    Wrap the methods whose calls are recorded.  Only the first call does
+    anything.
+    """
+    global _installed  # pylint: disable=global-statement
+    if _installed:
+        return
+    _installed = True
+
+    from django.core.cache.backends.memcached import BaseMemcachedCache
+    from mako.template import Template
+    from pymongo.collection import Collection
+    from pymongo.cursor import Cursor
+    from pymongo.database import Database
+    from xblock.runtime import Runtime
+    from xmodule.x_module import DescriptorSystem
+    from xmodule.modulestore.mixed import MixedModuleStore
+    from xmodule.modulestore.mongo.base import MongoModuleStore
+    from xmodule.modulestore.mongo.draft import DraftModuleStore
+    from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+    from xmodule.modulestore.xml import XMLModuleStore
+
+    for store_class in (MixedModuleStore, MongoModuleStore, DraftModuleStore, SplitMongoModuleStore, XMLModuleStore):
+        instrument(store_class, MODULESTORE_METHODS, 'modulestore')
+
+    # Cursors fetch their results in batches, each a round trip to Mongo
+    instrument(Cursor, ['_refresh'], 'mongo')
+    instrument(Collection, ['insert', 'update', 'remove'], 'mongo')
+    instrument(Database, ['command'], 'mongo')
+
+    _install_sql()
+
+    instrument(BaseMemcachedCache, ['get', 'get_many'], 'cache_get')
+    instrument(BaseMemcachedCache, ['set', 'set_many', 'add'], 'cache_set')
+
+    instrument(Template, ['render', 'render_unicode'], 'mako')
+
+    instrument(Runtime, ['render'], _xblock_category)
+    instrument(DescriptorSystem, ['render'], _xblock_category)
@@ -0,0 +1,97 @@
+"""
+Tests for the per-request performance breakdown.
+"""
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from lms.lib.perfstats import stats
+from lms.lib.perfstats.middleware import ProfileMiddleware, restart_profile
+
+
+class Store(object):
+    """
+    A class whose calls are recorded.
+    """
+    def get(self, nested=0):  # pylint: disable=missing-docstring
+        if nested:
+            return self.get(nested - 1)
+        return 'value'
+
+    def put(self):  # pylint: disable=missing-docstring
+        return self.get()
+
+
+stats.instrument(Store, ['get'], 'store_get')
+stats.instrument(Store, ['put'], 'store_put')
+
+
+class StatsTest(TestCase):
+    """
+    Test the recording of calls.
+    """
+    def tearDown(self):
+        stats.stop()
+
+    def test_not_recording(self):
+        self.assertEqual(Store().get(), 'value')
+        self.assertIsNone(stats.stop())
+
+    def test_counts(self):
+        stats.start()
+        store = Store()
+        store.get()
+        store.get()
+        store.put()
+        request_stats = stats.stop()
+        self.assertEqual(dict(request_stats.counts), {'store_get': 3, 'store_put': 1})
+
+    def test_nested_calls_count_once(self):
+        stats.start()
+        Store().get(nested=3)
+        self.assertEqual(stats.stop().counts['store_get'], 1)
+
+    def test_instrument_twice(self):
+        wrapped = Store.__dict__['get']
+        stats.instrument(Store, ['get'], 'store_get')
+        self.assertIs(Store.__dict__['get'], wrapped)
+
+    def test_summary(self):
+        stats.start()
+        Store().put()
+        summary = stats.stop().summary()
+        self.assertRegexpMatches(summary, r'^total=\d+ms store_get=1/\d+ms store_put=1/\d+ms$')
+
+
+@override_settings(PERFSTATS=True, PERFSTATS_SAMPLE_RATE=1, PERFSTATS_HEADER=True)
+class ProfileMiddlewareTest(TestCase):
+    """
+    Test the profiling of requests.
+    """
+    def setUp(self):
+        self.middleware = ProfileMiddleware()
+        self.request = RequestFactory().get('/courses')
+        restart_profile()
+
+    def test_header(self):
+        self.middleware.process_request(self.request)
+        Store().put()
+        response = self.middleware.process_response(self.request, HttpResponse())
+        self.assertIn('store_put=1/', response['X-Perfstats'])
+
+    def test_totals(self):
+        for _ in xrange(2):
+            self.middleware.process_request(self.request)
+            Store().put()
+            self.middleware.process_response(self.request, HttpResponse())
+        totals = restart_profile()
+        self.assertEqual(totals['requests'], 2)
+        self.assertEqual(totals['counts']['store_put'], 2)
+        self.assertEqual(restart_profile()['requests'], 0)
+
+    @override_settings(PERFSTATS_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        self.middleware.process_request(self.request)
+        response = self.middleware.process_response(self.request, HttpResponse())
+        self.assertFalse(response.has_header('X-Perfstats'))
@@ -1,9 +1,11 @@
 # Create your views here.
+import json
+
 import middleware
 
 from django.http import HttpResponse
 
 
 def end_profile(request):
-    names = middleware.restart_profile()
-    return HttpResponse(str(names))
+    totals = middleware.restart_profile()
+    return HttpResponse(json.dumps(totals), content_type='application/json')
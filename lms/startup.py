@@ -9,6 +9,7 @@ settings.INSTALLED_APPS  # pylint: disable=W0104
 
 from django_startup import autostartup
 import edxmako
+from capa.safe_exec import configure_worker_pool
 
 
 def run():
@@ -17,6 +18,8 @@ def run():
     """
     autostartup()
 
+    configure_worker_pool(settings.CODE_JAIL.get('warm_workers', 0))
+
     if settings.FEATURES.get('USE_CUSTOM_THEME', False):
         enable_theme()
 